@@ -0,0 +1,44 @@
+"""
+Benchmark of adding long-lived affine expressions to expressions of
+variables defined later, where the sparse matrices of the operands have
+different numbers of columns and the narrower one is padded with zero
+columns.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_add_linear
+"""
+
+from rsome import ro
+import numpy as np
+import time
+
+
+def build(n, steps):
+
+    model = ro.Model()
+    x = model.dvar(n)
+    a = np.sin(np.arange(n*n)).reshape((n, n))
+    exprs = [a @ x, x.sum() + x, 2*x - a[0]]
+    ys = []
+    for _ in range(steps):
+        ys.append(model.dvar(n).to_affine())
+    t0 = time.perf_counter()
+    for y in ys:
+        for expr in exprs:
+            expr + y
+            y + expr
+
+    return time.perf_counter() - t0
+
+
+def main():
+
+    print('{:>8} {:>8} {:>10}'.format('n', 'steps', 'add (s)'))
+    for n, steps in [(50, 200), (200, 100), (500, 40)]:
+        seconds = min(build(n, steps) for _ in range(3))
+        print('{:>8} {:>8} {:>10.4f}'.format(n, steps, seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark of assembling the standard form of models with many constraint
+blocks, i.e., many calls of the st() method.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_assembly
+"""
+
+from rsome import lp
+import time
+
+
+def build(num_blocks):
+
+    model = lp.Model()
+    x = model.dvar(num_blocks + 1)
+    model.min(x.sum())
+    for i in range(num_blocks):
+        model.st(x[i] + 2*x[i+1] >= 1)
+    model.st(x >= 0)
+
+    return model
+
+
+def main(sizes=(1000, 5000, 10000, 20000)):
+
+    print('{:>10} {:>10} {:>10}'.format('blocks', 'st', 'do_math'))
+    for num_blocks in sizes:
+        t0 = time.perf_counter()
+        model = build(num_blocks)
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        formula = model.do_math()
+        t_math = time.perf_counter() - t0
+        assert formula.linear.shape[0] == num_blocks + 1
+
+        print('{:>10} {:>10.4f} {:>10.4f}'.format(num_blocks,
+                                                  t_build, t_math))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark of compiling and loading models with many second-order cone
+constraints, comparing the flat cone store with lists of lists of
+indices.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_cone_list
+"""
+
+from rsome import socp
+from rsome import eco_solver
+from rsome.lp import ConeBatch
+import numpy as np
+import tracemalloc
+import time
+
+
+def build(num_cones, size=4):
+
+    model = socp.Model()
+    x = model.dvar(num_cones * size)
+    model.min(x.sum())
+    model.st(x >= -1)
+    indices = np.arange(num_cones * size).reshape((num_cones, size))
+    model.st(ConeBatch(model, x, indices, 'Q'))
+
+    return model
+
+
+def list_size(qmat):
+
+    tracemalloc.start()
+    cones = [cone.tolist() for cone in qmat]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cones
+
+    return size
+
+
+def main(sizes=(1000, 10000, 100000)):
+
+    print('{:>10} {:>10} {:>10} {:>12} {:>12}'.format(
+        'cones', 'do_math', 'ecos', 'store (MB)', 'lists (MB)'))
+    for num_cones in sizes:
+        model = build(num_cones)
+
+        t0 = time.perf_counter()
+        formula = model.do_math()
+        t_math = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        eco_solver.solve(formula, display=False)
+        t_solve = time.perf_counter() - t0
+
+        qmat = formula.qmat
+        store = (qmat.indices.nbytes + qmat.offsets.nbytes) / 2**20
+        lists = list_size(qmat) / 2**20
+
+        print('{:>10} {:>10.4f} {:>10.4f} {:>12.2f} {:>12.2f}'.format(
+            num_cones, t_math, t_solve, store, lists))
+
+
+if __name__ == '__main__':
+    main()
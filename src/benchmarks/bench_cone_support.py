@@ -0,0 +1,45 @@
+"""
+Benchmark of compiling robust constraints with many rows and second-order
+or exponential cone support sets.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_cone_support
+"""
+
+from rsome import ro
+import rsome as rso
+import numpy as np
+import time
+
+
+def build(num_rows, size=5, cone='Q'):
+
+    model = ro.Model()
+    x = model.dvar(size)
+    z = model.rvar(size)
+    a = np.random.rand(num_rows, size)
+    model.max(x.sum())
+    support = (rso.norm(z) <= 0.5 if cone == 'Q' else
+               [rso.exp(z) <= 2, z >= -1])
+    model.st((a @ x + z @ x <= 1).forall(support))
+
+    return model
+
+
+def main(sizes=(1000, 2000, 5000)):
+
+    print('{:>10} {:>10} {:>10}'.format('rows', 'SOC', 'ExpCone'))
+    for num_rows in sizes:
+        times = []
+        for cone in 'QX':
+            model = build(num_rows, cone=cone)
+            t0 = time.perf_counter()
+            model.do_math()
+            times.append(time.perf_counter() - t0)
+
+        print('{:>10} {:>10.4f} {:>10.4f}'.format(num_rows, *times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark of compiling distributionally robust models with many scenarios
+and many rows in each worst-case expectation constraint.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_dro_scenarios
+"""
+
+from rsome import dro
+from rsome import E
+import numpy as np
+import time
+
+
+def build(num_scen, num_rows, size=5, radius=0.2):
+
+    data = np.sin(np.arange(num_scen*size)).reshape((num_scen, size))
+    coef = 1 + np.cos(np.arange(num_rows*size)).reshape((num_rows, size))**2
+
+    model = dro.Model(num_scen)
+    x = model.dvar((num_rows, size))
+    z = model.rvar(size)
+    fset = model.ambiguity()
+    for s in range(num_scen):
+        fset[s].suppset(abs(z - data[s]) <= radius)
+    fset.probset(model.p == 1/num_scen)
+    model.max(x.sum())
+    model.st((E((coef * x) @ z) <= 1).forall(fset))
+    model.st(x >= 0, x <= 5)
+
+    return model
+
+
+def main(sizes=((50, 50), (100, 100), (200, 200), (500, 200))):
+
+    print('{:>10} {:>10} {:>10}'.format('scenarios', 'rows', 'do_math'))
+    for num_scen, num_rows in sizes:
+        model = build(num_scen, num_rows)
+
+        t0 = time.perf_counter()
+        model.do_math()
+        t_math = time.perf_counter() - t0
+
+        print('{:>10} {:>10} {:>10.4f}'.format(num_scen, num_rows, t_math))
+
+
+if __name__ == '__main__':
+    main()
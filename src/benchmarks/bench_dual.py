@@ -0,0 +1,51 @@
+"""
+Benchmark of constructing the dual formulas of models with many
+second-order cone and exponential cone constraints.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_dual
+"""
+
+from rsome import gcp
+import rsome as rso
+import numpy as np
+import time
+
+
+def build(num_cones, size=10):
+
+    c = np.sin(np.arange(num_cones*size)).reshape((num_cones, size))
+
+    model = gcp.Model()
+    x = model.dvar((num_cones, size))
+    y = model.dvar(num_cones)
+    model.max((c*x).sum())
+    model.st(rso.norm(x[i]) <= 1 for i in range(num_cones))
+    model.st(x.sum(axis=1) <= y)
+    model.st(rso.exp(y) <= 5)
+
+    return model
+
+
+def main(sizes=(1000, 2000, 5000, 10000)):
+
+    print('{:>10} {:>10} {:>10} {:>14}'.format('cones', 'primal', 'dual',
+                                               'dual/cone (us)'))
+    for num_cones in sizes:
+        model = build(num_cones)
+
+        t0 = time.perf_counter()
+        model.do_math()
+        t_primal = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        model.do_math(primal=False)
+        t_dual = time.perf_counter() - t0
+
+        print('{:>10} {:>10.4f} {:>10.4f} {:>14.2f}'.format(
+            num_cones, t_primal, t_dual, t_dual / num_cones * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark of lowering exponential cone atoms, i.e., exp() over a vector
+of variables and the KL divergence over many scenarios, into the
+standard formula of a model.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_exp_lowering
+"""
+
+from rsome import ro
+import rsome as rso
+import numpy as np
+import time
+
+
+def build(size):
+
+    phat = 1 + np.sin(np.arange(size))**2
+    phat = phat / phat.sum()
+
+    model = ro.Model()
+    x = model.dvar(size)
+    y = model.dvar(size)
+    p = model.dvar(size)
+    model.max(np.cos(np.arange(size)) @ p - y.sum())
+    model.st(rso.exp(x) <= y)
+    model.st(p.kldiv(phat, 0.01))
+    model.st(p >= 0, p.sum() == 1)
+
+    return model
+
+
+def main(sizes=(1000, 5000, 10000)):
+
+    print('{:>10} {:>10} {:>10}'.format('size', 'build', 'do_math'))
+    for size in sizes:
+        t0 = time.perf_counter()
+        model = build(size)
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        formula = model.do_math()
+        t_math = time.perf_counter() - t0
+        assert len(formula.xmat) == 2*size
+
+        print('{:>10} {:>10.4f} {:>10.4f}'.format(size, t_build, t_math))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark of exporting sparse second-order cone programs as .lp, .mps and
+.cbf files, reported as the throughput in MB/s. The .lp export of the
+previous row-by-row string concatenation is included for comparison.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_export
+"""
+
+from rsome.socp import SOCProg
+import scipy.sparse as sp
+import numpy as np
+import tempfile
+import time
+import os
+
+
+def build(size, num_cones=None):
+
+    linear = sp.diags([np.ones(size), 2*np.ones(size - 1),
+                       -np.ones(size - 7)], [0, 1, 7], format='csr')
+    const = np.ones(size)
+    sense = np.zeros(size)
+    sense[::10] = 1
+    vtype = np.array(['C'] * size)
+    ub = np.full(size, np.inf)
+    lb = np.zeros(size)
+    lb[::3] = -np.inf
+    obj = -np.ones((1, size))
+    num_cones = size // 100 if num_cones is None else num_cones
+    qmat = [list(range(i*4, i*4 + 4)) for i in range(num_cones)]
+
+    return SOCProg(linear, const, sense, vtype, ub, lb, qmat, obj)
+
+
+def lp_rows(formula):
+
+    string = 'Subject To\n'
+    for i in range(formula.linear.shape[0]):
+        row = formula.linear[i]
+        each = ['{} {} x{}'.format('-' if coeff < 0 else '+',
+                                   abs(coeff), index+1)
+                for coeff, index in zip(row.data, row.indices)]
+        string += ' c{}: '.format(i+1) + ' '.join(each)
+        string += ' <= ' if formula.sense[i] == 0 else ' == '
+        string += '{}\n'.format(formula.const[i])
+
+    return string
+
+
+def throughput(write, path):
+
+    t0 = time.perf_counter()
+    with open(path, 'w') as f:
+        write(f)
+    seconds = time.perf_counter() - t0
+
+    return os.path.getsize(path) / 2**20 / seconds, seconds
+
+
+def main(sizes=(10**4, 10**5, 10**6)):
+
+    print('{:>10} {:>8} {:>10} {:>10} {:>10}'.format('rows', 'format',
+                                                     'MB', 'seconds',
+                                                     'MB/s'))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'model')
+        for size in sizes:
+            formula = build(size)
+            writers = [('lp', formula.write_lp),
+                       ('mps', formula.write_mps),
+                       ('cbf', formula.write_cbf)]
+            if size <= 10**5:
+                writers.append(('lp rows',
+                                lambda f: f.write(lp_rows(formula))))
+            for ext, write in writers:
+                rate, seconds = throughput(write, path)
+                megabytes = os.path.getsize(path) / 2**20
+                print('{:>10} {:>8} {:>10.2f} {:>10.4f} {:>10.2f}'.format(
+                      size, ext, megabytes, seconds, rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark of the startup time of importing RSOME modules in fresh
+interpreters, together with the heavy dependencies loaded by each
+import. The last rows give the import time of the dependencies that
+are loaded lazily.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_import
+"""
+
+import subprocess
+import sys
+import numpy as np
+
+
+HEAVY = ['pandas', 'scipy.optimize', 'scipy.linalg']
+
+SCRIPT = '''
+import sys
+import time
+t0 = time.perf_counter()
+import {}
+print(time.perf_counter() - t0)
+print(','.join([name for name in {} if name in sys.modules]))
+'''
+
+
+def run(module, repeats):
+
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c',
+                                 SCRIPT.format(module, HEAVY)],
+                                capture_output=True, text=True).stdout
+        seconds, loaded = output.split('\n')[:2]
+        times.append(float(seconds))
+
+    return np.median(times), loaded
+
+
+def main(modules=('rsome', 'rsome.ro', 'rsome.dro',
+                  'numpy, scipy.sparse', 'pandas', 'scipy.optimize'),
+         repeats=7):
+
+    print('{:>20} {:>10}   {}'.format('import', 'time (ms)', 'loaded'))
+    for module in modules:
+        seconds, loaded = run(module, repeats)
+        print('{:>20} {:>10.1f}   {}'.format(module, seconds*1000,
+                                             loaded or '-'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark of recompiling robust models after appending a few constraints
+to a model that has already been solved or compiled.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_incremental
+"""
+
+from rsome import ro
+import rsome as rso
+import time
+
+
+def build(num_blocks, size=5):
+
+    model = ro.Model()
+    x = model.dvar((num_blocks, size))
+    z = model.rvar(size)
+    model.min(x.sum())
+    for i in range(num_blocks):
+        model.st((x[i] @ (z + 1) >= 1).forall(rso.norm(z, 1) <= 0.5))
+    model.st(x >= 0)
+
+    return model, x, z
+
+
+def main(sizes=(100, 500, 1000, 2000)):
+
+    print('{:>10} {:>10} {:>10}'.format('blocks', 'first', 'update'))
+    for num_blocks in sizes:
+        model, x, z = build(num_blocks)
+
+        t0 = time.perf_counter()
+        model.do_math()
+        t_first = time.perf_counter() - t0
+
+        model.st((x[0] @ (z + 1) <= 5).forall(rso.norm(z, 1) <= 0.5))
+        t0 = time.perf_counter()
+        model.do_math()
+        t_update = time.perf_counter() - t0
+
+        print('{:>10} {:>10.4f} {:>10.4f}'.format(num_blocks,
+                                                  t_first, t_update))
+
+
+if __name__ == '__main__':
+    main()
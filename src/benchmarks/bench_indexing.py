@@ -0,0 +1,45 @@
+"""
+Benchmark of indexing and summing affine expressions with growing sizes.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_indexing
+"""
+
+from rsome import ro
+import numpy as np
+import time
+
+
+def timeit(func, repeat=3):
+
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+
+    return best
+
+
+def main(sizes=(10**3, 10**4, 10**5, 10**6)):
+
+    print('{:>10} {:>10} {:>10} {:>10} {:>10}'.format('size', 'getitem',
+                                                      'sum', 'sum(axis)',
+                                                      'varsub'))
+    for size in sizes:
+        model = ro.Model()
+        x = model.dvar((size // 10, 10))
+        affine = 2*x + 1.0
+
+        t_item = timeit(lambda: affine[::2, 1:])
+        t_sum = timeit(lambda: affine.sum())
+        t_axis = timeit(lambda: affine.sum(axis=0))
+        t_sub = timeit(lambda: x[1:, ::3].to_affine())
+
+        print('{:>10} {:>10.4f} {:>10.4f} {:>10.4f} {:>10.4f}'.format(
+              size, t_item, t_sum, t_axis, t_sub))
+
+
+if __name__ == '__main__':
+    main()
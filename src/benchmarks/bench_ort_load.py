@@ -0,0 +1,69 @@
+"""
+Benchmark of loading sparse linear programs into OR-Tools models, row by
+row with pywraplp linear expressions, or from an MPModelProto built in
+bulk from the CSR arrays, as done by the solver interface.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_ort_load
+"""
+
+from rsome.lp import LinProg
+from rsome import ort_solver as ort
+from ortools.linear_solver import pywraplp
+import scipy.sparse as sp
+import numpy as np
+import time
+
+
+def build(size):
+
+    linear = sp.diags([np.ones(size), 2*np.ones(size - 1),
+                       np.ones(size - 7)], [0, 1, 7], format='csr')
+    const = np.ones(size)
+    sense = np.zeros(size)
+    vtype = np.array(['C'] * size)
+    ub = np.full(size, np.inf)
+    lb = np.zeros(size)
+    obj = -np.ones((1, size))
+
+    return LinProg(linear, const, sense, vtype, ub, lb, obj)
+
+
+def load_per_row(formula):
+
+    solver = pywraplp.Solver.CreateSolver('GLOP')
+    linear = formula.linear
+    obj = formula.obj.flatten()
+    row, col = linear.shape
+    xs = [solver.NumVar(formula.lb[i], formula.ub[i], 'x' + str(i))
+          for i in range(col)]
+    solver.Minimize(sum([obj[i] * xs[i] for i in range(col)]))
+    for j in range(row):
+        indices = linear[j].indices
+        coeff = linear[j].data
+        left = sum([coeff[i] * xs[indices[i]] for i in range(len(indices))])
+        solver.Add(left <= formula.const[j])
+
+    return solver
+
+
+def main(sizes=(1000, 10000, 50000, 100000)):
+
+    print('{:>10} {:>10} {:>10}'.format('size', 'per row', 'proto'))
+    for size in sizes:
+        formula = build(size)
+
+        t0 = time.perf_counter()
+        load_per_row(formula)
+        t_row = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        ort.load(formula)
+        t_proto = time.perf_counter() - t0
+
+        print('{:>10} {:>10.4f} {:>10.4f}'.format(size, t_row, t_proto))
+
+
+if __name__ == '__main__':
+    main()
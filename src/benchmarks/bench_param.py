@@ -0,0 +1,51 @@
+"""
+Benchmark of updating the data of a compiled model, either by rebuilding
+the model with new data or by setting the values of parameters.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_param
+"""
+
+from rsome import lp
+import numpy as np
+import time
+
+
+def build(model, demand):
+
+    num = demand.size
+    x = model.dvar(num)
+    y = model.dvar(num)
+    model.min(1.5*x.sum() + 2*y.sum())
+    for i in range(num):
+        model.st(y[i] >= demand[i] - x[i])
+    model.st(y >= 0)
+    model.st(x >= 0)
+
+    return model
+
+
+def main(sizes=(1000, 5000, 10000)):
+
+    print('{:>10} {:>10} {:>10}'.format('size', 'rebuild', 'set'))
+    for size in sizes:
+        demand = np.random.rand(size)
+
+        t0 = time.perf_counter()
+        build(lp.Model(), demand).do_math()
+        t_build = time.perf_counter() - t0
+
+        model = lp.Model()
+        param = model.param(size)
+        build(model, param).do_math()
+        t0 = time.perf_counter()
+        param.set(demand)
+        model.do_math()
+        t_set = time.perf_counter() - t0
+
+        print('{:>10} {:>10.4f} {:>10.4f}'.format(size, t_build, t_set))
+
+
+if __name__ == '__main__':
+    main()
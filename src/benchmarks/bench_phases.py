@@ -0,0 +1,237 @@
+"""
+Benchmark of the phases of solving the case studies of the RSOME paper,
+including the robust portfolio, the inventory model with linear decision
+rules, the DRO newsvendor, and the Wasserstein lot-sizing models. The
+time and peak memory of building the model, lowering it into the primal
+and dual formulas, and loading the formula into Gurobi are reported for
+each size of the models. Time spent in the robust counterpart methods
+le_to_rc, ro_to_roc, and dro_to_roc is included in the lowering phase
+and also reported separately.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_phases
+
+or select the case studies by their names:
+
+    python -m benchmarks.bench_phases portfolio lot_sizing
+"""
+
+from rsome import ro
+from rsome import dro
+from rsome import E
+from rsome import lp
+from rsome import grb_solver
+import rsome as rso
+import numpy as np
+import tracemalloc
+import time
+import sys
+
+
+def portfolio(n):
+
+    i = np.arange(1, n + 1)
+    p = 1.15 + 0.05/n*i
+    delta = 0.05/450 * (2*i*n*(n + 1))**0.5
+
+    model = ro.Model()
+    x = model.dvar(n)
+    z = model.rvar(n)
+    model.maxmin((p + delta*z) @ x,
+                 rso.norm(z, np.inf) <= 1, rso.norm(z, 1) <= 5)
+    model.st(sum(x) == 1)
+    model.st(x >= 0)
+
+    return model
+
+
+def inventory(T):
+
+    t = np.arange(1, T + 1)
+    d0 = 1000 * (1 + 0.5*np.sin(np.pi*(t - 1)/12))
+    alpha = np.array([1, 1.5, 2]).reshape((3, 1))
+    c = alpha * (1 + 0.5*np.sin(np.pi*(t - 1)/12))
+
+    model = ro.Model()
+    d = model.rvar(T)
+    uset = (d >= 0.8*d0, d <= 1.2*d0)
+    p = model.ldr((3, T))
+    for t in range(1, T):
+        p[:, t].adapt(d[:t])
+
+    model.minmax((c*p).sum(), uset)
+    model.st(0 <= p, p <= 567)
+    model.st(p.sum(axis=1) <= 13600)
+    model.st(500 + p[:, :t+1].sum() - d[:t+1].sum() >= 500
+             for t in range(T))
+    model.st(500 + p[:, :t+1].sum() - d[:t+1].sum() <= 2000
+             for t in range(T))
+
+    return model
+
+
+def newsvendor(S, N=3):
+
+    zbar = 60 + 40*np.sin(np.arange(N))**2
+    zhat = zbar * np.cos(np.arange(S*N)).reshape((S, N))**2
+    p = 1 + 4*np.cos(np.arange(N))**2
+
+    model = dro.Model(S)
+    z = model.rvar(N)
+    u = model.rvar()
+    fset = model.ambiguity()
+    for s in range(S):
+        fset[s].suppset(0 <= z, z <= zbar, rso.norm(z - zhat[s]) <= u)
+    fset.exptset(E(u) <= 0.01 * zbar.min())
+    pr = model.p
+    fset.probset(pr == 1/S)
+
+    x = model.dvar(N)
+    y = model.dvar(N)
+    y.adapt(z)
+    y.adapt(u)
+    for s in range(S):
+        y.adapt(s)
+
+    model.minsup(-p@x + E(p@y), fset)
+    model.st(y >= 0, y >= x - z, x >= 0, x.sum() == 50*N)
+
+    return model
+
+
+def lot_sizing(S, m=5, n=10):
+
+    c = 1 + np.sin(np.arange(m*n)).reshape((m, n))**2
+    r = 5 + np.cos(np.arange(n))**2
+    q = 40 + 10*np.sin(np.arange(m))
+    d_lb = 10 + np.sin(np.arange(n))
+    d_ub = 30 + np.cos(np.arange(n))
+    dhat = d_lb + (d_ub - d_lb)*np.sin(np.arange(S*n)).reshape((S, n))**2
+
+    model = dro.Model(S)
+    d = model.rvar(n)
+    fset = model.ambiguity()
+    for s in range(S):
+        fset[s].suppset(d <= d_ub, d >= d_lb, rso.norm(d - dhat[s]) <= 0.25)
+    pr = model.p
+    fset.probset(pr == 1/S)
+
+    x = model.dvar((m, n))
+    y = model.dvar(n)
+    y.adapt(d)
+    for s in range(S):
+        y.adapt(s)
+
+    model.minsup(((c - r)*x).sum() + E(r@y), fset)
+    model.st(y >= x.sum(axis=0) - d, y >= 0)
+    model.st(x.sum(axis=1) <= q, x >= 0)
+
+    return model
+
+
+CASES = {'portfolio': (portfolio, (150, 600, 1200)),
+         'inventory': (inventory, (12, 24, 48)),
+         'newsvendor': (newsvendor, (10, 40, 160)),
+         'lot_sizing': (lot_sizing, (10, 40, 160))}
+
+METHODS = [(lp.RoConstr, 'le_to_rc'),
+           (dro.Model, 'ro_to_roc'),
+           (dro.Model, 'dro_to_roc')]
+
+
+def timed(cls, name, totals):
+    """
+    Replace the method of the class by a wrapper that accumulates the
+    time of the outermost calls into totals[name].
+    """
+
+    method = getattr(cls, name)
+    depth = [0]
+
+    def wrapper(*args, **kwargs):
+        depth[0] += 1
+        t0 = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            depth[0] -= 1
+            if depth[0] == 0:
+                totals[name] += time.perf_counter() - t0
+
+    setattr(cls, name, wrapper)
+
+    return method
+
+
+def phases(build, size):
+    """
+    Return the phases of solving the model of the given size as a list
+    of names and functions called in order.
+    """
+
+    state = {}
+
+    def build_model():
+        state['model'] = build(size)
+
+    def primal():
+        state['formula'] = state['model'].do_math()
+
+    def dual():
+        state['model'].do_math(primal=False)
+
+    def load():
+        model = grb_solver.load(state['formula'])
+        model.update()
+        model.dispose()
+
+    return [('build', build_model), ('primal', primal),
+            ('dual', dual), ('load', load)]
+
+
+def run(build, size, memory=False):
+
+    totals = {name: 0.0 for _, name in METHODS}
+    originals = [timed(cls, name, totals) for cls, name in METHODS]
+    results = []
+    try:
+        for phase, func in phases(build, size):
+            if memory:
+                tracemalloc.start()
+            t0 = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - t0
+            peak = 0
+            if memory:
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+            results.append((phase, seconds, peak))
+    finally:
+        for (cls, name), method in zip(METHODS, originals):
+            setattr(cls, name, method)
+
+    return results, totals
+
+
+def main(names=None):
+
+    names = names or list(CASES)
+    print('{:>12} {:>8} {:>12} {:>10} {:>10}'.format(
+        'case', 'size', 'phase', 'time (s)', 'peak (MB)'))
+    for name in names:
+        build, sizes = CASES[name]
+        for size in sizes:
+            results, totals = run(build, size)
+            memory, _ = run(build, size, memory=True)
+            for (phase, seconds, _), (_, _, peak) in zip(results, memory):
+                print('{:>12} {:>8} {:>12} {:>10.4f} {:>10.2f}'.format(
+                    name, size, phase, seconds, peak))
+            for method, seconds in totals.items():
+                if seconds > 0:
+                    print('{:>12} {:>8} {:>12} {:>10.4f} {:>10}'.format(
+                        name, size, method, seconds, '-'))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+"""
+Benchmark of presolving the standard formulas of distributionally robust
+models with many scenarios, in terms of the sizes of formulas and the
+time of solving them.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_presolve
+"""
+
+from rsome import dro
+from rsome import E
+from rsome import eco_solver
+import rsome as rso
+import numpy as np
+import time
+
+
+def build(num_scen, num_rows=20, size=5, radius=0.2):
+
+    data = np.sin(np.arange(num_scen*size)).reshape((num_scen, size))
+    coef = 1 + np.cos(np.arange(num_rows*size)).reshape((num_rows, size))**2
+
+    model = dro.Model(num_scen)
+    x = model.dvar((num_rows, size))
+    z = model.rvar(size)
+    fset = model.ambiguity()
+    for s in range(num_scen):
+        fset[s].suppset(abs(z - data[s]) <= radius)
+    fset.probset(model.p == 1/num_scen)
+    model.max(x.sum())
+    model.st((E((coef * x) @ z) <= 1).forall(fset))
+    model.st(x >= 0, x <= 5)
+
+    return model
+
+
+def main(sizes=(20, 50, 100)):
+
+    print('{:>10} {:>16} {:>16} {:>10} {:>10} {:>10}'.format(
+        'scenarios', 'rows', 'columns', 'presolve', 'solve', 'reduced'))
+    for num_scen in sizes:
+        formula = build(num_scen).do_math()
+
+        t0 = time.perf_counter()
+        reduced, postsolve = rso.presolve(formula)
+        t_pre = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        solution = eco_solver.solve(formula, display=False)
+        t_solve = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        restored = postsolve(eco_solver.solve(reduced, display=False))
+        t_reduced = time.perf_counter() - t0
+        assert abs(restored.objval - solution.objval) < 1e-4
+
+        rows = '{} -> {}'.format(formula.linear.shape[0],
+                                 reduced.linear.shape[0])
+        cols = '{} -> {}'.format(formula.linear.shape[1],
+                                 reduced.linear.shape[1])
+        print('{:>10} {:>16} {:>16} {:>10.4f} {:>10.4f} {:>10.4f}'.format(
+            num_scen, rows, cols, t_pre, t_solve, t_reduced))
+
+
+if __name__ == '__main__':
+    main()
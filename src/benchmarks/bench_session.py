@@ -0,0 +1,49 @@
+"""
+Benchmark of a cutting-plane loop that adds one constraint to a model
+in each iteration, comparing loading the whole formula into Gurobi on
+each solve with a solver session that applies the new rows as deltas.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_session
+"""
+
+from rsome import ro
+from rsome import grb_solver
+from rsome import SolverSession
+import numpy as np
+import time
+
+
+def run(n, steps, solver):
+
+    model = ro.Model()
+    x = model.dvar(n)
+    c = 1 + np.sin(np.arange(n))**2
+    model.max(c @ x)
+    model.st(x <= 1, x >= 0, x[1:] - x[:-1] <= 0.5)
+
+    total = 0
+    for step in range(steps):
+        a = 1 + np.cos(np.arange(n) * (step + 1))**2
+        model.st(a @ x <= n/3)
+        t0 = time.perf_counter()
+        model.solve(solver, display=False)
+        total += time.perf_counter() - t0
+
+    return total, model.get()
+
+
+def main(sizes=(200, 800, 1500), steps=50):
+
+    print('{:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+        'variables', 'steps', 'reload', 'session', 'diff'))
+    for n in sizes:
+        t_load, obj_load = run(n, steps, grb_solver)
+        t_session, obj_session = run(n, steps, SolverSession(grb_solver))
+        print('{:>10} {:>10} {:>10.4f} {:>10.4f} {:>10.2e}'.format(
+            n, steps, t_load, t_session, abs(obj_load - obj_session)))
+
+
+if __name__ == '__main__':
+    main()
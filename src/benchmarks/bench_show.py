@@ -0,0 +1,58 @@
+"""
+Benchmark of inspecting large formulas by block statistics and paged
+sparse views of constraints, compared with the size of the dense
+coefficient matrix previously built by showlc().
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_show
+"""
+
+from rsome import socp
+import rsome as rso
+import numpy as np
+import tracemalloc
+import time
+
+
+def build(n):
+
+    a = 1 + np.sin(np.arange(n))**2
+    model = socp.Model()
+    x = model.dvar(n)
+    model.min(a @ x)
+    model.st([x[:-1] - 0.5*x[1:] == a[1:], x <= 10,
+              rso.norm(x[:n//2]) <= n])
+
+    return model.do_math()
+
+
+def measure(func):
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+    return seconds, peak
+
+
+def main(sizes=(10000, 100000, 1000000)):
+
+    build(10).stats()
+    print('{:>10} {:>10} {:>10} {:>10} {:>10} {:>12}'.format(
+        'variables', 'stats', 'peak (MB)', 'page', 'peak (MB)',
+        'dense (MB)'))
+    for n in sizes:
+        formula = build(n)
+        t_stats, m_stats = measure(formula.stats)
+        t_page, m_page = measure(lambda: formula.showlc(slice(1, 101)))
+        dense = np.prod(formula.linear.shape) * 8 / 2**20
+        print('{:>10} {:>10.4f} {:>10.2f} {:>10.4f} {:>10.2f} {:>12.0f}'.format(
+            n, t_stats, m_stats, t_page, m_page, dense))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of loading second-order cone programs with many cone constraints
+into Gurobi models, cone by cone or in batches by the solver interface.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_solver_load
+"""
+
+from rsome.socp import SOCProg
+from rsome import grb_solver as grb
+import gurobipy as gp
+import scipy.sparse as sp
+import numpy as np
+import time
+
+
+def build(num_cones, dim=3):
+
+    num_var = num_cones * dim
+    linear = sp.hstack([sp.csr_matrix((num_cones, 1)),
+                        sp.kron(sp.eye(num_cones), np.ones((1, dim - 1))),
+                        sp.csr_matrix((num_cones, num_cones))],
+                       format='csr')
+    const = np.ones(num_cones)
+    obj = np.zeros((1, num_var + 1))
+    obj[0, -num_cones:] = 1
+    qmat = [[1 + (dim - 1)*num_cones + i] +
+            list(1 + (dim - 1)*i + np.arange(dim - 1))
+            for i in range(num_cones)]
+    vtype = np.array(['C'] * (num_var + 1))
+    ub = np.full(num_var + 1, np.inf)
+    lb = np.full(num_var + 1, -np.inf)
+    lb[-num_cones:] = 0
+    sense = np.ones(num_cones)
+
+    return SOCProg(linear, const, sense, vtype, ub, lb, qmat, obj)
+
+
+def load_per_cone(formula):
+
+    model = gp.Model()
+    x = model.addMVar(formula.linear.shape[1], lb=formula.lb, ub=formula.ub)
+    model.addMConstr(formula.linear, x, '=', formula.const)
+    for constr in formula.qmat:
+        index_right = constr[0:1]
+        index_left = constr[1:]
+        A = np.eye(len(index_left))
+        model.addConstr(x[index_left] @ A @ x[index_left] <=
+                        x[index_right] @ x[index_right])
+    model.setObjective(formula.obj @ x)
+    model.update()
+
+    return model
+
+
+def main(sizes=(1000, 5000, 10000, 20000)):
+
+    print('{:>10} {:>10} {:>10}'.format('cones', 'per cone', 'batch'))
+    for num_cones in sizes:
+        formula = build(num_cones)
+
+        t0 = time.perf_counter()
+        load_per_cone(formula).dispose()
+        t_cone = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        model = grb.load(formula)
+        model.update()
+        t_batch = time.perf_counter() - t0
+        model.dispose()
+
+        print('{:>10} {:>10.4f} {:>10.4f}'.format(num_cones, t_cone, t_batch))
+
+
+if __name__ == '__main__':
+    main()
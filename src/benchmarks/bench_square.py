@@ -0,0 +1,47 @@
+"""
+Benchmark of lowering element-wise square() constraints of large
+residual vectors into second-order cone constraints.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_square
+"""
+
+from rsome import socp
+import rsome as rso
+import numpy as np
+import time
+
+
+def build(size, num_var=20):
+
+    a = np.sin(np.arange(size*num_var)).reshape((size, num_var))
+    b = np.cos(np.arange(size))
+
+    model = socp.Model()
+    x = model.dvar(num_var)
+    t = model.dvar(size)
+    model.min(t.sum())
+    model.st(rso.square(a@x - b) <= t)
+
+    return model
+
+
+def main(sizes=(10000, 50000, 100000)):
+
+    print('{:>10} {:>10} {:>10}'.format('size', 'build', 'do_math'))
+    for size in sizes:
+        t0 = time.perf_counter()
+        model = build(size)
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        formula = model.do_math()
+        t_math = time.perf_counter() - t0
+        assert len(formula.qmat) == size
+
+        print('{:>10} {:>10.4f} {:>10.4f}'.format(size, t_build, t_math))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark of reusing compiled distributionally robust models, by
+recompiling the model, unpickling the formula, or loading the formula
+saved as a binary file with or without memory mapping.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_storage
+"""
+
+from benchmarks.bench_dro_scenarios import build
+import rsome as rso
+import tempfile
+import pickle
+import time
+import os
+
+
+def timeit(func):
+
+    t0 = time.perf_counter()
+    result = func()
+
+    return result, time.perf_counter() - t0
+
+
+def main(sizes=((50, 50), (100, 100), (200, 200))):
+
+    print('{:>10} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+          'scenarios', 'MB', 'compile', 'unpickle', 'load', 'mmap'))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'formula.rso')
+        for num_scen, num_rows in sizes:
+            model = build(num_scen, num_rows)
+            formula, t_compile = timeit(model.do_math)
+
+            formula.save(path)
+            data = pickle.dumps(formula)
+            _, t_pickle = timeit(lambda: pickle.loads(data))
+            _, t_load = timeit(lambda: rso.load(path, mmap=False))
+            _, t_mmap = timeit(lambda: rso.load(path, mmap=True))
+
+            megabytes = os.path.getsize(path) / 2**20
+            print('{:>10} {:>10.2f} {:>10.4f} {:>10.4f} {:>10.4f} '
+                  '{:>10.4f}'.format(num_scen, megabytes, t_compile,
+                                     t_pickle, t_load, t_mmap))
+
+
+if __name__ == '__main__':
+    main()
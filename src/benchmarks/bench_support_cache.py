@@ -0,0 +1,57 @@
+"""
+Benchmark of specifying one uncertainty set shared by many robust
+constraints, with and without the support cache.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_support_cache
+"""
+
+from rsome import ro
+import rsome as rso
+import time
+
+
+def build(num_constr, size=10):
+
+    model = ro.Model()
+    x = model.dvar((num_constr, size))
+    z = model.rvar(size)
+    constrs = [x[i] @ (z + 1) >= 1 for i in range(num_constr)]
+
+    return constrs, z
+
+
+def specify(constrs, z):
+
+    for constr in constrs:
+        constr.forall(rso.norm(z) <= 0.5)
+
+
+def main(sizes=(100, 500, 1000, 2000)):
+
+    print('{:>10} {:>10} {:>10} {:>10}'.format('constrs', 'no cache',
+                                               'cache', 'hits'))
+    for num_constr in sizes:
+        constrs, z = build(num_constr)
+        cache = z.model.top.support_cache
+        maxsize = cache.maxsize
+
+        cache.clear()
+        cache.maxsize = 0
+        t0 = time.perf_counter()
+        specify(constrs, z)
+        t_none = time.perf_counter() - t0
+
+        cache.clear()
+        cache.maxsize = maxsize
+        t0 = time.perf_counter()
+        specify(constrs, z)
+        t_cache = time.perf_counter() - t0
+
+        print('{:>10} {:>10.4f} {:>10.4f} {:>10}'.format(num_constr, t_none,
+                                                         t_cache, cache.hits))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark of building models where the same variable arrays appear in
+many constraints, including the case studies of the RSOME paper, to
+measure the effect of caching the affine forms of variables.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_to_affine
+"""
+
+from rsome import ro
+from benchmarks.bench_phases import CASES
+import time
+
+
+def repeated(num_constrs, n=2000):
+
+    model = ro.Model()
+    x = model.dvar(n)
+    y = model.dvar(n)
+    model.min(x.sum())
+    for i in range(num_constrs):
+        model.st(x + i*y >= i, x - y <= 2*i)
+
+    return model
+
+
+def measure(build, size, repeats=3):
+
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        build(size)
+        times.append(time.perf_counter() - t0)
+
+    return min(times)
+
+
+def main():
+
+    print('{:>12} {:>8} {:>10}'.format('case', 'size', 'build'))
+    for num_constrs in (100, 500, 2000):
+        print('{:>12} {:>8} {:>10.4f}'.format(
+            'repeated', num_constrs, measure(repeated, num_constrs)))
+    for name, (build, sizes) in CASES.items():
+        for size in sizes:
+            print('{:>12} {:>8} {:>10.4f}'.format(
+                name, size, measure(build, size)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of solving a rolling-horizon production planning model
+repeatedly with updated demand parameters, comparing cold starts with
+warm starts from the previous solution and simplex basis.
+
+Run the script from the src directory:
+
+    python -m benchmarks.bench_warm_start
+"""
+
+from rsome import ro
+from rsome import grb_solver
+import numpy as np
+import time
+
+
+def build(horizon, products):
+
+    model = ro.Model()
+    d = model.param((horizon, products))
+    x = model.dvar((horizon, products))
+    s = model.dvar((horizon, products))
+    cost = 1 + np.sin(np.arange(horizon*products)).reshape(d.shape)**2
+    model.min((cost*x).sum() + 0.2*s.sum())
+    model.st(s[0] == x[0] - d[0],
+             s[1:] == s[:-1] + x[1:] - d[1:],
+             x.sum(axis=1) <= 1.8*products,
+             x >= 0, s >= 0)
+
+    return model, d
+
+
+def demand(step, horizon, products):
+
+    index = np.arange(step, step + horizon)[:, None]*products
+    index = index + np.arange(products)
+    return 1 + np.cos(0.3*index)**2
+
+
+def run(horizon, products, steps, warm_start):
+
+    model, d = build(horizon, products)
+    params = {'Method': 1}
+    total = 0
+    runtime = 0
+    objvals = []
+    for step in range(steps):
+        d.set(demand(step, horizon, products))
+        t0 = time.perf_counter()
+        model.solve(grb_solver, display=False, params=params,
+                    warm_start=warm_start)
+        total += time.perf_counter() - t0
+        runtime += model.solution.time
+        objvals.append(model.get())
+
+    return total, runtime, np.array(objvals)
+
+
+def main(sizes=((10, 20), (15, 30), (20, 30)), steps=20):
+
+    print('{:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+        'horizon', 'products', 'cold', 'warm', 'cold grb', 'warm grb',
+        'max diff'))
+    for horizon, products in sizes:
+        t_cold, r_cold, cold = run(horizon, products, steps, False)
+        t_warm, r_warm, warm = run(horizon, products, steps, True)
+        print('{:>10} {:>10} {:>10.4f} {:>10.4f} {:>10.4f} {:>10.4f} '
+              '{:>10.2e}'.format(horizon, products, t_cold, t_warm,
+                                 r_cold, r_warm, abs(cold - warm).max()))
+
+
+if __name__ == '__main__':
+    main()
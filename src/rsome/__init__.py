@@ -10,3 +10,6 @@ from .subroutines import plog
 from .subroutines import entropy
 from .subroutines import kldiv
 from .subroutines import E
+from .storage import load
+from .presolve import presolve
+from .session import SolverSession
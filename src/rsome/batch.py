@@ -0,0 +1,212 @@
+"""
+Module used for solving many RSOME models in parallel across a pool of
+worker processes.
+
+Copyright 2020-2022 Peng Xiong, & Zhi Chen
+
+This file is a part of RSOME
+
+This file may be used under the terms of the GNU General Public License
+version 3 as published by the Free Software Foundation and appearing in
+the file LICENSE.GPL included in the packaging of this file.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from .lp import Model as LPModel
+from .lp import Solution
+from .ro import Model as ROModel
+from .dro import Model as DROModel
+from importlib import import_module
+from multiprocessing.connection import wait
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+import multiprocessing as mp
+import warnings
+import time
+import os
+
+
+def worker(conn, solver_name, display, params):
+
+    solver = import_module(solver_name)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+
+        index, formula = task
+        conn.send((index, None))
+        try:
+            solution = solver.solve(formula, display, params)
+        except Exception as error:
+            solution = error
+        conn.send((index, [solution]))
+
+
+def start_worker(context, solver_name, display, params):
+
+    conn, child_conn = context.Pipe()
+    process = context.Process(target=worker,
+                              args=(child_conn, solver_name, display, params),
+                              daemon=True)
+    process.start()
+    child_conn.close()
+
+    return process, conn
+
+
+def write_back(model, solution):
+
+    solution = solution if isinstance(solution, Solution) else None
+    if isinstance(model, LPModel):
+        if solution is not None:
+            solution.layout = model.layout()
+        model.solution = solution
+    elif isinstance(model, ROModel):
+        if solution is not None:
+            solution.layout = model.rc_model.layout()
+        model.rc_model.solution = solution
+        model.solution = solution
+    elif isinstance(model, DROModel):
+        if solution is not None:
+            solution.layout = model.ro_model.rc_model.layout()
+        model.ro_model.solution = solution
+        model.ro_model.rc_model.solution = solution
+        model.solution = solution
+
+
+def solve(models, solver=None, workers=None, timeout=None,
+          display=False, params={}):
+    """
+    Solve a collection of models in parallel with the selected solver
+    interface.
+
+    Parameters
+    ----------
+    models : iterable
+        RSOME models to be solved.
+    solver : {None, lpg_solver, clp_solver, ort_solver, eco_solver
+              cpx_solver, grb_solver, msk_solver, cpt_solver}
+        Solver interface used for model solution. Use default solver
+        if solver=None.
+    workers : int
+        Number of worker processes. The number of CPU cores is used if
+        workers=None.
+    timeout : float
+        Time limit in seconds for solving each model. A worker exceeding
+        the time limit is terminated and replaced, and a TimeoutError is
+        returned for the corresponding model.
+    display : bool
+        Display option of the solver interface.
+    params : dict
+        A dictionary that specifies parameters of the selected solver.
+
+    Returns
+    -------
+    solutions : list
+        Solutions of the models, which are also written back to the
+        models so that the get methods of models and variables apply.
+        If solving a model fails, the exception raised by the solver
+        interface is returned at the index of the model, the solution
+        of the model is set to be None, and the remaining models are
+        still solved.
+
+    Notes
+    -----
+    Models are compiled into their standard formulas in the calling
+    process, and only the formulas are sent to the worker processes.
+    Worker processes are started by the "spawn" method, so scripts
+    calling this function must be guarded by
+    if __name__ == '__main__'.
+    """
+
+    if solver is None:
+        solver_name = 'rsome.lpg_solver'
+    elif isinstance(solver, ModuleType) and hasattr(solver, 'solve'):
+        solver_name = solver.__name__
+    else:
+        raise TypeError('The solver must be a solver interface module, '
+                        'such as rsome.grb_solver.')
+
+    models = list(models)
+    formulas = [model.do_math() for model in models]
+    solutions: List[Any] = [None] * len(models)
+    if not models:
+        return solutions
+
+    workers = os.cpu_count() if workers is None else workers
+    if workers < 1:
+        raise ValueError('The number of workers must be positive.')
+    workers = min(workers, len(models))
+
+    context = mp.get_context('spawn')
+    pool = [start_worker(context, solver_name, display, params)
+            for _ in range(workers)]
+    tasks = list(range(len(models)))[::-1]
+    busy: Dict[int, Tuple[int, Optional[float]]] = {}
+    try:
+        while tasks or busy:
+            for i, (process, conn) in enumerate(pool):
+                if i not in busy and tasks:
+                    index = tasks.pop()
+                    conn.send((index, formulas[index]))
+                    busy[i] = (index, None)
+
+            conns = [pool[i][1] for i in busy]
+            wait_time = None if timeout is None else timeout / 10
+            ready = wait(conns, timeout=wait_time)
+            for i in list(busy):
+                process, conn = pool[i]
+                index, start = busy[i]
+                if conn in ready:
+                    try:
+                        index, result = conn.recv()
+                    except EOFError:
+                        error: Exception = RuntimeError(
+                            'The worker process exits unexpectedly in '
+                            'solving model {0}.'.format(index))
+                    else:
+                        if result is None:
+                            busy[i] = (index, time.time())
+                            continue
+                        if isinstance(result[0], Exception):
+                            warnings.warn('Fail to solve model {0}: {1}'.format(
+                                index, result[0]))
+                        solutions[index] = result[0]
+                        busy.pop(i)
+                        continue
+                elif (timeout is not None and start is not None and
+                      time.time() - start > timeout):
+                    error = TimeoutError('Time limit exceeded in solving '
+                                         'model {0}.'.format(index))
+                else:
+                    continue
+
+                warnings.warn(str(error))
+                solutions[index] = error
+                process.terminate()
+                conn.close()
+                pool[i] = start_worker(context, solver_name, display, params)
+                busy.pop(i)
+    finally:
+        for process, conn in pool:
+            if process.is_alive():
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+    for model, solution in zip(models, solutions):
+        write_back(model, solution)
+
+    return solutions
@@ -28,7 +28,7 @@ import time
 from .lp import Solution
 
 
-def solve(formula, display=True, params={}):
+def solve(formula, display=True, params={}, start=None):
 
     try:
         if formula.qmat:
@@ -25,10 +25,28 @@ import warnings
 import time
 from scipy.sparse import csc_matrix
 from .socp import SOCProg
-from .lp import Solution
+from .lp import Solution, start_values
 
 
-def solve(formula, display=True, params={}):
+def solve(formula, display=True, params={}, start=None):
+
+    env, m = load(formula)
+    vtype = formula.vtype
+
+    if start is not None:
+        x0, basis = start_values(formula, start, __name__)
+        known = np.flatnonzero(~np.isnan(x0))
+        if any(vtype != 'C'):
+            xs = m.getVars()
+            m.setMipStart([xs[i] for i in known], x0[known].tolist())
+            m.loadMipStart()
+        elif basis is not None:
+            m.setBasis(basis['col'], basis['row'])
+
+    return optimize(m, vtype, display)
+
+
+def load(formula):
 
     try:
         if formula.xmat:
@@ -40,7 +58,6 @@ def solve(formula, display=True, params={}):
     m = env.createModel()
     m.setParam(cp.COPT.Param.Logging, False)
     m.setParam(cp.COPT.Param.LogToConsole, False)
-    
 
     c = formula.obj[0]
     A = formula.linear
@@ -52,40 +69,117 @@ def solve(formula, display=True, params={}):
 
     lb = formula.lb
     ub = formula.ub
-    lb[vtype=='B'] = 0
-    ub[vtype=='B'] = 1
+    lb[vtype == 'B'] = 0
+    ub[vtype == 'B'] = 1
 
     m.loadMatrix(c, csc_matrix(A), lhs, rhs, lb, ub, vtype)
 
     if isinstance(formula, SOCProg):
-        sc_dim = []
-        sc_indices = []    
-        for q in formula.qmat:
-            sc_dim.append(len(q))
-            sc_indices.extend(q)
-        
         ncone = len(formula.qmat)
         if ncone > 0:
-            m.loadCone(ncone, None, sc_dim, sc_indices)
+            sc_dim = formula.qmat.sizes.tolist()
+            sc_indices = formula.qmat.indices.astype(int)
+            m.loadCone(ncone, None, sc_dim, sc_indices.tolist())
+
+    return env, m
+
+
+def optimize(m, vtype, display=True):
 
     if display:
         print('Being solved by COPT...', flush=True)
         time.sleep(0.2)
     m.solve()
+    stime = m.getAttr(cp.COPT.attr.SolvingTime)
+    if all(vtype == 'C'):
+        status = m.getAttr(cp.COPT.attr.LpStatus)
+    else:
+        status = m.getAttr(cp.COPT.attr.MipStatus)
     if display:
-        stime = m.getAttr(cp.COPT.attr.SolvingTime)
-        if all(vtype == 'C'):
-            status = m.getAttr(cp.COPT.attr.LpStatus)
-        else:
-            status = m.getAttr(cp.COPT.attr.MipStatus)
         print('Solution status: {0}'.format(status))
         print('Running time: {0:0.4f}s'.format(stime))
 
     try:
         x_sol = np.array(m.getValues())
         solution = Solution(x_sol[0], x_sol, status, stime)
+        if all(vtype == 'C') and m.getAttr(cp.COPT.attr.HasBasis):
+            solution.basis = {'solver': __name__,
+                              'col': m.getColBasis(), 'row': m.getRowBasis()}
     except cp.CoptError:
         warnings.warn('Fail to find the optimal solution.')
         solution = None
 
     return solution
+
+
+class Session:
+    """
+    The Session class keeps a COPT model loaded from a standard formula
+    and applies the changes of the formula to the model incrementally.
+    """
+
+    def __init__(self, formula):
+
+        self.env, self.m = load(formula)
+        self.vtype = formula.vtype
+
+    def update(self, formula, delta):
+        """
+        Apply the changes of the standard formula given by the dictionary
+        delta to the COPT model.
+        """
+
+        m = self.m
+        m0, n0 = delta['shape']
+        num_row, num_col = formula.linear.shape
+        lb, ub, vtype = formula.lb, formula.ub, formula.vtype
+        lb[vtype == 'B'] = 0
+        ub[vtype == 'B'] = 1
+
+        for j in range(n0, num_col):
+            m.addVar(lb=lb[j], ub=ub[j], obj=formula.obj[0, j],
+                     vtype=vtype[j])
+        xs = m.getVars()
+        rows = m.getConstrs()
+
+        index = delta['bounds']
+        if index.size:
+            xs_changed = [xs[i] for i in index]
+            m.setInfo(cp.COPT.Info.LB, xs_changed, lb[index].tolist())
+            m.setInfo(cp.COPT.Info.UB, xs_changed, ub[index].tolist())
+        index = delta['obj']
+        if index.size:
+            m.setInfo(cp.COPT.Info.Obj, [xs[i] for i in index],
+                      formula.obj[0, index].tolist())
+        index = delta['rhs']
+        if index.size:
+            m.setInfo(cp.COPT.Info.UB, [rows[i] for i in index],
+                      formula.const[index].tolist())
+            index = index[formula.sense[index] == 1]
+            if index.size:
+                m.setInfo(cp.COPT.Info.LB, [rows[i] for i in index],
+                          formula.const[index].tolist())
+        for i, j, value in zip(*delta['coef']):
+            m.setCoeff(rows[i], xs[j], value)
+
+        linear = formula.linear
+        for i in range(m0, num_row):
+            first, last = linear.indptr[i], linear.indptr[i + 1]
+            expr = cp.LinExpr()
+            expr.addTerms([xs[j] for j in linear.indices[first:last]],
+                          linear.data[first:last].tolist())
+            lower = (formula.const[i] if formula.sense[i] == 1 else
+                     -cp.COPT.INFINITY)
+            m.addBoundConstr(expr, lower, formula.const[i])
+
+        if isinstance(formula, SOCProg):
+            for cone in formula.qmat[delta['qmat']:]:
+                m.addCone([xs[int(i)] for i in cone], cp.COPT.CONE_QUAD)
+        self.vtype = vtype
+
+    def solve(self, display=True, params={}):
+        """
+        Solve the COPT model and return the solution.
+        """
+
+        return optimize(self.m, self.vtype, display)
@@ -23,11 +23,64 @@ import cplex
 import numpy as np
 import warnings
 import time
-from .lp import Solution
+from .lp import Solution, start_values
 from .socp import SOCProg
 
 
-def solve(formula, display=True, params={}):
+def solve(formula, display=True, params={}, start=None):
+
+    cpx = load(formula)
+
+    if start is not None:
+        x0, basis = start_values(formula, start, __name__)
+        known = np.flatnonzero(~np.isnan(x0))
+        if any(np.array(formula.vtype) != 'C'):
+            cpx.MIP_starts.add([known.tolist(), x0[known].tolist()],
+                               cpx.MIP_starts.effort_level.auto)
+        elif basis is not None:
+            cpx.start.set_start(basis['col'], basis['row'], [], [], [], [])
+        elif known.size == x0.size:
+            cpx.start.set_start([], [], x0.tolist(), [], [], [])
+
+    return optimize(cpx, display, params)
+
+
+def add_vars(cpx, formula, first):
+
+    obj = formula.obj.flatten()[first:]
+    lb, ub = formula.lb[first:], formula.ub[first:]
+    vtype = [cpx.variables.type.integer if vt == 'I' else
+             cpx.variables.type.binary if vt == 'B' else
+             cpx.variables.type.continuous for vt in formula.vtype[first:]]
+
+    if all(np.array(formula.vtype) == 'C'):
+        cpx.variables.add(obj=obj, lb=lb, ub=ub)
+    else:
+        cpx.variables.add(obj=obj, lb=lb, ub=ub, types=vtype)
+
+
+def add_rows(cpx, formula, first):
+
+    linear = formula.linear[first:]
+    row = linear.shape[0]
+    spmat = [[linear.indices[linear.indptr[i]:linear.indptr[i + 1]].tolist(),
+              linear.data[linear.indptr[i]:linear.indptr[i + 1]].tolist()]
+             for i in range(row)]
+    sense = ['E' if s == 1 else 'L' for s in formula.sense[first:]]
+    cpx.linear_constraints.add(lin_expr=spmat,
+                               senses=sense, rhs=formula.const[first:])
+
+
+def add_cones(cpx, qmat):
+
+    for cone in qmat:
+        cone_data = [-1] + [1] * (len(cone) - 1)
+        cone = [int(index) for index in cone]
+        q = cplex.SparseTriple(ind1=cone, ind2=cone, val=cone_data)
+        cpx.quadratic_constraints.add(quad_expr=q)
+
+
+def load(formula):
 
     try:
         if formula.xmat:
@@ -36,33 +89,15 @@ def solve(formula, display=True, params={}):
         pass
 
     cpx = cplex.Cplex()
+    add_vars(cpx, formula, 0)
+    add_rows(cpx, formula, 0)
+    if isinstance(formula, SOCProg):
+        add_cones(cpx, formula.qmat)
 
-    # obj = formula.obj.flatten()
-    linear = formula.linear
-    row = linear.shape[0]
-    spmat = [[linear.indices[linear.indptr[i]:linear.indptr[i + 1]].tolist(),
-              linear.data[linear.indptr[i]:linear.indptr[i + 1]].tolist()]
-             for i in range(row)]
-    sense = ['E' if s == 1 else 'L' for s in formula.sense]
-    vtype = [cpx.variables.type.integer if vt == 'I' else
-             cpx.variables.type.binary if vt == 'B' else
-             cpx.variables.type.continuous for vt in formula.vtype]
+    return cpx
 
-    if all(np.array(vtype) == cpx.variables.type.continuous):
-        cpx.variables.add(obj=formula.obj.flatten(),
-                          lb=formula.lb, ub=formula.ub)
-    else:
-        cpx.variables.add(obj=formula.obj.flatten(),
-                          lb=formula.lb, ub=formula.ub, types=vtype)
-    cpx.linear_constraints.add(lin_expr=spmat,
-                               senses=sense, rhs=formula.const)
 
-    if isinstance(formula, SOCProg):
-        for cone in formula.qmat:
-            cone_data = [-1] + [1] * (len(cone) - 1)
-            cone = [int(index) for index in cone]
-            q = cplex.SparseTriple(ind1=cone, ind2=cone, val=cone_data)
-            cpx.quadratic_constraints.add(quad_expr=q)
+def optimize(cpx, display=True, params={}):
 
     if display:
         print('Being solved by CPLEX...', flush=True)
@@ -91,8 +126,69 @@ def solve(formula, display=True, params={}):
         obj_val = cpx.solution.get_objective_value()
         x_sol = np.array(cpx.solution.get_values())
         solution = Solution(obj_val, x_sol, status, stime)
+        if cpx.get_problem_type() == cpx.problem_type.LP:
+            try:
+                col, row = cpx.solution.basis.get_basis()
+                solution.basis = {'solver': __name__, 'col': col, 'row': row}
+            except cplex.exceptions.CplexError:
+                pass
     else:
         warnings.warn('Fail to find the optimal solution.')
         solution = None
 
     return solution
+
+
+class Session:
+    """
+    The Session class keeps a CPLEX model loaded from a standard formula
+    and applies the changes of the formula to the model incrementally.
+    """
+
+    def __init__(self, formula):
+
+        self.cpx = load(formula)
+
+    def update(self, formula, delta):
+        """
+        Apply the changes of the standard formula given by the dictionary
+        delta to the CPLEX model.
+        """
+
+        cpx = self.cpx
+        m0, n0 = delta['shape']
+        m, n = formula.linear.shape
+
+        if n > n0:
+            add_vars(cpx, formula, n0)
+
+        index = delta['bounds']
+        if index.size:
+            cpx.variables.set_lower_bounds(
+                list(zip(index.tolist(), formula.lb[index].tolist())))
+            cpx.variables.set_upper_bounds(
+                list(zip(index.tolist(), formula.ub[index].tolist())))
+        index = delta['obj']
+        if index.size:
+            cpx.objective.set_linear(
+                list(zip(index.tolist(), formula.obj[0, index].tolist())))
+        index = delta['rhs']
+        if index.size:
+            cpx.linear_constraints.set_rhs(
+                list(zip(index.tolist(), formula.const[index].tolist())))
+        rows, cols, values = delta['coef']
+        if rows.size:
+            cpx.linear_constraints.set_coefficients(
+                list(zip(rows.tolist(), cols.tolist(), values.tolist())))
+
+        if m > m0:
+            add_rows(cpx, formula, m0)
+        if isinstance(formula, SOCProg):
+            add_cones(cpx, formula.qmat[delta['qmat']:])
+
+    def solve(self, display=True, params={}):
+        """
+        Solve the CPLEX model and return the solution.
+        """
+
+        return optimize(self.cpx, display, params)
@@ -22,20 +22,31 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from .gcp import Model as GCPModel
 from .ro import Model as ROModel
 from .lp import DecBounds, DecExpConstr, LinConstr
-from .lp import ConeConstr, PCvxConstr, CvxConstr, ExpConstr
+from .lp import ConeBatch, PCvxConstr, CvxConstr, ExpConstr
 from .lp import Vars, Affine
 from .lp import RoAffine, RoConstr
 from .lp import DecVar, RandVar, DecLinConstr, DecCvxConstr, DecPCvxConstr
+from .lp import DecParameter
 from .lp import DecRoConstr
 from .lp import Scen
+from .lp import SupportCache
 from .lp import Solution, def_sol
-from .subroutines import event_dict
+from .presolve import presolve as presolve_formula
+from .report import SolveReport, profiling, phase, profiled
+from .subroutines import event_dict, flat, LazyModule
 import numpy as np
-import pandas as pd
 import scipy.sparse as sp
 from numbers import Real
 from collections.abc import Sized, Iterable
 
+pd = LazyModule('pandas')
+
+
+def scatter(index, num):
+
+    return sp.csr_matrix((np.ones(index.size), (index, np.arange(index.size))),
+                         shape=(num, index.size))
+
 
 class Model:
     """
@@ -64,6 +75,7 @@ class Model:
         self.ro_model.rc_model.top = self
         self.exp_model = GCPModel(nobj=True, mtype='E', top=self)
         self.pro_model = GCPModel(nobj=True, mtype='P', top=self)
+        self.support_cache = SupportCache()
 
         self.obj_ambiguity = None
 
@@ -95,6 +107,7 @@ class Model:
         self.solution = None
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
         self.solution = None
 
@@ -121,6 +134,7 @@ class Model:
         exp_var = self.exp_model.dvar(shape, 'C', name)
         rand_var = RandVar(sup_var, exp_var)
         self.rand_vars.append(rand_var)
+        self.lowered = None
 
         return rand_var
 
@@ -148,9 +162,42 @@ class Model:
         dec_var = self.vt_model.dvar(shape, vtype, name)
         dec_var = DecVar(self, dec_var, name=name)
         self.dec_vars.append(dec_var)
+        self.lowered = None
 
         return dec_var
 
+    def param(self, shape=(), value=0, name=None):
+        """
+        Returns an array of parameters with the given shape and values.
+
+        Parameters
+        ----------
+        shape : int or tuple
+            Shape of the parameter array.
+        value : float or array_like
+            Initial values of the parameters.
+        name : str
+            Name of the parameter array
+
+        Returns
+        -------
+        new_param : rsome.lp.DecParameter
+            An array of new parameters
+
+        Notes
+        -----
+        Parameters are static in all scenarios. They can be multiplied
+        by decision variables, including event-wise and affinely adaptive
+        decision variables, but not by random variables.
+        """
+
+        param = self.vt_model.param(shape, value, name)
+        new_param = DecParameter(self, param, name=name)
+        self.dec_vars.append(new_param)
+        self.lowered = None
+
+        return new_param
+
     def ambiguity(self):
         """
         Returns an event-wise ambiguity set with the given number of scenarios
@@ -163,11 +210,20 @@ class Model:
 
         return Ambiguity(self)
 
+    @profiled('rule_var')
     def rule_var(self):
 
         if self.var_ev_list is not None:
             return self.var_ev_list
 
+        # Products of parameters and variables are variables of the
+        # template model, which are replaced by products in the robust
+        # model after the decision rules are created
+        products = {first for first, _, _ in self.vt_model.products}
+        self.dec_vars += [DecVar(self, item) for item in self.vt_model.vars
+                          if item.first in products]
+        self.dec_vars.sort(key=lambda dvar: dvar.first)
+
         total = sum(dvar.size*len(dvar.event_adapt)
                     for dvar in self.dec_vars)
         vtype = ''.join([dvar.vtype * dvar.size * len(dvar.event_adapt)
@@ -175,6 +231,10 @@ class Model:
                          else dvar.vtype * len(dvar.event_adapt)
                          for dvar in self.dec_vars])
         var_const = self.ro_model.dvar(total, vtype=vtype)
+        for dvar in self.dec_vars:
+            if isinstance(dvar, DecParameter) and dvar.rc_param is None:
+                dvar.rc_param = self.ro_model.param(dvar.shape,
+                                                    dvar.param.value)
 
         count = 0
         for dvar in self.dec_vars:
@@ -246,8 +306,63 @@ class Model:
                                                    self.var_ev_list[s],
                                                    self.ro_model.sup_model)
 
+        self.var_ev_list = [self.param_rule(drule)
+                            for drule in self.var_ev_list]
+
         return self.var_ev_list
 
+    def param_rule(self, drule):
+        """
+        Return the decision rule where the rows of parameters are the
+        parameters of the robust model, and the rows of products of
+        parameters and variables are the products of these parameters
+        and the decision rules of the variables.
+        """
+
+        params = [dvar for dvar in self.dec_vars
+                  if isinstance(dvar, DecParameter)]
+        if not params:
+            return drule
+
+        num = drule.size
+        pvec = 0
+        for dvar in params:
+            index = dvar.first + np.arange(dvar.size)
+            pvec = pvec + (scatter(index, num) @
+                           dvar.rc_param.to_affine().reshape(dvar.size))
+
+        if isinstance(drule, RoAffine):
+            affine = self.param_rows(drule.affine, pvec, params)
+            raffine = self.param_rows(drule.raffine, pvec, params)
+            return RoAffine(raffine, affine + pvec, drule.rand_model)
+        else:
+            return self.param_rows(drule, pvec, params) + pvec
+
+    def param_rows(self, rows, pvec, params):
+
+        # Rows of parameters are removed, and rows of products are the
+        # products of parameters and the rows of variables
+        shape = rows.shape
+        num = shape[0]
+        width = rows.size // num
+        rows = rows.reshape((num, width))
+        keep = np.ones(num)
+        for dvar in params:
+            keep[dvar.first:dvar.first + dvar.size] = 0
+        for first, _, xcols in self.vt_model.products:
+            keep[first:first + len(xcols)] = 0
+        flat = rows.reshape(rows.size)
+        output = sp.diags(np.repeat(keep, width), format='csr') @ flat
+        for first, pcols, xcols in self.vt_model.products:
+            size = len(xcols)
+            left = pvec[pcols].reshape((size, 1))
+            expr = (left * rows[xcols]).reshape(size * width)
+            index = ((first + np.arange(size))[:, None] * width +
+                     np.arange(width)).flatten()
+            output = output + scatter(index, num*width) @ expr
+
+        return output.reshape(shape)
+
     def min(self, obj):
         """
         Minimize the given objective function.
@@ -274,6 +389,7 @@ class Model:
         self.sign = 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
     def max(self, obj):
         """
@@ -301,6 +417,7 @@ class Model:
         self.sign = - 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
     def minsup(self, obj, ambset):
         """
@@ -331,6 +448,7 @@ class Model:
         self.sign = 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
     def maxinf(self, obj, ambset):
 
@@ -362,6 +480,7 @@ class Model:
         self.sign = - 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
     def st(self, *arg):
         """
@@ -428,27 +547,31 @@ class Model:
                 self.do_math(primal=True)
                 return self.ro_model.do_math(False)
 
-        self.ro_model.reset()
-        self.rule_var()
-
-        # Event-wise objective function
-        self.ro_model.obj = None
-        self.ro_model.min(self.ro_model.rc_model.vars[1][0].to_affine())
-        sign = self.sign
-        constr = (self.dec_vars[0] >= self.obj * sign)
-        if isinstance(constr, DecCvxConstr):
-            ro_constr_list = self.ro_to_roc(constr)
-        elif constr.ctype == 'R':
-            ro_constr_list = self.ro_to_roc(constr)
-        elif constr.ctype == 'E':
-            ro_constr_list = self.dro_to_roc(constr)
-        else:
-            raise SyntaxError('Syntax error.')
+        if self.lowered is None:
+            self.ro_model.reset()
+            self.rule_var()
 
-        self.ro_model.st(ro_constr_list)
+            # Event-wise objective function
+            self.ro_model.obj = None
+            self.ro_model.min(self.ro_model.rc_model.vars[1][0].to_affine())
+            sign = self.sign
+            constr = (self.dec_vars[0] >= self.obj * sign)
+            if isinstance(constr, DecCvxConstr):
+                ro_constr_list = self.ro_to_roc(constr)
+            elif constr.ctype == 'R':
+                ro_constr_list = self.ro_to_roc(constr)
+            elif constr.ctype == 'E':
+                ro_constr_list = self.dro_to_roc(constr)
+            else:
+                raise SyntaxError('Syntax error.')
+
+            self.ro_model.st(ro_constr_list)
+            constrs = self.all_constr
+        else:
+            constrs = self.all_constr[self.lowered:]
 
         # Event-wise Constraints
-        for constr in self.all_constr:
+        for constr in constrs:
             if isinstance(constr, (DecCvxConstr, DecPCvxConstr, DecExpConstr)):
                 ro_constr_list = self.ro_to_roc(constr)
             elif constr.ctype == 'R':
@@ -458,6 +581,7 @@ class Model:
             else:
                 raise SyntaxError('Syntax error')
             self.ro_model.st(ro_constr_list)
+        self.lowered = len(self.all_constr)
 
         formula = self.ro_model.do_math(primal)
         if primal:
@@ -469,6 +593,7 @@ class Model:
 
         return formula
 
+    @profiled('ro_to_roc')
     def ro_to_roc(self, constr):
 
         drule_list = self.rule_var()
@@ -646,14 +771,12 @@ class Model:
                                               'undefined.')
                         else:
                             ambset = self.obj_ambiguity
-                            support = ambset.sup_constr[s]
                     else:
                         ambset = constr.ambset
-                        if isinstance(ambset, Ambiguity):
-                            support = constr.ambset.sup_constr[s]
-                        elif isinstance(ambset, Iterable):
-                            support = ambset
-                    ew_constr = ew_constr.forall(support)
+                    if isinstance(ambset, Ambiguity):
+                        ew_constr.support = ambset.scen_support(s)
+                    elif isinstance(ambset, Iterable):
+                        ew_constr = ew_constr.forall(ambset)
                 else:
                     ew_constr = LinConstr(ew_constr.affine.model,
                                           ew_constr.affine.linear,
@@ -664,6 +787,7 @@ class Model:
 
         return ro_constr
 
+    @profiled('dro_to_roc')
     def dro_to_roc(self, constr):
 
         drule_list = self.rule_var()
@@ -695,56 +819,56 @@ class Model:
             const = np.array([const])
 
         # Standardize constraints
-        ro_constr = []
-        for i in range(linear.shape[0]):
-            alpha = self.ro_model.dvar(num_scen)
-            if num_event:
-                beta = self.ro_model.dvar((num_rand, num_event))
-            else:
-                beta = 0
-
-            left = alpha @ p
+        num_constr = linear.shape[0]
+        alpha = self.ro_model.dvar((num_constr, num_scen))
+        left = alpha @ p
+        if num_event:
+            beta = self.ro_model.dvar((num_constr, num_rand, num_event))
             for j in range(num_event):
-                left += var_exp_list[j][:num_rand] @ beta[:, j]
-            ro_constr.extend((left <= 0).le_to_rc(mixed_support))
-
-            z = Vars(self.sup_model, 0, (num_rand,), 'C', None)
-            for s in range(num_scen):
-                drule = drule_list[s]
-                left = linear[i, :num_var] @ drule + const[i]
-                if raffine:
-                    if isinstance(drule, RoAffine):
-                        extra = left.raffine
-                        temp = drule.affine
-                        left = left.affine.reshape(left.shape)
-                    elif isinstance(drule, Affine):
-                        extra = 0
-                        temp = drule
-                    else:
-                        raise TypeError('Incorrect data type.')
-                    row_ind = i*num_rand + np.arange(num_rand, dtype=int)
-                    new_raffine = raffine.linear[row_ind] @ temp
-                    new_raffine = new_raffine.reshape((1, new_raffine.size))
-                    new_raffine += raffine.const[i, :num_rand] + extra
-                    left = RoAffine(new_raffine, left, constr.rand_model)  # ##
-
-                event_indices = [k for k in range(num_event)
-                                 if s in ambset.exp_constr_indices[k]]
-                if len(event_indices) > 0:
-                    right = alpha[s] + (z @ beta[:, event_indices]).sum()
-                else:
-                    right = alpha[s]
-                inequality = (left <= right)
-                if isinstance(inequality, RoConstr):
-                    ro_constr.append(inequality.forall(ambset.sup_constr[s]))
-                elif isinstance(inequality, LinConstr):
-                    ro_constr.append(inequality)
+                left += beta[:, :, j] @ var_exp_list[j][:num_rand]
+        ro_constr = (left <= 0).le_to_rc(mixed_support)
+
+        z = Vars(self.sup_model, 0, (num_rand,), 'C', None)
+        const = const.reshape(num_constr)
+        for s in range(num_scen):
+            drule = drule_list[s]
+            left = linear[:, :num_var] @ drule + const
+            if raffine:
+                if isinstance(drule, RoAffine):
+                    extra = left.raffine
+                    temp = drule.affine
+                    left = left.affine.reshape(left.shape)
+                elif isinstance(drule, Affine):
+                    extra = 0
+                    temp = drule
                 else:
                     raise TypeError('Incorrect data type.')
+                row_ind = np.arange(num_constr*num_rand, dtype=int)
+                new_raffine = raffine.linear[row_ind] @ temp
+                new_raffine = new_raffine.reshape((num_constr, num_rand))
+                new_raffine += raffine.const[:, :num_rand] + extra
+                left = RoAffine(new_raffine, left, constr.rand_model)  # ##
+
+            event_indices = [k for k in range(num_event)
+                             if s in ambset.exp_constr_indices[k]]
+            if len(event_indices) > 0:
+                right = alpha[:, s] + beta[:, :, event_indices].sum(axis=2) @ z
+            else:
+                right = alpha[:, s]
+            inequality = (left <= right)
+            if isinstance(inequality, RoConstr):
+                inequality.support = ambset.scen_support(s)
+                ro_constr.append(inequality)
+            elif isinstance(inequality, LinConstr):
+                ro_constr.append(inequality)
+            else:
+                raise TypeError('Incorrect data type.')
 
         return ro_constr
 
-    def solve(self, solver=None, display=True, params={}):
+    def solve(self, solver=None, display=True, params={},
+              warm_start=False, profile=False,
+              presolve=False):
         """
         Solve the model with the selected solver interface.
 
@@ -758,14 +882,45 @@ class Model:
             params : dict
                 A dictionary that specifies parameters of the selected solver.
                 So far the argument only applies to Gurobi and MOSEK.
+            warm_start : bool
+                Pass the previous solution, and the simplex basis if it is
+                available, to the solver as the starting point. So far the
+                argument only applies to Gurobi, CPLEX, MOSEK, and COPT.
+            profile : bool
+                Return a SolveReport of the time, allocated memory blocks,
+                and output sizes of the phases of the solve if profile=True.
+            presolve : bool
+                Reduce the formula by rsome.presolve before it is passed to
+                the solver if presolve=True. Only the primal solution is
+                restored, so the simplex basis is unavailable, and the
+                warm_start argument is ignored.
         """
 
-        if solver is None:
-            solution = def_sol(self.do_math(), display, params)
-        else:
-            solution = solver.solve(self.do_math(), display, params)
+        report = SolveReport() if profile else None
+        with profiling(report), phase('solve'):
+            with phase('do_math') as record:
+                formula = self.do_math()
+                record.output(formula)
+            if presolve:
+                with phase('presolve') as record:
+                    formula, postsolve = presolve_formula(formula)
+                    record.output(formula)
+                    warm_start = False
+            with phase('solver') as record:
+                rc_model = self.ro_model.rc_model
+                if solver is None:
+                    solution = def_sol(formula, display, params)
+                elif warm_start and rc_model.solution is not None:
+                    solution = solver.solve(formula, display, params,
+                                            start=rc_model.start_point())
+                else:
+                    solution = solver.solve(formula, display, params)
+                record.split(solution)
+            if presolve:
+                solution = postsolve(solution)
 
         if isinstance(solution, Solution):
+            solution.layout = self.ro_model.rc_model.layout()
             self.ro_model.solution = solution
         else:
             self.ro_model.solution = None
@@ -773,6 +928,10 @@ class Model:
         self.ro_model.rc_model.solution = solution
         self.solution = solution
 
+        if report is not None:
+            report.solution = self.ro_model.solution
+            return report
+
     def get(self):
         """
         Return the optimal objective value of the solved model.
@@ -876,6 +1035,7 @@ class Ambiguity:
         """
 
         self.update = True
+        self.model.lowered = None
         return self.s.suppset(*args)
 
     def exptset(self, *args):
@@ -897,6 +1057,7 @@ class Ambiguity:
         """
 
         self.update = True
+        self.model.lowered = None
         return self.s.exptset(*args)
 
     def probset(self, *args):
@@ -918,6 +1079,7 @@ class Ambiguity:
         """
 
         self.update = True
+        self.model.lowered = None
         for arg in args:
             if arg.model is not self.model.pro_model:
                 raise ValueError('Constraints are not defined for the ' +
@@ -931,9 +1093,10 @@ class Ambiguity:
         if not self.update and self.mix_model is not None:
             return self.mix_model.do_math(primal, obj=False)
 
-        self.model.pro_model.reset()
-        self.model.pro_model.st(self.pro_constr)
-        pro_support = self.model.pro_model.do_math(obj=False)
+        self.update = False
+        cache = self.model.support_cache
+        pro_support = cache.formula(self.model.pro_model,
+                                    flat([self.pro_constr]), primal=True)
         self.mix_model = GCPModel(nobj=True, mtype='M', top=self.model)
 
         # Constraints for probabilities
@@ -942,27 +1105,38 @@ class Ambiguity:
                            pro_support.linear, pro_support.const,
                            pro_support.sense)
         self.mix_model.st(constr)
-        for q in pro_support.qmat:
-            cconstr = ConeConstr(self.mix_model, p, q[1:], p, q[0])
-            self.mix_model.st(cconstr)
-        for ex in pro_support.xmat:
-            econstr = ExpConstr(self.mix_model, p[ex[0]], p[ex[1]], p[ex[2]])
-            self.mix_model.st(econstr)
+        for cones in pro_support.qmat.groups().values():
+            self.mix_model.st(ConeBatch(self.mix_model, p, cones, 'Q'))
+        if pro_support.xmat:
+            cones = pro_support.xmat.indices.reshape((-1, 3))
+            self.mix_model.st(ConeBatch(self.mix_model, p, cones, 'X'))
 
         # Constraints for expectations
         for econstr, indices in zip(self.exp_constr, self.exp_constr_indices):
-            self.model.exp_model.reset()
-            self.model.exp_model.st(econstr)
-            exp_support = self.model.exp_model.do_math(obj=False)
+            exp_support = cache.formula(self.model.exp_model,
+                                        flat([econstr]), primal=True)
             exp_var = self.mix_model.dvar(exp_support.linear.shape[1])
             affine = (exp_support.linear @ exp_var
                       - p[indices].sum() * exp_support.const)
             constr = LinConstr(affine.model, affine.linear, affine.const,
                                exp_support.sense)
             self.mix_model.st(constr)
-            for q in exp_support.qmat:
-                cconstr = ConeConstr(self.mix_model, exp_var, q[1:],
-                                     exp_var, q[0])
-                self.mix_model.st(cconstr)
+            for cones in exp_support.qmat.groups().values():
+                self.mix_model.st(ConeBatch(self.mix_model, exp_var,
+                                            cones, 'Q'))
 
         return self.mix_model.do_math(primal, obj=False)
+
+    def scen_support(self, s):
+        """
+        Return the dual formula of the support set of scenario s. The
+        formula is retrieved from the support cache if the same support
+        set has been dualized before.
+        """
+
+        constrs = self.sup_constr[s]
+        if constrs is None:
+            return None
+
+        return self.model.support_cache.formula(self.model.sup_model,
+                                                constrs)
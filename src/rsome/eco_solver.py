@@ -27,10 +27,10 @@ import time
 import scipy.sparse as sp
 from .socp import SOCProg
 from .gcp import GCProg
-from .lp import Solution
+from .lp import Solution, ConeList
 
 
-def solve(formula, display=True, params={}):
+def solve(formula, display=True, params={}, start=None):
 
     bool_idx = [i for i in range(len(formula.vtype)) if formula.vtype[i] == 'B']
     int_idx = [i for i in range(len(formula.vtype)) if formula.vtype[i] == 'I']
@@ -55,30 +55,20 @@ def solve(formula, display=True, params={}):
                          (np.arange(num_zub, dtype='int'), zub_idx)),
                         (num_zub, cols))
 
-    Gsc = []
-    sc_dim = []
-    qmat = formula.qmat if isinstance(formula, SOCProg) else []
-    for q in qmat:
-        num = len(q)
-        socone = sp.csc_matrix((-np.ones(num),
-                                (np.arange(num, dtype='int'), q)),
-                               (num, cols))
-        Gsc.append(socone)
-        sc_dim.append(num)
-
-    Gec = []
-    xmat = formula.xmat if isinstance(formula, GCProg) else []
-    for e in xmat:
-        expcone = sp.csc_matrix((-np.ones(3),
-                                 (np.arange(3, dtype='int'), e)),
-                                (3, cols))
-        Gec.append(expcone)
-
-    G = sp.csc_matrix(sp.vstack([Gl, Glb, Gub] + Gsc + Gec))
+    qmat = formula.qmat if isinstance(formula, SOCProg) else ConeList()
+    xmat = formula.xmat if isinstance(formula, GCProg) else ConeList()
+    cone_idx = np.concatenate((qmat.indices, xmat.indices)).astype(int)
+    num_cone = cone_idx.size
+    Gcone = sp.csr_matrix((-np.ones(num_cone),
+                           (np.arange(num_cone, dtype='int'), cone_idx)),
+                          (num_cone, cols))
+    sc_dim = qmat.sizes.tolist()
+
+    G = sp.csc_matrix(sp.vstack([Gl, Glb, Gub, Gcone]))
     h = np.hstack((formula.const[ineq_idx],
                    -formula.lb[zlb_idx],
                    formula.ub[zub_idx],
-                   np.zeros(sum(sc_dim)), np.zeros(len(xmat)*3)))
+                   np.zeros(num_cone)))
 
     dims = {'l': num_ineq + num_zlb + num_zub,
             'q': sc_dim, 'e': len(xmat)}
@@ -19,14 +19,17 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
-from .lp import CvxConstr, PCvxConstr, ExpConstr, KLConstr
+from .lp import CvxConstr, PCvxConstr, ExpConstr, KLConstr, ConeBatch
 from .socp import Model as SOCModel
 from .socp import SOCProg
+from .lp import ConeList, sparse_table
+from .subroutines import LazyModule
 import numpy as np
-import pandas as pd
 import scipy.sparse as sp
 from collections.abc import Iterable
-from .subroutines import flat, rso_broadcast
+from numbers import Real
+
+pd = LazyModule('pandas')
 
 
 class Model(SOCModel):
@@ -48,6 +51,9 @@ class Model(SOCModel):
         self.aux_constr = []
         self.aux_bounds = []
         self.cvx_constr = []
+        self.lowered = {}
+        self.pupdate = True
+        self.dupdate = True
 
     def st(self, constr):
 
@@ -56,6 +62,10 @@ class Model(SOCModel):
                 self.st(item)
         elif isinstance(constr, ExpConstr):
             self.exp_constr.append(constr)
+        elif isinstance(constr, ConeBatch) and constr.ctype == 'X':
+            if constr.model is not self:
+                raise ValueError('Constraints are not defined for this model.')
+            self.exp_constr.append(constr)
         elif isinstance(constr, CvxConstr):
             if constr.xtype in 'XLP':
                 self.other_constr.append(constr)
@@ -72,6 +82,35 @@ class Model(SOCModel):
         else:
             super().st(constr)
 
+        self.pupdate = True
+        self.dupdate = True
+
+    def exp_block(self, expr1, expr2, expr3):
+        """
+        Lower the exponential cone constraints expr3*exp(expr1/expr3) <=
+        expr2, broadcast over the shapes of the expressions, into one
+        block of auxiliary variables. The indices of the auxiliary
+        variables are returned as a 2-D array, one row for each cone.
+        """
+
+        exprs = [np.array(expr, dtype=float) if isinstance(expr, Real)
+                 else expr for expr in (expr1, expr2, expr3)]
+        shape = np.broadcast_shapes(*[expr.shape for expr in exprs])
+        num = int(np.prod(shape))
+        if num == 0:
+            return np.zeros((0, 3), dtype=int)
+        exprs = [(expr + np.zeros(shape)).reshape(num)
+                 if not isinstance(expr, np.ndarray) else
+                 np.broadcast_to(expr, shape).reshape(num)
+                 for expr in exprs]
+
+        aux_var = self.dvar((num, 3), aux=True)
+        self.aux_constr.append(aux_var[:, 0] - exprs[0] == 0)
+        self.aux_constr.append(aux_var[:, 1] - exprs[1] <= 0)
+        self.aux_constr.append(aux_var[:, 2] - exprs[2] == 0)
+
+        return aux_var.first + np.arange(3*num).reshape((num, 3))
+
     def do_math(self, primal=True, refresh=True, obj=True):
         """
         Return the linear, second-order cone, or exponential
@@ -101,13 +140,11 @@ class Model(SOCModel):
                 return self.primal
 
             if refresh:
-                self.auxs = []
-                self.aux_constr = []
-                self.aux_bounds = []
-                self.last = self.vars[-1].first + self.vars[-1].size
+                self.lowered_counts()
+            lowered = self.lowered
 
-            more_exp = []
-            if self.obj is not None:
+            more_other = []
+            if self.obj is not None and not lowered.get('obj'):
                 obj_constr = (self.vars[0] - self.sign * self.obj >= 0)
                 if isinstance(obj_constr, CvxConstr):
                     constr = obj_constr
@@ -126,83 +163,63 @@ class Model(SOCModel):
                         more_exp.append(exp_cone_constr)
                     """
                     if constr.xtype in 'XLP':
-                        self.other_constr.append(constr)
-            
+                        more_other.append(constr)
 
-            for constr in self.other_constr:
+            xmat = ConeList(lowered.get('xmat'))
+            for constr in (self.other_constr[lowered.get('other', 0):] +
+                           more_other):
                 if isinstance(constr, KLConstr):
                     ns = constr.p.size
                     aux_var = self.dvar(ns, aux=True)
                     self.aux_constr.append(aux_var.sum() <= constr.r)
-                    for s in range(ns):
-                        ps = constr.phat[s]
-                        p = constr.p[s]
-
-                        entro_constr = aux_var[s] * (1/ps) >= -(p * (1/ps)).entropy()
-                        exp_constr = ExpConstr(entro_constr.model,
-                                               entro_constr.affine_out,
-                                               1, entro_constr.affine_in)
-
-                        more_exp.append(exp_constr)
+                    scale = 1 / np.array(constr.phat).reshape(ns)
+                    p = constr.p.to_affine().reshape(ns)
+                    xmat.extend(self.exp_block(-aux_var * scale, 1, p * scale))
                 elif isinstance(constr, PCvxConstr):
+                    affine_out = constr.affine_out * (1/constr.multiplier)
                     if constr.xtype == 'X':
-                        affine_out = constr.affine_out * (1/constr.multiplier)
-                        exprs_list = rso_broadcast(constr.affine_in,
-                                                   constr.affine_scale,
-                                                   affine_out)
-                        for exprs in exprs_list:
-                            exp_cone_constr = ExpConstr(constr.model,
-                                                        exprs[0], -exprs[2], exprs[1])
-                            self.exp_constr.append(exp_cone_constr)
+                        xmat.extend(self.exp_block(constr.affine_in,
+                                                   -affine_out,
+                                                   constr.affine_scale))
                     elif constr.xtype == 'L':
-                        affine_out = constr.affine_out * (1/constr.multiplier)
-                        exprs_list = rso_broadcast(constr.affine_in,
-                                                   constr.affine_scale,
-                                                   affine_out)
-                        for exprs in exprs_list:
-                            exp_cone_constr = ExpConstr(constr.model, 
-                                                        exprs[2], exprs[0], exprs[1])
-                            self.exp_constr.append(exp_cone_constr)
+                        xmat.extend(self.exp_block(affine_out,
+                                                   constr.affine_in,
+                                                   constr.affine_scale))
                 elif isinstance(constr, CvxConstr):
+                    affine_out = constr.affine_out * (1/constr.multiplier)
                     if constr.xtype == 'P':
-                        affine_out = constr.affine_out * (1/constr.multiplier)
                         aux_var = self.dvar(constr.affine_in.shape)
                         self.aux_constr.append(aux_var.sum() >= affine_out)
-                        ns = constr.affine_in.size
-                        affine_in = constr.affine_in.reshape(ns)
-                        affine_aux = aux_var.to_affine().reshape(ns)
-                        for s in range(ns):
-                            exp_cone_constr = ExpConstr(constr.model, 
-                                                        affine_aux[s], 
-                                                        1, affine_in[s])
-                            more_exp.append(exp_cone_constr)
+                        xmat.extend(self.exp_block(aux_var.to_affine(), 1,
+                                                   constr.affine_in))
                     elif constr.xtype == 'X':
-                        affine_out = constr.affine_out * (1/constr.multiplier)
-                        exprs_list = rso_broadcast(constr.affine_in, affine_out)
-                        for exprs in exprs_list:
-                            exp_cone_constr = ExpConstr(constr.model, 
-                                                        exprs[0], -exprs[1], 1)
-                            self.exp_constr.append(exp_cone_constr)
+                        xmat.extend(self.exp_block(constr.affine_in,
+                                                   -affine_out, 1))
                     elif constr.xtype == 'L':
-                        affine_out = constr.affine_out * (1/constr.multiplier)
-                        exprs_list = rso_broadcast(constr.affine_in, affine_out)
-                        for exprs in exprs_list:
-                            exp_cone_constr = ExpConstr(constr.model, 
-                                                        exprs[1], exprs[0], 1)
-                            self.exp_constr.append(exp_cone_constr)
-
-            xmat = []
-            for constr in self.exp_constr + more_exp:
-                aux_var = self.dvar(3, aux=True)
-                self.aux_constr.append(aux_var[0] - constr.expr1 == 0)
-                self.aux_constr.append(aux_var[1] - constr.expr2 <= 0)
-                self.aux_constr.append(aux_var[2] - constr.expr3 == 0)
-                xmat.append(list(range(aux_var.first, aux_var.first + 3)))
+                        xmat.extend(self.exp_block(affine_out,
+                                                   constr.affine_in, 1))
+
+            for constr in self.exp_constr[lowered.get('exp', 0):]:
+                if isinstance(constr, ConeBatch):
+                    expr = constr.var.to_affine().reshape(constr.var.size)
+                    indices = constr.indices
+                    xmat.extend(self.exp_block(expr[indices[:, 0]],
+                                               expr[indices[:, 1]],
+                                               expr[indices[:, 2]]))
+                else:
+                    xmat.extend(self.exp_block(constr.expr1, constr.expr2,
+                                               constr.expr3))
+            lowered['other'] = len(self.other_constr)
+            lowered['exp'] = len(self.exp_constr)
+            lowered['xmat'] = xmat
 
             formula = super().do_math(primal=True, refresh=False, obj=obj)
             formula = GCProg(formula.linear, formula.const, formula.sense,
                              formula.vtype, formula.ub, formula.lb,
                              formula.qmat, xmat, formula.obj)
+            formula.lowered = lowered.get('rows')
+            if self.pmap is not None:
+                formula.pcoef = self.pmap['coef']
             self.primal = formula
             self.pupdate = False
 
@@ -224,19 +241,12 @@ class Model(SOCModel):
                 return formula
 
             if len(primal.qmat) == 0:
-                pxmat = primal.xmat
+                pxmat = primal.xmat.indices.reshape((-1, 3))
             else:
-                num_exp = len(primal.xmat)
-                i_idx = np.array([range(num_exp)] * 3).T.flatten()
-                j_idx = flat(primal.xmat)
-                sp_xmat = sp.csr_matrix(([1, 1, 1] * num_exp,
-                                         (i_idx, j_idx)),
-                                        (num_exp, primal.linear.shape[1]))
-                socp_idx = flat(primal.qmat)
-                keep_idx = [i for i in range(primal.linear.shape[1])
-                            if i not in socp_idx]
-                sp_xmat = sp_xmat[:, keep_idx]
-                pxmat = [list(sp_xmat[i].indices) for i in range(num_exp)]
+                keep_mask = np.ones(primal.linear.shape[1], dtype=bool)
+                keep_mask[primal.qmat.indices] = False
+                new_index = np.cumsum(keep_mask) - 1
+                pxmat = new_index[primal.xmat.indices].reshape((-1, 3))
 
             # eye_indices = [item for inner in pxmat for item in inner]
             # eye_block = dual_socp.linear[eye_indices, :]
@@ -254,9 +264,9 @@ class Model(SOCModel):
             num_xc = len(pxmat)
             count_col = np.arange(0, 3*num_xc, 3).reshape((num_xc, 1))
             xmat = count_col + np.array([[0, 1, 2]]*num_xc)
-            xmat = list((linear.shape[1] + xmat))
+            xmat = ConeList(linear.shape[1] + xmat)
             data = [-1, 1, -1, -1] * num_xc
-            i_idx = np.array([ex + ex[-1:] for ex in pxmat]).flatten()
+            i_idx = np.hstack((pxmat, pxmat[:, -1:])).flatten()
             j_idx = (count_col + np.array([2, 1, 0, 2])).flatten()
             extra_block = sp.csr_matrix((data, (i_idx, j_idx)),
                                         (linear.shape[0], 3*num_xc))
@@ -278,7 +288,7 @@ class GCProg(SOCProg):
     def __init__(self, linear, const, sense, vtype, ub, lb, qmat, xmat, obj=None):
 
         super().__init__(linear, const, sense, vtype, ub, lb, qmat, obj)
-        self.xmat = xmat
+        self.xmat = xmat if isinstance(xmat, ConeList) else ConeList(xmat)
 
     def __repr__(self):
 
@@ -291,26 +301,34 @@ class GCProg(SOCProg):
 
         return string
 
-    def showec(self):
+    def showec(self, rows=None):
+        """
+        Returns a pandas.DataFrame of exponential cone constraints, where
+        the coefficients 1, 2, and 3 indicate the positions of variables
+        in each cone.
+
+        Parameters
+        ----------
+        rows : int, slice, or array_like
+            Indices of the selected cones. All cones and all variables are
+            shown if rows=None, otherwise only the variables involved in
+            the selected cones are shown, as columns of sparse arrays.
+        """
 
         n = len(self.xmat)
 
         if n == 0:
             return None
 
-        indices = np.concatenate([item for item in self.xmat])
-        values = [1, 2, 3] * n
-        indptr = range(0, 3*n+1, 3)
-
-        var_names = ['x{0}'.format(i)
-                     for i in range(1, self.linear.shape[1] + 1)]
-        constr_names = ['EC{0}'.format(j)
-                        for j in range(1, n + 1)]
-        table = pd.DataFrame(sp.csr_matrix((values, indices, indptr),
-                             (n, self.linear.shape[1])).todense(),
-                             index=constr_names, columns=var_names)
-        table['sense'] = ['-'] * n
-        table['constant'] = ['-'] * n
+        indices = self.xmat.indices
+        values = np.tile([1, 2, 3], n)
+        indptr = np.arange(0, 3*n + 1, 3)
+
+        matrix = sp.csr_matrix((values, indices, indptr),
+                               (n, self.linear.shape[1]))
+        table, index = sparse_table(matrix, rows, 'EC')
+        table['sense'] = ['-'] * index.size
+        table['constant'] = ['-'] * index.size
 
         return table
 
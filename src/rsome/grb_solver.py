@@ -24,19 +24,18 @@ import numpy as np
 import warnings
 import time
 from .socp import SOCProg
-from .lp import Solution
+from .lp import Solution, ConeList, start_values
 
 
-def solve(formula, display=True, params={}):
-
-    try:
-        if formula.xmat:
-            warnings.warn('The SOCP solver ignores exponential cone constraints. ')
-    except AttributeError:
-        pass
+def load(formula):
+    """
+    Load the standard formula into a Gurobi model. Linear constraints
+    are added as matrix constraints and cone constraints of the same
+    dimension are added in one batch.
+    """
 
     nv = formula.linear.shape[1]
-    vtype = list(formula.vtype)
+    vtype = np.array(formula.vtype, dtype=str)
 
     grb = gp.Model()
     x = grb.addMVar(nv, lb=formula.lb, ub=formula.ub, vtype=vtype)
@@ -55,15 +54,85 @@ def solve(formula, display=True, params={}):
         # grb.addMConstrs(linear_ineq, x, '<', const_ineq)
 
     if isinstance(formula, SOCProg):
-        for constr in formula.qmat:
-            index_right = constr[0:1]
-            index_left = constr[1:]
-            A = np.eye(len(index_left))
-            grb.addConstr(x[index_left] @ A @ x[index_left] <=
-                          x[index_right] @ x[index_right])
+        for cones in formula.qmat.groups().values():
+            x_left = x[cones[:, 1:]]
+            x_right = x[cones[:, 0]]
+            grb.addConstr((x_left * x_left).sum(axis=1) <= x_right * x_right)
 
     grb.setObjective(formula.obj @ x)
 
+    return grb
+
+
+def warm_start(grb, formula, start):
+    """
+    Set the starting point of the Gurobi model. The simplex basis is used
+    for linear programs if it is recorded by the previous solution. The
+    starting values of variables are used otherwise, as a partial MIP
+    start for mixed-integer programs, or as the primal simplex start for
+    linear programs if all values are known, together with the dual
+    simplex start if the dual values of all rows are known.
+    """
+
+    x0, basis = start_values(formula, start, __name__)
+    grb.update()
+    xs = grb.getVars()
+    known = ~np.isnan(x0)
+    if any(np.array(formula.vtype) != 'C'):
+        x0[~known] = gp.GRB.UNDEFINED
+        grb.setAttr('Start', xs, x0.tolist())
+    elif basis is not None:
+        grb.setAttr('VBasis', xs, basis['col'])
+        grb.setAttr('CBasis', grb.getConstrs(), basis['row'])
+    elif known.all():
+        grb.setAttr('PStart', xs, x0.tolist())
+        dual = getattr(start, 'dual', None)
+        if dual is not None and len(dual) == len(formula.sense):
+            rows = formula_rows(formula.sense, grb.getConstrs())
+            grb.setAttr('DStart', list(rows), list(dual))
+
+
+def solve(formula, display=True, params={}, start=None):
+
+    try:
+        if formula.xmat:
+            warnings.warn('The SOCP solver ignores exponential cone constraints. ')
+    except AttributeError:
+        pass
+
+    grb = load(formula)
+    if start is not None:
+        warm_start(grb, formula, start)
+    grb.update()
+    rows = formula_rows(formula.sense, grb.getConstrs())
+
+    return optimize(grb, display, params, rows)
+
+
+def formula_rows(sense, constrs):
+    """
+    Return the last constraints of the Gurobi model, added as equality
+    constraints followed by inequality constraints, in the order of the
+    rows of the formula.
+    """
+
+    added = np.empty(len(sense), dtype=object)
+    added[:] = constrs[len(constrs) - len(sense):]
+    order = np.concatenate((np.flatnonzero(sense == 1),
+                            np.flatnonzero(sense != 1)))
+    rows = np.empty(len(sense), dtype=object)
+    rows[order] = added
+
+    return rows
+
+
+def optimize(grb, display=True, params={}, rows=None):
+    """
+    Optimize the loaded Gurobi model and return the solution. The dual
+    values of linear programs are recorded in the order of the given
+    constraints of rows.
+    """
+
     grb.setParam('LogToConsole', 0)
     try:
         for param, value in params.items():
@@ -88,6 +157,93 @@ def solve(formula, display=True, params={}):
         solution = Solution(grb.ObjVal, grb.getAttr('X'), grb.Status, grb.Runtime)
     except AttributeError:
         warnings.warn('Fail to find the optimal solution.')
-        solution = None
+        return None
+
+    if grb.IsMIP == 0 and grb.NumQConstrs == 0:
+        try:
+            if rows is not None:
+                solution.dual = np.array(grb.getAttr('Pi', list(rows)))
+            solution.basis = {'solver': __name__,
+                              'col': grb.getAttr('VBasis', grb.getVars()),
+                              'row': grb.getAttr('CBasis', grb.getConstrs())}
+        except (AttributeError, gp.GurobiError):
+            pass
 
     return solution
+
+
+class Session:
+    """
+    The Session class keeps a Gurobi model loaded from a standard formula
+    and applies the changes of the formula to the model incrementally.
+    """
+
+    def __init__(self, formula):
+
+        self.grb = load(formula)
+        self.grb.update()
+        self.xs = self.grb.getVars()
+        self.rows = formula_rows(formula.sense, self.grb.getConstrs())
+
+    def update(self, formula, delta):
+        """
+        Apply the changes of the standard formula given by the dictionary
+        delta to the Gurobi model.
+        """
+
+        grb = self.grb
+        m0, n0 = delta['shape']
+        m, n = formula.linear.shape
+
+        if n > n0:
+            grb.addMVar(n - n0, lb=formula.lb[n0:], ub=formula.ub[n0:],
+                        obj=formula.obj[0, n0:],
+                        vtype=np.array(formula.vtype[n0:], dtype=str))
+            grb.update()
+            self.xs = grb.getVars()
+        xs = self.xs
+
+        index = delta['bounds']
+        if index.size:
+            xs_changed = [xs[i] for i in index]
+            grb.setAttr('LB', xs_changed, formula.lb[index].tolist())
+            grb.setAttr('UB', xs_changed, formula.ub[index].tolist())
+        index = delta['obj']
+        if index.size:
+            grb.setAttr('Obj', [xs[i] for i in index],
+                        formula.obj[0, index].tolist())
+        index = delta['rhs']
+        if index.size:
+            grb.setAttr('RHS', list(self.rows[index]),
+                        formula.const[index].tolist())
+        for i, j, value in zip(*delta['coef']):
+            grb.chgCoeff(self.rows[i], xs[j], value)
+
+        if m > m0:
+            x = gp.MVar.fromlist(xs)
+            sense = formula.sense[m0:]
+            linear = formula.linear[m0:]
+            const = formula.const[m0:]
+            if (sense == 1).any():
+                grb.addMConstr(linear[sense == 1], x, '=', const[sense == 1])
+            if (sense == 0).any():
+                grb.addMConstr(linear[sense == 0], x, '<', const[sense == 0])
+            grb.update()
+            self.rows = np.concatenate((self.rows,
+                                        formula_rows(sense, grb.getConstrs())))
+
+        qmat = formula.qmat if isinstance(formula, SOCProg) else ConeList()
+        if len(qmat) > delta['qmat']:
+            x = gp.MVar.fromlist(xs)
+            for cones in qmat[delta['qmat']:].groups().values():
+                x_left = x[cones[:, 1:]]
+                x_right = x[cones[:, 0]]
+                grb.addConstr((x_left * x_left).sum(axis=1) <=
+                              x_right * x_right)
+
+    def solve(self, display=True, params={}):
+        """
+        Solve the Gurobi model and return the solution.
+        """
+
+        return optimize(self.grb, display, params, self.rows)
@@ -18,25 +18,31 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from .subroutines import sv_to_csr, sp_trans, sparse_mul, sp_lmatmul, sp_matmul
-from .subroutines import array_to_sparse, index_array, check_numeric
-from .subroutines import add_linear
-from .subroutines import event_dict, comb_set, flat
+from .subroutines import sp_trans, sparse_mul, sp_lmatmul, sp_matmul
+from .subroutines import sp_select, sp_sum, matmul_pairs
+from .subroutines import index_array, check_numeric
+from .subroutines import add_linear, widen
+from .subroutines import event_dict, comb_set, flat, struct_digest
+from .subroutines import LazyModule
+from .report import SolveReport, profiling, phase, profiled
 import numpy as np
-import pandas as pd
 import scipy.sparse as sp
 import warnings
 import time
-import scipy.optimize as opt
+import io
 from numbers import Real
 from scipy.sparse import csr_matrix
 from scipy.sparse import coo_matrix
-from scipy.linalg import sqrtm, eigh
+from collections import OrderedDict
 from collections.abc import Iterable, Sized
-from typing import List
+from typing import Any, Dict, List
 
+pd = LazyModule('pandas')
+opt = LazyModule('scipy.optimize')
+linalg = LazyModule('scipy.linalg')
 
-def def_sol(formula, display=True, params={}):
+
+def def_sol(formula, display=True, params={}, start=None):
 
     try:
         if formula.qmat:
@@ -105,6 +111,9 @@ class Model:
 
         self.vars = []
         self.auxs = []
+        self.params = []
+        self.products = []
+        self.pmap = None
         self.last = 0
         self.lin_constr = []
         self.pws_constr = []
@@ -118,6 +127,7 @@ class Model:
         self.solution = None
         self.pupdate = True
         self.dupdate = True
+        self.lowered: Dict[str, Any] = {}
 
         if not nobj:
             self.dvar()
@@ -148,6 +158,44 @@ class Model:
         self.last += int(np.prod(new_shape))
         return new_var
 
+    def param(self, shape=(), value=0, name=None):
+        """
+        Returns an array of parameters with the given shape and values.
+
+        Parameters
+        ----------
+        shape : int or tuple
+            Shape of the parameter array.
+        value : float or array_like
+            Initial values of the parameters.
+        name : str
+            Name of the parameter array
+
+        Returns
+        -------
+        new_param : rsome.lp.Parameter
+            An array of new parameters
+
+        Notes
+        -----
+        Parameters enter expressions in the same way as decision
+        variables. They can be used as constant terms, or multiplied
+        by affine expressions of decision variables, so that they are
+        coefficients of constraints and the objective function. Values
+        updated by the set method are patched into the compiled formula
+        of the model without lowering the model again.
+        """
+
+        new_var = self.dvar(shape, 'C', name)
+        new_param = Parameter(self, new_var.first, new_var.shape, name)
+        self.vars[-1] = new_param
+        self.params.append(new_param)
+        self.pupdate = True
+        self.dupdate = True
+        new_param.set(value)
+
+        return new_param
+
     def st(self, constr):
         """
         Define constraints that an optimization model subject to.
@@ -210,6 +258,7 @@ class Model:
         self.sign = 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = {}
 
     def max(self, obj):
         """
@@ -241,6 +290,26 @@ class Model:
         self.sign = - 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = {}
+
+    def lowered_counts(self):
+        """
+        Return a dictionary recording the constraints that have been
+        lowered into the cached standard form of the model, so that
+        only constraints defined afterwards are lowered by do_math.
+        Auxiliary variables and constraints are cleared if the model
+        is to be lowered from scratch. Variables defined after lowering
+        take new columns at the end, so the lowered rows are kept and
+        only widened to the new number of columns.
+        """
+
+        if not self.lowered:
+            self.auxs = []
+            self.aux_constr = []
+            self.aux_bounds = []
+            self.last = self.vars[-1].first + self.vars[-1].size
+
+        return self.lowered
 
     def do_math(self, primal=True, refresh=True, obj=True):
         """
@@ -270,20 +339,18 @@ class Model:
                 return self.primal
 
             if refresh:
-                self.auxs = []
-                self.aux_constr = []
-                self.aux_bounds = []
-                self.last = self.vars[-1].first + self.vars[-1].size
+                self.lowered_counts()
+            lowered = self.lowered
 
             more_cvx = []
-            if self.obj is not None:
+            if self.obj is not None and not lowered.get('obj'):
                 obj_constr = (self.vars[0] - self.sign * self.obj >= 0)
                 if isinstance(obj_constr, LinConstr):
                     self.aux_constr.append(obj_constr)
                 elif isinstance(obj_constr, CvxConstr):
                     more_cvx.append(obj_constr)
 
-            for constr in self.pws_constr + more_cvx:
+            for constr in self.pws_constr[lowered.get('pws', 0):] + more_cvx:
                 if constr.xtype == 'A':
                     affine_in = constr.affine_in * constr.multiplier
                     self.aux_constr.append(affine_in +
@@ -308,58 +375,79 @@ class Model:
             else:
                 obj = np.ones((1, self.last))
 
-            data_list = []
-            indices_list = []
-            indptr = [0]
-            last = 0
-
-            data_list += [item.linear.data
-                          for item in self.lin_constr + self.aux_constr]
-            indices_list += [item.linear.indices
-                             for item in self.lin_constr + self.aux_constr]
-
-            if data_list:
-                data = np.concatenate(tuple(data_list))
-                indices = np.concatenate(tuple(indices_list))
-                for item in self.lin_constr + self.aux_constr:
-                    indptr.extend(list(item.linear.indptr[1:] + last))
-                    last += item.linear.indptr[-1]
-
-                    linear = csr_matrix((data, indices, indptr),
-                                        (len(indptr) - 1, self.last))
-
-                    const_list = [item.const for item in
-                                  self.lin_constr + self.aux_constr]
-
-                    sense_list = [item.sense
-                                  if isinstance(item.sense, np.ndarray) else
-                                  np.array([item.sense])
-                                  for item in self.lin_constr
-                                  + self.aux_constr]
-
-                const = np.concatenate(tuple(const_list))
-                sense = np.concatenate(tuple(sense_list))
-            else:
+            constrs = (self.lin_constr[lowered.get('lin', 0):] +
+                       self.aux_constr[lowered.get('aux', 0):])
+            rows = lowered.get('rows')
+            if constrs:
+                data = np.concatenate([item.linear.data for item in constrs])
+                indices = np.concatenate([item.linear.indices
+                                          for item in constrs])
+                offsets = np.cumsum([0] + [item.linear.indptr[-1]
+                                           for item in constrs])
+                indptr = np.concatenate([[0]] +
+                                        [item.linear.indptr[1:] + offset
+                                         for item, offset in
+                                         zip(constrs, offsets[:-1])])
+                linear = csr_matrix((data, indices, indptr),
+                                    (len(indptr) - 1, self.last))
+
+                const = np.concatenate([item.const for item in constrs])
+                sense = np.concatenate([item.sense
+                                        if isinstance(item.sense, np.ndarray)
+                                        else np.array([item.sense])
+                                        for item in constrs])
+                if rows is None:
+                    rows = LinearRows()
+                rows.append(linear, const, sense)
+            if rows is not None:
+                linear = rows.matrix(self.last)
+                const = rows.const
+                sense = rows.sense
+
+            lowered['obj'] = True
+            lowered['pws'] = len(self.pws_constr)
+            lowered['lin'] = len(self.lin_constr)
+            lowered['aux'] = len(self.aux_constr)
+            lowered['rows'] = rows
+            if rows is None:
                 linear = csr_matrix(([], ([], [])), (1, self.last))
                 const = np.array([0])
                 sense = np.array([1])
 
-            vtype = np.concatenate([np.array([item.vtype] * item.size)
-                                    if len(item.vtype) == 1
-                                    else np.array(list(item.vtype))
-                                    for item in self.vars + self.auxs])
+            if self.params:
+                linear, self.pmap = param_map(self, linear, const)
+                pcols = self.pmap['cols']
+                pvalues = np.concatenate([item.value.reshape(-1)
+                                          for item in self.params])
+                linear.data[:], const = param_update(self.pmap, pvalues)
+            else:
+                self.pmap = None
 
-            ub = np.array([np.infty] * self.last)
-            lb = np.array([-np.infty] * self.last)
+            vtype = np.full(self.last, 'C')
+            for item in self.vars + self.auxs:
+                vtype[item.first:item.last] = (item.vtype
+                                               if len(item.vtype) == 1
+                                               else list(item.vtype))
+
+            ub = np.full(self.last, np.inf)
+            lb = np.full(self.last, -np.inf)
 
             for b in self.bounds + self.aux_bounds:
                 if b.btype == 'U':
                     ub[b.indices] = np.minimum(b.values, ub[b.indices])
                 elif b.btype == 'L':
                     lb[b.indices] = np.maximum(b.values, lb[b.indices])
+            if self.pmap is not None:
+                ub[pcols] = pvalues
+                lb[pcols] = pvalues
+                ub[self.pmap['products']] = 0
+                lb[self.pmap['products']] = 0
 
             formula = LinProg(linear, const, sense,
                               vtype, ub, lb, obj)
+            formula.lowered = rows
+            if self.pmap is not None:
+                formula.pcoef = self.pmap['coef']
             self.primal = formula
             self.pupdate = False
 
@@ -420,7 +508,9 @@ class Model:
                 dual_ub[indices_eq] = np.infty
 
             if len(indices_neg) > 0:
-                dual_linear[indices_neg, :] = - dual_linear[indices_neg, :]
+                signs = np.ones(dual_linear.shape[0])
+                signs[indices_neg] = -1
+                dual_linear = (sp.diags(signs) @ dual_linear).tocsr()
                 dual_const[indices_neg] = - dual_const[indices_neg]
 
             formula = LinProg(dual_linear, dual_const, dual_sense,
@@ -430,7 +520,8 @@ class Model:
 
             return formula
 
-    def solve(self, solver=None, display=True, params={}):
+    def solve(self, solver=None, display=True, params={}, warm_start=False,
+              profile=False, presolve=False):
         """
         Solve the model with the selected solver interface.
 
@@ -445,18 +536,53 @@ class Model:
             params : dict
                 A dictionary that specifies parameters of the selected solver.
                 So far the argument only applies to Gurobi, CPLEX,and MOSEK.
+            warm_start : bool
+                Pass the previous solution, and the simplex basis if it is
+                available, to the solver as the starting point. So far the
+                argument only applies to Gurobi, CPLEX, MOSEK, and COPT.
+            profile : bool
+                Return a SolveReport of the time, allocated memory blocks,
+                and output sizes of the phases of the solve if profile=True.
+            presolve : bool
+                Reduce the formula by rsome.presolve before it is passed to
+                the solver if presolve=True. Only the primal solution is
+                restored, so the simplex basis is unavailable, and the
+                warm_start argument is ignored.
         """
 
-        if solver is None:
-            solution = def_sol(self.do_math(obj=True), display, params)
-        else:
-            solution = solver.solve(self.do_math(obj=True), display, params)
+        report = SolveReport() if profile else None
+        with profiling(report), phase('solve'):
+            with phase('do_math') as record:
+                formula = self.do_math(obj=True)
+                record.output(formula)
+            if presolve:
+                from .presolve import presolve as presolve_formula
+                with phase('presolve') as record:
+                    formula, postsolve = presolve_formula(formula)
+                    record.output(formula)
+                    warm_start = False
+            with phase('solver') as record:
+                if solver is None:
+                    solution = def_sol(formula, display, params)
+                elif warm_start and self.solution is not None:
+                    solution = solver.solve(formula, display, params,
+                                            start=self.start_point())
+                else:
+                    solution = solver.solve(formula, display, params)
+                record.split(solution)
+            if presolve:
+                solution = postsolve(solution)
 
         if isinstance(solution, Solution):
+            solution.layout = self.layout()
             self.solution = solution
         else:
             self.solution = None
 
+        if report is not None:
+            report.solution = self.solution
+            return report
+
     def get(self):
         """
         Return the optimal objective value of the solved model.
@@ -475,34 +601,56 @@ class Model:
 
         return self.solution is not None
 
+    def layout(self):
+        """
+        Return the layout of the compiled formula, i.e., the variables
+        occupying its columns, the buffer of its lowered rows, and the
+        number of rows.
+        """
 
-class SparseVec:
-
-    __array_priority__ = 200
-
-    def __init__(self, index, value, nvar):
-
-        self.index = index
-        self.value = value
-        self.nvar = nvar
-
-    def __add__(self, other):
-
-        return SparseVec(self.index+other.index,
-                         self.value+other.value, max(self.nvar, other.nvar))
+        rows = self.lowered.get('rows')
+        return (self.vars + self.auxs, rows, 0 if rows is None else rows.num)
 
-    def __radd__(self, other):
+    def start_point(self):
+        """
+        Return the previous solution as the starting point of the current
+        formula of the model.
 
-        return self.__add__(other)
+        Notes
+        -----
+        The values of each variable are placed on the (first, last) range
+        of columns of the same variable, so they are kept in the right
+        place even if the model is lowered from scratch. Values of new
+        variables, including auxiliary variables created again by the
+        lowering, are np.nan, and values of variables that are no longer
+        in the model are dropped. Parameters take their current values.
+        Dual values and the simplex basis are kept only if the model is
+        not lowered from scratch, so that the previous rows are still the
+        leading rows of the formula.
+        """
 
-    def __mul__(self, other):
+        solution = self.solution
+        if solution is None or solution.x is None or solution.layout is None:
+            return solution
 
-        values = [v*other for v in self.value]
-        return SparseVec(self.index, values, self.nvar)
+        items, rows, num_rows = solution.layout
+        x = np.array(solution.x, dtype=float).flatten()
+        x0 = np.full(self.last, np.nan)
+        known = {id(item) for item in items}
+        for item in self.vars + self.auxs:
+            if isinstance(item, Parameter):
+                x0[item.first:item.last] = item.value.flatten()
+            elif id(item) in known and item.last <= x.size:
+                x0[item.first:item.last] = x[item.first:item.last]
 
-    def __rmul__(self, other):
+        start = Solution(solution.objval, x0, solution.status, solution.time)
+        if rows is self.lowered.get('rows') and rows is not None:
+            start.basis = solution.basis
+            if solution.dual is not None and len(solution.dual) == num_rows:
+                start.dual = np.zeros(rows.num)
+                start.dual[:num_rows] = solution.dual
 
-        return self.__mul__(other)
+        return start
 
 
 class Vars:
@@ -512,7 +660,7 @@ class Vars:
 
     __array_priority__ = 100
 
-    def __init__(self, model, first, shape, vtype, name, sparray=None):
+    def __init__(self, model, first, shape, vtype, name):
 
         self.model = model
         self.first = first
@@ -522,7 +670,7 @@ class Vars:
         self.ndim = len(shape)
         self.vtype = vtype
         self.name = name
-        self.sparray = sparray
+        self.linear_cache = None
 
     def __repr__(self):
 
@@ -559,18 +707,32 @@ class Vars:
         return self.to_affine().T
 
     def to_affine(self):
+        """
+        Return the affine expression of the variable array.
 
-        dim = self.size
-
-        data = np.ones(dim)
-        indices = self.first + np.arange(dim)
-        indptr = np.arange(dim+1)
+        Notes
+        -----
+        The sparse matrix of coefficients is cached and shared by the
+        returned expressions. It is widened without copying when more
+        variables are defined in the model.
+        """
 
-        linear = csr_matrix((data, indices, indptr),
-                            shape=(dim, self.model.last))
+        dim = self.size
+        linear = self.linear_cache
+        if linear is None:
+            data = np.ones(dim)
+            indices = self.first + np.arange(dim)
+            indptr = np.arange(dim+1)
+
+            linear = csr_matrix((data, indices, indptr),
+                                shape=(dim, self.model.last))
+            self.linear_cache = linear
+        elif linear.shape[1] < self.model.last:
+            linear = widen(linear, self.model.last)
+            self.linear_cache = linear
         const = np.zeros(self.shape)
 
-        return Affine(self.model, linear, const, self.sparray)
+        return Affine(self.model, linear, const)
 
     def get_ind(self):
 
@@ -844,6 +1006,214 @@ class Vars:
         return self.to_affine() == other
 
 
+class Parameter(Vars):
+    """
+    The Parameter class creates an array of parameters whose values
+    can be updated after the model is compiled.
+    """
+
+    def __init__(self, model, first, shape, name):
+
+        super().__init__(model, first, shape, 'C', name)
+        self.value = np.zeros(shape)
+
+    def __repr__(self):
+
+        var_name = '' if self.name is None else f'{self.name}: '
+        if self.shape == ():
+            num = 'a'
+        else:
+            num = 'x'.join([str(size) for size in self.shape])
+        suffix = 's' if np.prod(self.shape) > 1 else ''
+
+        return '{}{} parameter{}'.format(var_name, num, suffix)
+
+    def set(self, value):
+        """
+        Update the values of the parameter array.
+
+        Parameters
+        ----------
+        value : float or array_like
+            New values of the parameters. The array is broadcast to the
+            shape of the parameter array.
+
+        Notes
+        -----
+        If the model has been compiled, constant terms, coefficients,
+        and bounds of the compiled formula are updated in place by the
+        stored index map of parameters, so that the model is solved
+        again without rebuilding its formula.
+        """
+
+        value = np.array(value, dtype=float)
+        try:
+            value = np.broadcast_to(value, self.shape).copy()
+        except ValueError:
+            raise ValueError('Inconsistent shapes of parameter values.')
+        self.value = value
+
+        model = self.model
+        if model.pmap is None or model.pupdate:
+            return
+
+        pvalues = np.concatenate([item.value.reshape(-1)
+                                  for item in model.params])
+        primal = model.primal
+        data, const = param_update(model.pmap, pvalues)
+        primal.linear.data[:] = data
+        primal.const[:] = const
+        primal.ub[model.pmap['cols']] = pvalues
+        primal.lb[model.pmap['cols']] = pvalues
+        model.dupdate = True
+
+    def get(self):
+        """
+        Return the values of the parameter array.
+        """
+
+        return self.value if self.shape != () else float(self.value)
+
+
+def param_map(model, linear, const):
+    """
+    Return the coefficient matrix where the columns of parameters and
+    their products with variables are removed, and the index map used
+    to fold the values of parameters into the formula.
+
+    Notes
+    -----
+    The product of a parameter p and a variable x is a column of the
+    model, and its coefficient a in a row is moved to the coefficient
+    of x in the same row as a*p. Objective coefficients are kept in the
+    row of the epigraph constraint of the objective function, so they
+    are also entries of the coefficient matrix. The map records the
+    position in the data array of the coefficient matrix, the index of
+    the parameter, and the multiplier a of each product, so the
+    coefficients are updated by one pass over the products.
+    """
+
+    num_row, num_col = linear.shape
+    pcols = np.concatenate([np.arange(item.first, item.last)
+                            for item in model.params])
+    pindex = np.full(num_col, -1)
+    pindex[pcols] = np.arange(pcols.size)
+    zcols = np.array([first + i for first, cols, _ in model.products
+                      for i in range(len(cols))], dtype=int)
+    zparams = np.array([col for _, cols, _ in model.products
+                        for col in cols], dtype=int)
+    zvars = np.array([col for _, _, cols in model.products
+                      for col in cols], dtype=int)
+
+    keep = np.ones(num_col)
+    keep[pcols] = 0
+    keep[zcols] = 0
+    base = csr_matrix(linear @ sp.diags(keep))
+    base.eliminate_zeros()
+    base = base.tocoo()
+    plinear = csr_matrix(linear[:, pcols])
+    zlinear = coo_matrix(linear[:, zcols])
+
+    rows = np.concatenate((base.row, zlinear.row)).astype(np.int64)
+    cols = np.concatenate((base.col, zvars[zlinear.col]))
+    keys, index = np.unique(rows*num_col + cols, return_inverse=True)
+    index = index.reshape(-1)
+    data = np.bincount(index[:base.nnz], weights=base.data,
+                       minlength=keys.size)
+    indptr = np.searchsorted(keys, np.arange(num_row + 1) * num_col)
+    linear = csr_matrix((data.copy(), keys % num_col, indptr),
+                        shape=(num_row, num_col))
+
+    pos = index[base.nnz:]
+    pmap = {'cols': pcols, 'linear': plinear, 'const': const,
+            'data': data, 'pos': pos, 'param': pindex[zparams[zlinear.col]],
+            'mult': zlinear.data, 'coef': np.unique(pos), 'products': zcols}
+
+    return linear, pmap
+
+
+def param_update(pmap, values):
+    """
+    Return the data array of the coefficient matrix and the constant
+    terms of the formula given the values of parameters.
+    """
+
+    data = pmap['data'] + np.bincount(pmap['pos'],
+                                      weights=pmap['mult']*values[pmap['param']],
+                                      minlength=pmap['data'].size)
+    const = pmap['const'] - pmap['linear'] @ values
+
+    return data, const
+
+
+def param_product(left, right):
+    """
+    Return the element-wise products of two 1-D arrays of affine
+    expressions with the same size, where the left array only involves
+    parameters. Each product of a parameter and a variable is a new
+    column of the model recorded in model.products.
+    """
+
+    model = left.model
+    left_linear = csr_matrix(left.linear)
+    right_linear = csr_matrix(right.linear)
+    left_const = left.const.reshape(-1)
+    right_const = right.const.reshape(-1)
+
+    left_rows = np.repeat(np.arange(left.size), np.diff(left_linear.indptr))
+    count = np.diff(right_linear.indptr)[left_rows]
+    left_pos = np.repeat(np.arange(left_linear.nnz), count)
+    right_pos = np.arange(count.sum()) + np.repeat(
+        right_linear.indptr[left_rows] - np.cumsum(count) + count, count)
+
+    expr = (right * left_const + left * right_const +
+            left_const * right_const)
+    if left_pos.size:
+        width = model.last
+        keys = (left_linear.indices[left_pos].astype(np.int64) * width +
+                right_linear.indices[right_pos])
+        keys, index = np.unique(keys, return_inverse=True)
+        new_var = model.dvar(keys.size)
+        model.products.append((new_var.first, keys // width, keys % width))
+        coeffs = left_linear.data[left_pos] * right_linear.data[right_pos]
+        linear = csr_matrix((coeffs, (left_rows[left_pos],
+                                      new_var.first + index.reshape(-1))),
+                            shape=(left.size, model.last))
+        expr = expr + Affine(model, linear, np.zeros(left.size))
+
+    return expr
+
+
+def param_operands(left, right):
+    """
+    Return the two operands of the product of affine expressions, where
+    the first one only involves parameters, or raise an error if the
+    product is not an affine expression of variables.
+    """
+
+    model = left.model
+    if model is not right.model or not model.params:
+        raise TypeError('Bi-linear expressions are not supported.')
+
+    is_param = np.zeros(model.last, dtype=bool)
+    for item in model.params:
+        is_param[item.first:item.last] = True
+    is_product = np.zeros(model.last, dtype=bool)
+    for first, cols, _ in model.products:
+        is_product[first:first+len(cols)] = True
+    left_cols = csr_matrix(left.linear).indices
+    right_cols = csr_matrix(right.linear).indices
+    if (is_param[left_cols].all() and
+            not (is_param | is_product)[right_cols].any()):
+        return left, right
+    elif (is_param[right_cols].all() and
+            not (is_param | is_product)[left_cols].any()):
+        return right, left
+    else:
+        raise TypeError('Bi-linear expressions are not supported, ' +
+                        'except products of parameters and variables.')
+
+
 class VarSub(Vars):
     """
     The VarSub class creates a variable array with subscript indices
@@ -852,7 +1222,7 @@ class VarSub(Vars):
     def __init__(self, var, indices):
 
         super().__init__(var.model, var.first,
-                         var.shape, var.vtype, var.name, var.sparray)
+                         var.shape, var.vtype, var.name)
         self.indices = indices
 
     def __repr__(self):
@@ -901,18 +1271,18 @@ class VarSub(Vars):
 
     def to_affine(self):
 
-        select = list(self.indices.reshape((self.indices.size,)))
+        select = np.array(self.indices).reshape(-1)
 
-        dim = self.size
+        dim = select.size
         data = np.ones(dim)
-        indices = self.first + np.arange(dim)
+        indices = self.first + select
         indptr = np.arange(dim + 1)
 
         linear = csr_matrix((data, indices, indptr),
                             shape=(dim, self.model.last))
-        const = np.zeros(self.indices.shape)
+        const = np.zeros(np.shape(self.indices))
 
-        return Affine(self.model, linear[select, :], const)
+        return Affine(self.model, linear, const)
 
     def reshape(self, shape):
 
@@ -958,14 +1328,13 @@ class Affine:
 
     __array_priority__ = 100
 
-    def __init__(self, model, linear, const, sparray=None):
+    def __init__(self, model, linear, const):
 
         self.model = model
         self.linear = linear
         self.const = const
         self.shape = const.shape
         self.size = int(np.prod(self.shape))
-        self.sparray = sparray
         self.expect = False
 
     def __repr__(self):
@@ -982,11 +1351,7 @@ class Affine:
 
     def __getitem__(self, item):
 
-        if self.sparray is None:
-            self.sparray = self.sv_array()
-
-        indices = self.sparray[item]
-        linear = sv_to_csr(indices) @ self.linear
+        linear = sp_select(self.shape, item) @ self.linear
         const = self.const[item]
 
         return Affine(self.model, linear, const)
@@ -1010,20 +1375,6 @@ class Affine:
 
         return RoAffine(raffine, affine, self.model)
 
-    def sv_array(self, index=False):
-
-        shape = self.shape
-        # shape = shape if isinstance(shape, tuple) else (int(shape), )
-        size = self.size
-        # print(shape)
-
-        if index:
-            elements = [SparseVec([i], [1], size) for i in range(size)]
-        else:
-            elements = [SparseVec([i], [1.0], size) for i in range(size)]
-
-        return np.array(elements).reshape(shape)
-
     # noinspection PyPep8Naming
     @property
     def T(self):
@@ -1043,19 +1394,8 @@ class Affine:
 
     def sum(self, axis=None):
 
-        if self.sparray is None:
-            # self.sparray = sparse_array(self.shape)
-            self.sparray = self.sv_array()
-
-        indices = self.sparray.sum(axis=axis)
-        # if not isinstance(indices, np.ndarray):
-        #     indices = np.array([indices])
-
-        # linear = array_to_sparse(indices) @ self.linear
-        linear = sv_to_csr(indices) @ self.linear
+        linear = sp_sum(self.shape, axis) @ self.linear
         const = self.const.sum(axis=axis)
-        # if not isinstance(const, np.ndarray):
-        #     const = np.array([const])
 
         return Affine(self.model, linear, const)
 
@@ -1150,7 +1490,7 @@ class Affine:
             err += 'The array must be 1-D.'
             raise ValueError(err)
 
-        eighvals = eigh(qmat, eigvals_only=True).round(6)
+        eighvals = linalg.eigh(qmat, eigvals_only=True).round(6)
         if all(eighvals >= 0):
             sign = 1
         elif all(eighvals <= 0):
@@ -1158,7 +1498,7 @@ class Affine:
         else:
             raise ValueError('The input matrix must be semidefinite.')
 
-        sqrt_mat = np.real(sqrtm(sign*qmat))
+        sqrt_mat = np.real(linalg.sqrtm(sign*qmat))
         affine = sqrt_mat @ self.reshape(self.size)
 
         if sign == 1:
@@ -1305,7 +1645,15 @@ class Affine:
         if isinstance(other, (Vars, VarSub, Affine)):
             other = other.to_affine()
             if self.model.mtype == other.model.mtype:
-                raise TypeError('Bi-linear expressions are not supported.')
+                left, right = param_operands(self, other)
+                shape = np.broadcast_shapes(self.shape, other.shape)
+                size = int(np.prod(shape))
+                if left.shape != shape:
+                    left = left * np.ones(shape)
+                if right.shape != shape:
+                    right = right * np.ones(shape)
+                expr = param_product(left.reshape(size), right.reshape(size))
+                return expr.reshape(shape)
             elif self.model.mtype in 'VR' and other.model.mtype in 'SM':
                 if self.model.top is not other.model.top:
                     raise ValueError('Models of operands mismatch.')
@@ -1319,10 +1667,10 @@ class Affine:
                 raffine = raffine.reshape((raffine.size, 1))
 
                 rvar_last = other.model.vars[-1].last
-                reduced_linear = other.linear[:, :rvar_last]
-                trans_sparray = np.array([line for line in reduced_linear])
+                reduced_linear = csr_matrix(other.linear[:, :rvar_last])
+                reduced_linear.eliminate_zeros()
 
-                raffine = raffine * array_to_sparse(trans_sparray)
+                raffine = raffine * reduced_linear
                 affine = self * other.const
 
                 return RoAffine(raffine, affine, other.model)
@@ -1358,31 +1706,36 @@ class Affine:
         if isinstance(other, (Vars, VarSub, Affine)):
             other = other.to_affine()
             if self.model.mtype == other.model.mtype:
-                raise TypeError('Bi-linear expressions are not supported.')
+                param_operands(self, other)
+                shape = (self.const @ other.const).shape
+                left, right = matmul_pairs(self.shape, other.shape)
+                num, inner = left.shape
+                left = self.reshape(self.size)[left.flatten()]
+                right = other.reshape(other.size)[right.flatten()]
+                expr = param_product(*param_operands(left, right))
+                total = csr_matrix((np.ones(num*inner),
+                                    (np.repeat(np.arange(num), inner),
+                                     np.arange(num*inner))),
+                                   shape=(num, num*inner))
+                return (total @ expr).reshape(shape)
             elif self.model.mtype in 'VR' and other.model.mtype in 'SM':
                 if self.model.top is not other.model.top:
                     raise ValueError('Models of operands mismatch.')
                 affine = self @ other.const
                 num_rand = other.model.vars[-1].last
 
-                ind_array = self.sv_array()
-                temp = ind_array @ np.arange(other.size).reshape(other.shape)
-                if isinstance(temp, np.ndarray):
-                    all_items = list(temp.reshape((temp.size, )))
-                else:
-                    all_items = [temp]
-                    temp = np.array([temp])
-                col_ind = np.concatenate(tuple(item.index
-                                               for item in all_items))
-                row_ind = tuple(np.array(all_items[i].value) + i*other.size
-                                for i in range(len(all_items)))
-                row_ind = np.concatenate(row_ind)
+                left, right = matmul_pairs(self.shape, other.shape)
+                num = left.shape[0]
+                col_ind = left.flatten()
+                row_ind = (right + other.size*np.arange(num)[:, None]).flatten()
                 csr_temp = csr_matrix((np.ones(len(col_ind)),
                                        (row_ind, col_ind)),
-                                      shape=(temp.size*other.size, self.size))
+                                      shape=(num*other.size, self.size))
                 self_flat = self.reshape(self.size)
-                affine_temp = (csr_temp @ self_flat).reshape((temp.size,
-                                                              other.size))
+                affine_temp = Affine(self.model,
+                                     csr_temp @ self_flat.linear,
+                                     csr_temp @ self_flat.const)
+                affine_temp = affine_temp.reshape((num, other.size))
                 raffine = affine_temp @ other.linear[:, :num_rand]
 
                 return RoAffine(raffine, affine, other.model)
@@ -1393,24 +1746,18 @@ class Affine:
                 other = other.to_affine()
                 num_rand = self.model.vars[-1].last
 
-                ind_array = self.sv_array()
-                temp = ind_array @ np.arange(other.size).reshape(other.shape)
-                if isinstance(temp, np.ndarray):
-                    all_items = list(temp.reshape((temp.size, )))
-                else:
-                    all_items = [temp]
-                    temp = np.array([temp])
-                col_ind = np.concatenate(tuple(item.value
-                                               for item in all_items))
-                row_ind = tuple(np.array(all_items[i].index) + i*self.size
-                                for i in range(len(all_items)))
-                row_ind = np.concatenate(row_ind)
+                left, right = matmul_pairs(self.shape, other.shape)
+                num = left.shape[0]
+                col_ind = right.flatten()
+                row_ind = (left + self.size*np.arange(num)[:, None]).flatten()
                 csr_temp = csr_matrix((np.ones(len(col_ind)),
                                        (row_ind, col_ind)),
-                                      shape=(temp.size*self.size, other.size))
+                                      shape=(num*self.size, other.size))
                 other_flat = other.reshape(other.size)
-                affine_temp = (csr_temp @ other_flat).reshape((temp.size,
-                                                               self.size))
+                affine_temp = Affine(other.model,
+                                     csr_temp @ other_flat.linear,
+                                     csr_temp @ other_flat.const)
+                affine_temp = affine_temp.reshape((num, self.size))
                 raffine = affine_temp @ self.linear[:, :num_rand]
 
                 roaffine = RoAffine(raffine, affine, self.model)
@@ -1433,6 +1780,14 @@ class Affine:
 
     def __rmatmul__(self, other):
 
+        if sp.issparse(other) and len(self.shape) == 1:
+            if other.shape[1] != self.size:
+                raise ValueError('Dimensions of operands mismatch.')
+            new_const = other @ self.const
+            new_linear = csr_matrix(other) @ self.linear
+
+            return Affine(self.model, new_linear, new_const)
+
         other = check_numeric(other)
 
         new_const = other @ self.const
@@ -1765,13 +2120,7 @@ class RoAffine:
 
     def __getitem__(self, item):
 
-        if self.affine.sparray is None:
-            self.affine.sparray = self.affine.sv_array()
-
-        indices = self.affine.sparray[item]
-
-        trans_array = sv_to_csr(indices)
-        raffine = trans_array @ self.raffine
+        raffine = sp_select(self.shape, item) @ self.raffine
         affine = self.affine[item]
 
         return RoAffine(raffine, affine, self.rand_model)
@@ -1911,13 +2260,7 @@ class RoAffine:
     def sum(self, axis=None):
 
         new_affine = self.affine.sum(axis=axis)
-
-        svarray = self.affine.sv_array()
-        new_svarray = svarray.sum(axis=axis)
-        if not isinstance(new_svarray, np.ndarray):
-            new_svarray = np.array([new_svarray])
-
-        new_raffine = sv_to_csr(new_svarray) @ self.raffine
+        new_raffine = sp_sum(self.shape, axis) @ self.raffine
 
         return RoAffine(new_raffine, new_affine, self.rand_model)
 
@@ -2017,6 +2360,29 @@ class ConeConstr:
         self.right_index = right_index
 
 
+class ConeBatch:
+    """
+    The ConeBatch class creates an object of a batch of second-order
+    cone (ctype='Q') or exponential cone (ctype='X') constraints on
+    variables, where each row of the index array specifies one cone
+    """
+
+    def __init__(self, model, var, indices, ctype):
+
+        self.model = model
+        self.var = var
+        self.indices = np.array(indices, dtype=int)
+        self.ctype = ctype
+
+    def __repr__(self):
+
+        num = self.indices.shape[0]
+        cone = 'second-order' if self.ctype == 'Q' else 'exponential'
+        suffix = 's' if num > 1 else ''
+
+        return '{} {} conic constraint{}'.format(num, cone, suffix)
+
+
 class ExpConstr:
     """
     The ExpConstr class creates an object of exponential cone constraints
@@ -2059,6 +2425,73 @@ class KLConstr:
         return "KL divergence constraint for {} scenario{}".format(ns, suffix)
 
 
+class SupportCache:
+    """
+    The SupportCache class creates a least-recently-used cache of the
+    standard formulas of support sets, keyed by the content of their
+    constraints. Each robust or distributionally robust model owns one
+    cache as its support_cache attribute, so formulas are only shared
+    by constraints of the same model. The cache is disabled by setting
+    maxsize to be zero, and emptied by the clear method.
+    """
+
+    def __init__(self, maxsize=256):
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.formulas = OrderedDict()
+
+    def __repr__(self):
+
+        return ('Support cache: {0} hits, {1} misses, '
+                '{2}/{3} entries').format(self.hits, self.misses,
+                                          len(self.formulas), self.maxsize)
+
+    def __len__(self):
+
+        return len(self.formulas)
+
+    def formula(self, model, constraints, primal=False):
+        """
+        Return the standard formula of the given model subject to the
+        constraints. The formula is the dual of the support set if
+        primal=False.
+        """
+
+        for item in constraints:
+            if item.model is not model:
+                raise ValueError('Models mismatch.')
+
+        key = (type(model).__name__, model.mtype, primal,
+               struct_digest(model.vars, constraints))
+        model.reset()
+        for item in constraints:
+            model.st(item)
+        if key in self.formulas:
+            self.hits += 1
+            self.formulas.move_to_end(key)
+            return self.formulas[key]
+
+        self.misses += 1
+        formula = model.do_math(primal=primal, obj=False)
+        if self.maxsize > 0:
+            self.formulas[key] = formula
+            if len(self.formulas) > self.maxsize:
+                self.formulas.popitem(last=False)
+
+        return formula
+
+    def clear(self):
+        """
+        Remove all cached formulas and reset the hit and miss counters.
+        """
+
+        self.formulas.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 class RoConstr:
     """
     The Roaffine class creats an object of uncertain affine functions
@@ -2101,17 +2534,12 @@ class RoConstr:
             else:
                 constraints.append(items)
 
-        sup_model = self.rand_model
-        sup_model.reset()
-        for item in constraints:
-            if item.model is not sup_model:
-                raise ValueError('Models mismatch.')
-            sup_model.st(item)
-
-        self.support = sup_model.do_math(primal=False, obj=False)
+        self.support = self.rand_model.top.support_cache.formula(
+            self.rand_model, constraints)
 
         return self
 
+    @profiled('le_to_rc')
     def le_to_rc(self, support=None):
 
         num_constr, num_rand = self.raffine.shape
@@ -2157,19 +2585,16 @@ class RoConstr:
             constr_list = [constr1, constr2, constr3]
             constr_list += [] if bounds is None else bounds
 
-        for n in range(num_constr):
-            for qconstr in support.qmat:
-                indices = np.array(qconstr, dtype=int) + n*size_support
-                cone_constr = ConeConstr(self.dec_model, dual_var, indices[1:],
-                                         dual_var, indices[0])
-                constr_list.append(cone_constr)
-            for xconstr in support.xmat:
-                indices = xconstr
-                cone_constr = ExpConstr(self.dec_model,
-                                        dual_var[n, indices[0]],
-                                        dual_var[n, indices[1]],
-                                        dual_var[n, indices[2]])
-                constr_list.append(cone_constr)
+        offsets = (np.arange(num_constr) * size_support).reshape((-1, 1, 1))
+        for size, cones in support.qmat.groups().items():
+            indices = (cones + offsets).reshape((-1, size))
+            constr_list.append(ConeBatch(self.dec_model, dual_var,
+                                         indices, 'Q'))
+        if support.xmat:
+            indices = (support.xmat.indices.reshape((1, -1, 3)) +
+                       offsets).reshape((-1, 3))
+            constr_list.append(ConeBatch(self.dec_model, dual_var,
+                                         indices, 'X'))
 
         return constr_list
 
@@ -2374,6 +2799,58 @@ class DecVar(Vars):
                          fixed=self.fixed, ctype='E')
 
 
+class DecParameter(DecVar):
+    """
+    The DecParameter class creates an array of parameters for adaptive
+    DRO models, whose values can be updated after the model is compiled.
+    """
+
+    def __init__(self, dro_model, param, name=None):
+
+        super().__init__(dro_model, param, name=name)
+        self.param = param
+        self.rc_param: Any = None
+
+    def __repr__(self):
+
+        return self.param.__repr__()
+
+    def adapt(self, to):
+
+        raise TypeError('Parameters cannot be adaptive.')
+
+    def set(self, value):
+        """
+        Update the values of the parameter array.
+
+        Parameters
+        ----------
+        value : float or array_like
+            New values of the parameters. The array is broadcast to the
+            shape of the parameter array.
+
+        Notes
+        -----
+        The values are passed to the parameters of the robust model
+        lowered from the DRO model, so that the compiled formula is
+        updated in place.
+        """
+
+        self.param.set(value)
+        if self.rc_param is not None:
+            self.rc_param.set(self.param.value)
+
+    def get(self, rvar=None):
+        """
+        Return the values of the parameter array.
+        """
+
+        if rvar is not None:
+            raise ValueError('Parameters are not adaptive.')
+
+        return self.param.get()
+
+
 class DecVarSub(VarSub):
 
     def __init__(self, dro_model, dvars, indices, fixed=True):
@@ -2473,7 +2950,7 @@ class RandVar(Vars):
     def __init__(self, svars, evars):
 
         super().__init__(svars.model, svars.first,
-                         svars.shape, svars.vtype, svars.name, svars.sparray)
+                         svars.shape, svars.vtype, svars.name)
         self.e = evars
 
     @property
@@ -2532,7 +3009,7 @@ class DecAffine(Affine):
                  event_adapt=None, fixed=True, ctype='R'):
 
         super().__init__(affine.model, affine.linear,
-                         affine.const, affine.sparray)
+                         affine.const)
         self.dro_model = dro_model
         self.event_adapt = (event_adapt if event_adapt else
                             [list(range(dro_model.num_scen))])
@@ -2585,13 +3062,26 @@ class DecAffine(Affine):
         return DecAffine(self.dro_model, expr, self.event_adapt,
                          self.fixed, self.ctype)
 
+    def product_type(self, other):
+
+        # Event-wise adaptation, ctype, and fixed flag of products of
+        # parameters and decision variables
+        if isinstance(other, (DecAffine, DecVar, DecVarSub)):
+            other = other.to_affine()
+            event_adapt = comb_set(self.event_adapt, other.event_adapt)
+            ctype = 'E' if 'E' in (self.ctype + other.ctype) else 'R'
+            return event_adapt, ctype, self.fixed and other.fixed
+        else:
+            return self.event_adapt, self.ctype, self.fixed
+
     def __mul__(self, other):
 
+        event_adapt, ctype, fixed = self.product_type(other)
         expr = super().__mul__(other)
         if isinstance(expr, Affine):
             return DecAffine(self.dro_model, expr,
-                             event_adapt=self.event_adapt,
-                             ctype=self.ctype, fixed=self.fixed)
+                             event_adapt=event_adapt,
+                             ctype=ctype, fixed=fixed)
         elif isinstance(expr, RoAffine):
             if not self.fixed:
                 msg = 'Affine decision rule '
@@ -2605,11 +3095,12 @@ class DecAffine(Affine):
 
     def __matmul__(self, other):
 
+        event_adapt, ctype, fixed = self.product_type(other)
         expr = super().__matmul__(other)
         if isinstance(expr, Affine):
             return DecAffine(self.dro_model, expr,
-                             event_adapt=self.event_adapt,
-                             ctype=self.ctype, fixed=self.fixed)
+                             event_adapt=event_adapt,
+                             ctype=ctype, fixed=fixed)
         elif isinstance(expr, RoAffine):
             if not self.fixed:
                 msg = 'Affine decision rule '
@@ -3567,6 +4058,295 @@ class DecRuleSub:
         return (self - other).__eq__(0)
 
 
+class LinearRows:
+    """
+    The LinearRows class stores the rows of linear constraints lowered
+    into the standard formula, as CSR arrays with spare capacity at the
+    end, so that new rows are appended without copying the rows lowered
+    before.
+    """
+
+    def __init__(self):
+
+        self.data = np.zeros(0)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.indptr = np.zeros(1, dtype=np.int32)
+        self.const_buffer = np.zeros(0)
+        self.sense_buffer = np.zeros(0, dtype=int)
+        self.nnz = 0
+        self.num = 0
+
+    def __repr__(self):
+
+        suffix = 's' if self.num > 1 else ''
+
+        return '{} row{}'.format(self.num, suffix)
+
+    def __len__(self):
+
+        return self.num
+
+    @staticmethod
+    def reserve(buffer, size):
+
+        if size <= buffer.size:
+            return buffer
+
+        new_buffer = np.empty(max(size, 2*buffer.size), dtype=buffer.dtype)
+        new_buffer[:buffer.size] = buffer
+
+        return new_buffer
+
+    def append(self, linear, const, sense):
+        """
+        Append the rows of the sparse matrix linear, together with the
+        constant terms and senses of the constraints.
+        """
+
+        linear = csr_matrix(linear)
+        linear.sum_duplicates()
+        nnz, num = self.nnz + linear.nnz, self.num + linear.shape[0]
+        if max(nnz, linear.shape[1]) > np.iinfo(self.indices.dtype).max:
+            self.indices = self.indices.astype(np.int64)
+            self.indptr = self.indptr.astype(np.int64)
+
+        self.data = self.reserve(self.data, nnz)
+        self.indices = self.reserve(self.indices, nnz)
+        self.indptr = self.reserve(self.indptr, num + 1)
+        self.const_buffer = self.reserve(self.const_buffer, num)
+        self.sense_buffer = self.reserve(self.sense_buffer, num)
+
+        self.data[self.nnz:nnz] = linear.data
+        self.indices[self.nnz:nnz] = linear.indices
+        self.indptr[self.num+1:num+1] = linear.indptr[1:] + self.nnz
+        self.const_buffer[self.num:num] = np.asarray(const).reshape(-1)
+        self.sense_buffer[self.num:num] = np.asarray(sense).reshape(-1)
+        self.nnz, self.num = nnz, num
+
+    def matrix(self, width):
+        """
+        Return the rows as a CSR matrix with the given number of columns,
+        which shares the arrays of the buffers.
+        """
+
+        return csr_matrix((self.data[:self.nnz], self.indices[:self.nnz],
+                           self.indptr[:self.num+1]), (self.num, width))
+
+    @property
+    def const(self):
+
+        return self.const_buffer[:self.num]
+
+    @property
+    def sense(self):
+
+        return self.sense_buffer[:self.num]
+
+
+class ConeList:
+    """
+    The ConeList class creates a ragged collection of cones, stored as
+    one flat array of variable indices and an array of offsets, so that
+    the indices of the ith cone are indices[offsets[i]:offsets[i+1]]
+    """
+
+    def __init__(self, cones=None):
+
+        self._indices = np.zeros(0, dtype=int)
+        self._offsets = np.zeros(1, dtype=int)
+        self._pending = []
+        if cones is not None:
+            self.extend(cones)
+
+    @classmethod
+    def from_arrays(cls, indices, offsets):
+        """
+        Create a collection of cones from the flat array of indices and
+        the array of offsets, without copying the arrays.
+        """
+
+        cones = cls()
+        cones._indices = np.asarray(indices)
+        cones._offsets = np.asarray(offsets)
+
+        return cones
+
+    def _merge(self):
+
+        if self._pending:
+            sizes = np.concatenate([item[1] for item in self._pending])
+            offsets = self._offsets[-1] + np.cumsum(sizes)
+            self._indices = np.concatenate([self._indices] +
+                                           [item[0] for item in self._pending])
+            self._offsets = np.concatenate((self._offsets, offsets))
+            self._pending = []
+
+    @property
+    def indices(self):
+
+        self._merge()
+        return self._indices
+
+    @property
+    def offsets(self):
+
+        self._merge()
+        return self._offsets
+
+    @property
+    def sizes(self):
+
+        return np.diff(self.offsets)
+
+    def __repr__(self):
+
+        num = len(self)
+        suffix = 's' if num > 1 else ''
+
+        return '{} cone{}'.format(num, suffix)
+
+    def __len__(self):
+
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+
+        indices, offsets = self.indices, self.offsets
+        for i in range(len(offsets) - 1):
+            yield indices[offsets[i]:offsets[i+1]]
+
+    def __getitem__(self, item):
+
+        num = len(self)
+        if isinstance(item, slice):
+            start, stop, step = item.indices(num)
+            if step != 1:
+                return ConeList([self[i] for i in range(start, stop, step)])
+            stop = max(start, stop)
+            offsets = self.offsets[start:stop+1]
+            return ConeList.from_arrays(
+                self.indices[offsets[0]:offsets[-1]], offsets - offsets[0])
+        elif isinstance(item, (int, np.integer)):
+            index = item + num if item < 0 else item
+            if index < 0 or index >= num:
+                raise IndexError('Index out of range.')
+            return self.indices[self.offsets[index]:self.offsets[index+1]]
+        else:
+            return ConeList([self[i] for i in np.array(item).flatten()])
+
+    def append(self, cone):
+        """
+        Append one cone given by an array of variable indices.
+        """
+
+        cone = np.array(cone, dtype=int).flatten()
+        self._pending.append((cone, np.array([cone.size])))
+
+    def extend(self, cones):
+        """
+        Append a collection of cones, given as a ConeList object, a 2-D
+        array where each row specifies one cone, or an iterable of arrays
+        of variable indices.
+        """
+
+        if isinstance(cones, ConeList):
+            if len(cones) > 0:
+                self._pending.append((cones.indices, cones.sizes))
+        elif isinstance(cones, np.ndarray) and cones.ndim == 2:
+            if cones.size > 0:
+                self._pending.append((cones.astype(int).flatten(),
+                                      np.full(cones.shape[0], cones.shape[1])))
+        else:
+            cones = [np.array(cone, dtype=int).flatten() for cone in cones]
+            if cones:
+                self._pending.append((np.concatenate(cones),
+                                      np.array([cone.size for cone in cones])))
+
+    def copy(self):
+        """
+        Return a copy of the collection of cones.
+        """
+
+        return ConeList.from_arrays(self.indices.copy(), self.offsets.copy())
+
+    def groups(self):
+        """
+        Return a dict that maps the sizes of cones to 2-D arrays of the
+        indices of cones with the same size, one row for each cone.
+        """
+
+        indices = self.indices
+        sizes = self.sizes
+        groups = {}
+        for size in np.unique(sizes):
+            if (sizes == size).all():
+                groups[int(size)] = indices.reshape((-1, size))
+            else:
+                starts = self.offsets[:-1][sizes == size]
+                groups[int(size)] = indices[starts.reshape((-1, 1)) +
+                                            np.arange(size)]
+
+        return groups
+
+    def histogram(self):
+        """
+        Return a dict that maps the sizes of cones to the numbers of cones
+        with the same size.
+        """
+
+        sizes, counts = np.unique(self.sizes, return_counts=True)
+
+        return dict(zip(sizes.tolist(), counts.tolist()))
+
+
+def sparse_table(matrix, rows=None, prefix='LC'):
+    """
+    Return a pandas.DataFrame of the selected rows of a sparse matrix,
+    together with the indices of the selected rows. The table of all
+    rows and all variables is dense if rows=None. Otherwise the columns
+    of the table are sparse arrays of the variables involved in the
+    selected rows, so the matrix is never converted into a dense array.
+    """
+
+    matrix = csr_matrix(matrix)
+    index = np.arange(matrix.shape[0])
+    if rows is None:
+        table = pd.DataFrame(matrix.todense(),
+                             index=['{0}{1}'.format(prefix, i)
+                                    for i in index + 1],
+                             columns=['x{0}'.format(j)
+                                      for j in range(1, matrix.shape[1] + 1)])
+        return table, index
+
+    index = np.atleast_1d(index[rows])
+    matrix = matrix[index]
+    cols = np.unique(matrix.indices)
+    matrix = matrix[:, cols]
+    table = pd.DataFrame.sparse.from_spmatrix(
+        matrix, index=['{0}{1}'.format(prefix, i) for i in index + 1],
+        columns=['x{0}'.format(j) for j in cols + 1])
+
+    return table, index
+
+
+def block_stats(matrix, const=None):
+    """
+    Return the numbers of rows, columns, and nonzero coefficients, and
+    the ranges of the absolute values of nonzero coefficients and
+    constants of a block of constraints.
+    """
+
+    coeffs = np.abs(matrix.data[matrix.data != 0])
+    const = np.array([]) if const is None else np.abs(const)
+    const = const[np.isfinite(const) & (const != 0)]
+
+    return [matrix.shape[0], np.unique(matrix.indices).size, coeffs.size,
+            coeffs.min() if coeffs.size else np.nan,
+            coeffs.max() if coeffs.size else np.nan,
+            const.min() if const.size else np.nan,
+            const.max() if const.size else np.nan]
+
+
 class LinProg:
     """
     The LinProg class creates an object of linear program
@@ -3581,6 +4361,16 @@ class LinProg:
         self.vtype = vtype
         self.ub = ub
         self.lb = lb
+        self.lowered = None
+        self.pcoef = None
+
+    def __getstate__(self):
+
+        # The buffer of lowered rows is only meaningful in this process
+        state = self.__dict__.copy()
+        state['lowered'] = None
+
+        return state
 
     def __repr__(self):
 
@@ -3601,19 +4391,71 @@ class LinProg:
 
         return string
 
-    def showlc(self):
+    def showlc(self, rows=None):
+        """
+        Returns a pandas.DataFrame of linear constraints.
+
+        Parameters
+        ----------
+        rows : int, slice, or array_like
+            Indices of the selected constraints. All constraints and all
+            variables are shown if rows=None, otherwise only the variables
+            involved in the selected constraints are shown, as columns of
+            sparse arrays of coefficients.
+        """
 
-        var_names = ['x{0}'.format(i)
-                     for i in range(1, self.linear.shape[1] + 1)]
-        constr_names = ['LC{0}'.format(j)
-                        for j in range(1, self.linear.shape[0] + 1)]
-        table = pd.DataFrame(self.linear.todense(), columns=var_names,
-                             index=constr_names)
-        table['sense'] = ['==' if sense else '<=' for sense in self.sense]
-        table['constant'] = self.const
+        table, index = sparse_table(self.linear, rows, 'LC')
+        table['sense'] = ['==' if sense else '<=' for sense in self.sense[index]]
+        table['constant'] = self.const[index]
 
         return table
 
+    def stats(self):
+        """
+        Returns a pandas.DataFrame of the numbers of rows, columns, and
+        nonzero coefficients, and the ranges of the absolute values of
+        nonzero coefficients and constants, for each block of the
+        formula.
+
+        Notes
+        -----
+        Blocks of the formula are the objective function, equality and
+        inequality constraints, finite bounds of variables, and cone
+        constraints. The statistics are computed from the sparse arrays
+        of the formula without dense materialization.
+        """
+
+        linear = self.linear
+        blocks = {'Obj': block_stats(csr_matrix(self.obj.reshape((1, -1))))}
+        for name, mask in [('LC ==', self.sense == 1),
+                           ('LC <=', self.sense == 0)]:
+            if mask.any():
+                blocks[name] = block_stats(linear[mask], self.const[mask])
+
+        finite_lb = np.flatnonzero(np.isfinite(self.lb))
+        finite_ub = np.flatnonzero(np.isfinite(self.ub))
+        num = finite_lb.size + finite_ub.size
+        if num:
+            bounds = csr_matrix((np.ones(num),
+                                 np.concatenate((finite_lb, finite_ub)),
+                                 np.arange(num + 1)), (num, linear.shape[1]))
+            blocks['Bounds'] = block_stats(bounds,
+                                           np.concatenate((self.lb[finite_lb],
+                                                           self.ub[finite_ub])))
+
+        for name, key in [('QC', 'qmat'), ('EC', 'xmat')]:
+            cones = getattr(self, key, None)
+            if cones:
+                matrix = csr_matrix((np.ones(cones.indices.size),
+                                     cones.indices, cones.offsets),
+                                    (len(cones), linear.shape[1]))
+                blocks[name] = block_stats(matrix)
+
+        columns = ['rows', 'cols', 'nnz', 'min |coef|', 'max |coef|',
+                   'min |const|', 'max |const|']
+
+        return pd.DataFrame.from_dict(blocks, orient='index', columns=columns)
+
     def show(self):
 
         return self.showlc()
@@ -3622,63 +4464,259 @@ class LinProg:
 
         return solver.solve(self)
 
+    def save(self, path):
+        """
+        Save the standard formula as a binary file, which can be loaded
+        by rsome.load() with arrays memory-mapped to the file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the binary file.
+        """
+
+        from .storage import save
+
+        save(self, path)
+
     def lp_export(self):
 
-        string = 'Minimize\n'
-        string += ' obj: '
+        file = io.StringIO()
+        self.write_lp(file)
+
+        return file.getvalue()
+
+    def write_lp(self, file, chunk=10000):
+        """
+        Write the standard form of the optimization model in the .lp
+        format to a text file object. Constraints are formatted and
+        written in chunks of rows.
+        """
+
+        if getattr(self, 'xmat', None):
+            warnings.warn('The LP format ignores exponential cone '
+                          'constraints.')
+
+        file.write('Minimize\n obj: ')
+        obj = self.obj.flatten()
+        index, = np.nonzero(obj)
         obj_str = ' '.join(['{} {} x{}'.format('-' if coeff < 0 else '+',
                                                abs(coeff), i+1)
-                            for i, coeff in enumerate(self.obj[0]) if coeff])
-        string += obj_str[2:] if obj_str[:2] == '+ ' else obj_str
-
-        string += '\nSubject To\n'
-        for i in range(self.linear.shape[0]):
-            row = self.linear[i]
-            coeffs = row.data
-            indices = row.indices
-            each = ['{} {} x{}'.format('-' if coeff < 0 else '+',
-                                       abs(coeff), index+1)
-                    for coeff, index in zip(coeffs, indices)]
-            each_line = ' '.join(each)
-            if each_line[:2] == '+ ':
-                each_line = each_line[2:]
-
-            string += ' c{}: '.format(i+1) + each_line
-            string += ' <= ' if self.sense[i] == 0 else ' == '
-            string += '{}\n'.format(self.const[i])
+                            for i, coeff in zip(index, obj[index])])
+        file.write(obj_str[2:] if obj_str[:2] == '+ ' else obj_str)
+
+        file.write('\nSubject To\n')
+        qmat = getattr(self, 'qmat', [])
+        for start in range(0, len(qmat), chunk):
+            lines = [' q{}: [ '.format(i+1) +
+                     ' + '.join(['x{} ^2'.format(j+1) for j in qc[1:]]) +
+                     ' - x{} ^2 ] <= 0\n'.format(qc[0]+1)
+                     for i, qc in enumerate(qmat[start:start+chunk], start)]
+            file.write(''.join(lines))
+
+        linear = csr_matrix(self.linear)
+        indptr = linear.indptr
+        const = np.array(self.const).flatten().tolist()
+        signs = ['== ' if sense else '<= ' for sense in self.sense]
+        for start in range(0, linear.shape[0], chunk):
+            stop = min(start + chunk, linear.shape[0])
+            first, last = indptr[start], indptr[stop]
+            coeffs = linear.data[first:last]
+            terms = ['{} {} x{}'.format(sign, value, index)
+                     for sign, value, index in
+                     zip(np.where(coeffs < 0, '-', '+').tolist(),
+                         np.abs(coeffs).tolist(),
+                         (linear.indices[first:last] + 1).tolist())]
+            lines = []
+            for i in range(start, stop):
+                each_line = ' '.join(terms[indptr[i]-first:indptr[i+1]-first])
+                if each_line[:2] == '+ ':
+                    each_line = each_line[2:]
+                lines.append(' c{}: {} {}{}\n'.format(i+1, each_line,
+                                                      signs[i], const[i]))
+            file.write(''.join(lines))
 
         ub, lb = self.ub, self.lb
-        nvar = len(ub)
-        ub_string = '\n'.join([' x{} <= {}'.format(i+1, ub[i])
-                               for i in range(nvar) if ub[i] < np.inf])
-        lb_string = '\n'.join([' {} <= x{}'.format(lb[i], i+1)
-                               for i in range(nvar) if lb[i] > -np.inf])
-        free_string = '\n'.join([' x{} free'.format(i+1)
-                                 for i in range(nvar)
-                                 if lb[i] == -np.inf and ub[i] == np.inf])
-        string += 'Bounds\n'
-        if len(ub_string) > 0:
-            string += ub_string + '\n'
-        if len(lb_string) > 0:
-            string += lb_string + '\n'
-        if len(free_string) > 0:
-            string += free_string + '\n'
-
-        ind_int, = np.where(self.vtype == 'I')
-        int_string = '\n'.join(['x{}'.format(i+1) for i in ind_int])
-        if len(ind_int) > 0:
-            string += 'General\n'
-            string += ' ' + int_string + '\n'
-
-        ind_bin, = np.where(self.vtype == 'B')
-        bin_string = '\n'.join(['x{}'.format(i+1) for i in ind_bin])
-        if len(ind_bin) > 0:
-            string += 'Binary\n'
-            string += ' ' + bin_string + '\n'
-
-        string += 'End'
+        file.write('Bounds\n')
+        index, = np.where(ub < np.inf)
+        self.write_lines(file, ' x{} <= {}\n', index + 1, ub[index],
+                         chunk=chunk)
+        index, = np.where(lb > -np.inf)
+        self.write_lines(file, ' {1} <= x{0}\n', index + 1, lb[index],
+                         chunk=chunk)
+        index, = np.where((lb == -np.inf) & (ub == np.inf))
+        self.write_lines(file, ' x{} free\n', index + 1, chunk=chunk)
+
+        for vtype, section in zip('IB', ['General', 'Binary']):
+            index, = np.where(self.vtype == vtype)
+            if len(index) > 0:
+                file.write(section + '\n ')
+                self.write_lines(file, 'x{}\n', index + 1, chunk=chunk)
+
+        file.write('End')
+
+    def write_mps(self, file, name='RSOME', chunk=10000):
+        """
+        Write the standard form of the optimization model in the free
+        MPS format to a text file object. Second-order cone constraints
+        are written as QCMATRIX sections.
+        """
 
-        return string
+        if getattr(self, 'xmat', None):
+            warnings.warn('The MPS format ignores exponential cone '
+                          'constraints.')
+
+        linear = self.linear
+        num_constr, num_var = linear.shape
+        qmat = getattr(self, 'qmat', [])
+
+        file.write('NAME {}\nROWS\n N obj\n'.format(name))
+        rtypes = np.where(self.sense == 1, 'E', 'L')
+        self.write_lines(file, ' {1} c{0}\n', np.arange(1, num_constr+1),
+                         rtypes, chunk=chunk)
+        self.write_lines(file, ' L q{}\n', np.arange(1, len(qmat)+1),
+                         chunk=chunk)
+
+        file.write('COLUMNS\n')
+        csc = sp.csc_matrix(linear)
+        obj = self.obj.flatten()
+        integer = (self.vtype != 'C')
+        marker = False
+        for start in range(0, num_var, chunk):
+            stop = min(start + chunk, num_var)
+            indptr = csc.indptr
+            first, last = indptr[start], indptr[stop]
+            entries = ['c{} {}'.format(row, value) for row, value in
+                       zip((csc.indices[first:last] + 1).tolist(),
+                           csc.data[first:last].tolist())]
+            lines = []
+            for j in range(start, stop):
+                if integer[j] != marker:
+                    marker = integer[j]
+                    lines.append(" MARKER 'MARKER' '{}'\n".format(
+                                 'INTORG' if marker else 'INTEND'))
+                column = entries[indptr[j]-first:indptr[j+1]-first]
+                if obj[j] or not column:
+                    column = ['obj {}'.format(obj[j])] + column
+                lines.extend([' x{} {}\n'.format(j+1, entry)
+                              for entry in column])
+            file.write(''.join(lines))
+        if marker:
+            file.write(" MARKER 'MARKER' 'INTEND'\n")
+
+        file.write('RHS\n')
+        const = np.array(self.const).flatten()
+        index, = np.nonzero(const)
+        self.write_lines(file, ' RHS c{} {}\n', index + 1, const[index],
+                         chunk=chunk)
+
+        file.write('BOUNDS\n')
+        ub, lb = self.ub, self.lb
+        binary = (self.vtype == 'B')
+        free = (lb == -np.inf) & (ub == np.inf) & ~integer
+        index, = np.where(binary)
+        self.write_lines(file, ' BV BND x{}\n', index + 1, chunk=chunk)
+        index, = np.where(free)
+        self.write_lines(file, ' FR BND x{}\n', index + 1, chunk=chunk)
+        index, = np.where(~binary & ~free & (lb > -np.inf))
+        self.write_lines(file, ' LO BND x{} {}\n', index + 1, lb[index],
+                         chunk=chunk)
+        index, = np.where(~binary & ~free & (lb == -np.inf))
+        self.write_lines(file, ' MI BND x{}\n', index + 1, chunk=chunk)
+        index, = np.where(~binary & ~free & (ub < np.inf))
+        self.write_lines(file, ' UP BND x{} {}\n', index + 1, ub[index],
+                         chunk=chunk)
+        index, = np.where(~binary & integer & (ub == np.inf))
+        self.write_lines(file, ' PL BND x{}\n', index + 1, chunk=chunk)
+
+        for start in range(0, len(qmat), chunk):
+            lines = ['QCMATRIX q{}\n'.format(i+1) +
+                     ''.join([' x{0} x{0} 1\n'.format(j+1) for j in qc[1:]]) +
+                     ' x{0} x{0} -1\n'.format(qc[0]+1)
+                     for i, qc in enumerate(qmat[start:start+chunk], start)]
+            file.write(''.join(lines))
+
+        file.write('ENDATA\n')
+
+    def write_cbf(self, file, chunk=10000):
+        """
+        Write the standard form of the optimization model in the conic
+        benchmark format (CBF) to a text file object. Linear constraints,
+        finite bounds, second-order cones, and exponential cones are all
+        written as affine conic constraints on free variables.
+        """
+
+        linear = csr_matrix(self.linear)
+        num_constr, num_var = linear.shape
+        qmat = getattr(self, 'qmat', ConeList())
+        xmat = getattr(self, 'xmat', ConeList())
+
+        ub, lb = self.ub.astype(float), self.lb.astype(float)
+        binary = (self.vtype == 'B')
+        ub[binary] = np.minimum(ub[binary], 1)
+        lb[binary] = np.maximum(lb[binary], 0)
+        ind_ub, = np.where(ub < np.inf)
+        ind_lb, = np.where(lb > -np.inf)
+        ind_ineq, = np.where(self.sense == 0)
+        ind_eq, = np.where(self.sense == 1)
+        cone_vars = np.concatenate((qmat.indices,
+                                    xmat.indices.reshape((-1, 3))[:, [1, 2, 0]]
+                                    .flatten())).astype(int)
+
+        # Rows: inequalities, equalities, upper bounds, lower bounds, cones
+        order = np.concatenate((ind_ineq, ind_eq))
+        domains = [('L-', ind_ineq.size), ('L=', ind_eq.size),
+                   ('L-', ind_ub.size), ('L+', ind_lb.size)]
+        domains += [('Q', size) for size in qmat.sizes.tolist()]
+        domains += [('EXP', 3)] * len(xmat)
+        domains = [item for item in domains if item[1] > 0]
+        num_rows = num_constr + ind_ub.size + ind_lb.size + cone_vars.size
+
+        file.write('VER\n3\n\nOBJSENSE\nMIN\n\n')
+        file.write('VAR\n{} 1\nF {}\n\n'.format(num_var, num_var))
+        ind_int, = np.where(self.vtype != 'C')
+        if ind_int.size:
+            file.write('INT\n{}\n'.format(ind_int.size))
+            self.write_lines(file, '{}\n', ind_int, chunk=chunk)
+            file.write('\n')
+        file.write('CON\n{} {}\n'.format(num_rows, len(domains)))
+        self.write_lines(file, '{} {}\n', *zip(*domains), chunk=chunk)
+        file.write('\n')
+
+        obj = self.obj.flatten()
+        index, = np.nonzero(obj)
+        file.write('OBJACOORD\n{}\n'.format(index.size))
+        self.write_lines(file, '{} {}\n', index, obj[index], chunk=chunk)
+        file.write('\n')
+
+        file.write('ACOORD\n{}\n'.format(linear.nnz + num_rows - num_constr))
+        for start in range(0, num_constr, chunk):
+            rows = order[start:start+chunk]
+            block = linear[rows]
+            row_ind = np.repeat(np.arange(start, start + rows.size),
+                                np.diff(block.indptr))
+            self.write_lines(file, '{} {} {}\n', row_ind, block.indices,
+                             block.data, chunk=chunk)
+        extra = np.concatenate((ind_ub, ind_lb, cone_vars))
+        self.write_lines(file, '{} {} 1.0\n',
+                         np.arange(num_constr, num_rows), extra, chunk=chunk)
+        file.write('\n')
+
+        const = np.array(self.const).flatten()[order]
+        bconst = np.concatenate((-const, -ub[ind_ub], -lb[ind_lb]))
+        index, = np.nonzero(bconst)
+        file.write('BCOORD\n{}\n'.format(index.size))
+        self.write_lines(file, '{} {}\n', index, bconst[index], chunk=chunk)
+
+    @staticmethod
+    def write_lines(file, template, *columns, chunk=10000):
+
+        arrays = [np.asarray(column) for column in columns]
+        size = len(arrays[0]) if arrays else 0
+        for start in range(0, size, chunk):
+            items = zip(*[array[start:start+chunk].tolist()
+                          for array in arrays])
+            file.write(''.join([template.format(*item) for item in items]))
 
     def to_lp(self, name='out'):
         '''
@@ -3695,17 +4733,87 @@ class LinProg:
         '''
 
         with open(name + '.lp', 'w') as f:
-            f.write(self.lp_export())
+            self.write_lp(f)
+
+    def to_mps(self, name='out'):
+        '''
+        Export the standard form of the optimization model as a free-format
+        .mps file.
+
+        Parameters
+        ----------
+        name : file name of the .mps file
+
+        Notes
+        -----
+        There is no need to specify the .mps extension. The default file
+        name is "out".
+        '''
+
+        with open(name + '.mps', 'w') as f:
+            self.write_mps(f)
+
+    def to_cbf(self, name='out'):
+        '''
+        Export the standard form of the optimization model as a .cbf file
+        of the conic benchmark format.
+
+        Parameters
+        ----------
+        name : file name of the .cbf file
+
+        Notes
+        -----
+        There is no need to specify the .cbf extension. The default file
+        name is "out".
+        '''
+
+        with open(name + '.cbf', 'w') as f:
+            self.write_cbf(f)
 
 
 class Solution:
 
-    def __init__(self, objval, x, status, time):
+    def __init__(self, objval, x, status, time, basis=None):
 
         self.objval = objval
         self.x = x
         self.status = status
         self.time = time
+        self.basis = basis
+        self.dual = None
+        self.layout = None
+
+
+def start_values(formula, start, solver=None):
+    """
+    Return the starting values of variables and the simplex basis used
+    to warm-start the solver from a previous solution.
+
+    Notes
+    -----
+    The previous solution fills the leading entries of the starting
+    values and the remaining entries are np.nan. Solutions given by
+    Model.start_point are already placed on the columns of the current
+    formula, where np.nan marks the unknown values. The basis is None
+    unless it is recorded by the same solver interface for a formula
+    with the same numbers of rows and columns.
+    """
+
+    num_constr, num_var = formula.linear.shape
+    x0 = np.full(num_var, np.nan)
+    basis = None
+    if isinstance(start, Solution) and start.x is not None:
+        x = np.array(start.x, dtype=float).flatten()[:num_var]
+        x0[:x.size] = x
+        basis = start.basis
+        if basis is not None:
+            if basis.get('solver') != solver or \
+                    len(basis['col']) != num_var or \
+                    len(basis['row']) != num_constr:
+                basis = None
+
+    return x0, basis
 
 
 class Scen:
@@ -3768,8 +4876,11 @@ class Scen:
         # for i in self.series:
         indices = (self.series if isinstance(self.series, pd.Series)
                    else [self.series])
+        constrs = tuple(args)
         for i in indices:
-            self.ambset.sup_constr[i] = tuple(args)
+            self.ambset.sup_constr[i] = constrs
+        self.ambset.update = True
+        self.ambset.model.lowered = None
 
     def exptset(self, *args):
         """
@@ -3799,6 +4910,8 @@ class Scen:
                                  'expectation sets.')
 
         self.ambset.exp_constr.append(tuple(args))
+        self.ambset.update = True
+        self.ambset.model.lowered = None
         indices: Iterable[int]
         if not isinstance(self.series, Iterable):
             indices = [self.series]
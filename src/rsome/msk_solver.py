@@ -26,138 +26,248 @@ from .socp import SOCProg
 from .gcp import GCProg
 import warnings
 import time
-from .lp import Solution
+from .lp import Solution, ConeList, start_values
 
 
-def solve(form, display=True, params={}):
+def solve(form, display=True, params={}, start=None):
 
-    numlc, numvar = form.linear.shape
-    if isinstance(form, (SOCProg, GCProg)):
-        qmat = form.qmat
-    else:
-        qmat = []
-    if isinstance(form, GCProg):
-        xmat = form.xmat
-    else:
-        xmat = []
+    with mosek.Env() as env:
 
-    ind_int = np.where(form.vtype == 'I')[0]
-    ind_bin = np.where(form.vtype == 'B')[0]
+        with env.Task(0, 0) as task:
+
+            load(task, form)
+
+            if start is not None:
+                numvar = form.linear.shape[1]
+                qmat, xmat = form_cones(form)
+                x0, basis = start_values(form, start, __name__)
+                if 'B' in form.vtype or 'I' in form.vtype:
+                    unknown = np.isnan(x0)
+                    x0[unknown] = np.clip(0, form.lb, form.ub)[unknown]
+                    task.putxxslice(mosek.soltype.itg, 0, numvar, x0)
+                    task.putintparam(mosek.iparam.mio_construct_sol,
+                                     mosek.onoffkey.on)
+                elif basis is not None and not qmat and not xmat:
+                    task.putskc(mosek.soltype.bas, basis['row'])
+                    task.putskx(mosek.soltype.bas, basis['col'])
+                    task.putintparam(mosek.iparam.optimizer,
+                                     mosek.optimizertype.free_simplex)
+
+            return optimize(task, form, display, params)
+
+
+def form_cones(form):
 
+    qmat = form.qmat if isinstance(form, (SOCProg, GCProg)) else ConeList()
+    xmat = form.xmat if isinstance(form, GCProg) else ConeList()
+
+    return qmat, xmat
+
+
+def binary_bounds(form):
+
+    ind_bin = np.where(form.vtype == 'B')[0]
     if ind_bin.size:
         form.ub[ind_bin] = np.minimum(1, form.ub[ind_bin])
         form.lb[ind_bin] = np.maximum(0, form.lb[ind_bin])
 
-    ind_ub = np.where((form.ub != np.inf) & (form.lb == -np.inf))[0]
-    ind_lb = np.where((form.lb != -np.inf) & (form.ub == np.inf))[0]
-    ind_ra = np.where((form.lb != -np.inf) & (form.ub != np.inf))[0]
-    ind_fr = np.where((form.lb == -np.inf) & (form.ub == np.inf))[0]
-    ind_eq = np.where(form.sense)[0]
-    ind_ineq = np.where(form.sense == 0)[0]
 
-    with mosek.Env() as env:
+def var_bounds(task, index, lb, ub):
 
-        with env.Task(0, 0) as task:
+    lower, upper = lb[index], ub[index]
+    finite_lb, finite_ub = lower != -np.inf, upper != np.inf
+    for key, mask in [(mosek.boundkey.up, finite_ub & ~finite_lb),
+                      (mosek.boundkey.lo, finite_lb & ~finite_ub),
+                      (mosek.boundkey.ra, finite_lb & finite_ub),
+                      (mosek.boundkey.fr, ~finite_lb & ~finite_ub)]:
+        if mask.any():
+            task.putvarboundlist(index[mask], [key] * int(mask.sum()),
+                                 lower[mask], upper[mask])
+
+
+def var_types(task, index, vtype):
+
+    ind_int = index[vtype[index] != 'C']
+    if ind_int.size:
+        task.putvartypelist(ind_int,
+                            [mosek.variabletype.type_int] * len(ind_int))
 
-            task.appendvars(numvar)
-            task.appendcons(numlc)
-
-            if ind_ub.size:
-                task.putvarboundlist(ind_ub,
-                                     [mosek.boundkey.up] * len(ind_ub),
-                                     form.lb[ind_ub], form.ub[ind_ub])
-
-            if ind_lb.size:
-                task.putvarboundlist(ind_lb,
-                                     [mosek.boundkey.lo] * len(ind_lb),
-                                     form.lb[ind_lb], form.ub[ind_lb])
-
-            if ind_ra.size:
-                task.putvarboundlist(ind_ra,
-                                     [mosek.boundkey.ra] * len(ind_ra),
-                                     form.lb[ind_ra], form.ub[ind_ra])
-
-            if ind_fr.size:
-                task.putvarboundlist(ind_fr,
-                                     [mosek.boundkey.fr] * len(ind_fr),
-                                     form.lb[ind_fr], form.ub[ind_fr])
-
-            if ind_int.size:
-                task.putvartypelist(ind_int,
-                                    [mosek.variabletype.type_int]
-                                    * len(ind_int))
-
-            if ind_bin.size:
-                task.putvartypelist(ind_bin,
-                                    [mosek.variabletype.type_int]
-                                    * len(ind_bin))
-
-            task.putcslice(0, numvar, form.obj.flatten())
-            task.putobjsense(mosek.objsense.minimize)
-
-            coo = coo_matrix(form.linear)
-            task.putaijlist(coo.row, coo.col, coo.data)
-
-            if ind_eq.size:
-                task.putconboundlist(ind_eq, [mosek.boundkey.fx] * len(ind_eq),
-                                     form.const[ind_eq], form.const[ind_eq])
-            if ind_ineq.size:
-                task.putconboundlist(ind_ineq,
-                                     [mosek.boundkey.up] * len(ind_ineq),
-                                     [-np.inf] * len(ind_ineq),
-                                     form.const[ind_ineq])
-
-            for cone in qmat:
-                task.appendcone(mosek.conetype.quad,
-                                0.0, cone)
-            for cone in xmat:
-                msk_cone = [cone[1], cone[2], cone[0]]
-                task.appendcone(mosek.conetype.pexp, 0.0, msk_cone)
-
-            if display:
-                print('Being solved by Mosek...', flush=True)
-                time.sleep(0.2)
-
-            try:
-                for param, value in params.items():
-                    if isinstance(value, float):
-                        task.putdouparam(getattr(mosek.dparam, param), value)
-                    if isinstance(value, int):
-                        task.putintparam(getattr(mosek.iparam, param), value)
-                    if isinstance(value, str):
-                        task.putstrparam(getattr(mosek.sparam, param), value)
-            except (TypeError, ValueError, AttributeError):
-                raise ValueError('Incorrect parameters or values.')
-
-            t0 = time.time()
-            task.optimize()
-            stime = time.time() - t0
-
-            soltype = mosek.soltype
-            solsta = None
-
-            if 'B' in form.vtype or 'I' in form.vtype:
-                stype = soltype.itg
-            elif not qmat and not xmat:
-                stype = soltype.bas
-            else:
-                stype = soltype.itr
-
-            solsta = task.getsolsta(stype)
-            if display:
-                print('Solution status: {0}'.format(solsta.__repr__()))
-                print('Running time: {0:0.4f}s'.format(stime))
-
-            xx = [0.] * numvar
-            task.getxx(stype, xx)
-
-            # if export:
-            #     task.writedata("out.mps")
-
-            if solsta in [mosek.solsta.optimal, mosek.solsta.integer_optimal]:
-                solution = Solution(xx @ form.obj.flatten(), xx, solsta, stime)
-            else:
-                warnings.warn('Fail to find the optimal solution.')
-                solution = None
-
-            return solution
+
+def con_bounds(task, index, sense, const):
+
+    ind_eq = index[sense[index] != 0]
+    ind_ineq = index[sense[index] == 0]
+    if ind_eq.size:
+        task.putconboundlist(ind_eq, [mosek.boundkey.fx] * len(ind_eq),
+                             const[ind_eq], const[ind_eq])
+    if ind_ineq.size:
+        task.putconboundlist(ind_ineq,
+                             [mosek.boundkey.up] * len(ind_ineq),
+                             [-np.inf] * len(ind_ineq),
+                             const[ind_ineq])
+
+
+def add_cones(task, qmat, xmat):
+
+    # Cones are appended as affine conic constraints, whose affine
+    # expressions are appended after the existing ones
+    if qmat or xmat:
+        sizes = qmat.sizes
+        domains = {size: task.appendquadraticconedomain(size)
+                   for size in np.unique(sizes).tolist()}
+        domidxs = [domains[size] for size in sizes.tolist()]
+        if xmat:
+            domidxs += [task.appendprimalexpconedomain()] * len(xmat)
+        msk_cones = xmat.indices.reshape((-1, 3))[:, [1, 2, 0]]
+        varidxs = np.concatenate((qmat.indices,
+                                  msk_cones.flatten())).astype(int)
+        numafe = varidxs.size
+        afeidxs = task.getnumafe() + np.arange(numafe)
+        task.appendafes(numafe)
+        task.putafefentrylist(afeidxs, varidxs, np.ones(numafe))
+        task.appendaccs(domidxs, afeidxs, None)
+
+
+def load(task, form):
+
+    numlc, numvar = form.linear.shape
+    qmat, xmat = form_cones(form)
+    binary_bounds(form)
+
+    task.appendvars(numvar)
+    task.appendcons(numlc)
+
+    var_bounds(task, np.arange(numvar), form.lb, form.ub)
+    var_types(task, np.arange(numvar), form.vtype)
+
+    task.putcslice(0, numvar, form.obj.flatten())
+    task.putobjsense(mosek.objsense.minimize)
+
+    coo = coo_matrix(form.linear)
+    task.putaijlist(coo.row, coo.col, coo.data)
+
+    con_bounds(task, np.arange(numlc), form.sense, form.const)
+    add_cones(task, qmat, xmat)
+
+
+def optimize(task, form, display=True, params={}):
+
+    numlc, numvar = form.linear.shape
+    qmat, xmat = form_cones(form)
+
+    if display:
+        print('Being solved by Mosek...', flush=True)
+        time.sleep(0.2)
+
+    try:
+        for param, value in params.items():
+            if isinstance(value, float):
+                task.putdouparam(getattr(mosek.dparam, param), value)
+            if isinstance(value, int):
+                task.putintparam(getattr(mosek.iparam, param), value)
+            if isinstance(value, str):
+                task.putstrparam(getattr(mosek.sparam, param), value)
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError('Incorrect parameters or values.')
+
+    t0 = time.time()
+    task.optimize()
+    stime = time.time() - t0
+
+    soltype = mosek.soltype
+    solsta = None
+
+    if 'B' in form.vtype or 'I' in form.vtype:
+        stype = soltype.itg
+    elif not qmat and not xmat:
+        stype = soltype.bas
+    else:
+        stype = soltype.itr
+
+    solsta = task.getsolsta(stype)
+    if display:
+        print('Solution status: {0}'.format(solsta.__repr__()))
+        print('Running time: {0:0.4f}s'.format(stime))
+
+    xx = [0.] * numvar
+    task.getxx(stype, xx)
+
+    # if export:
+    #     task.writedata("out.mps")
+
+    if solsta in [mosek.solsta.optimal, mosek.solsta.integer_optimal]:
+        solution = Solution(xx @ form.obj.flatten(), xx, solsta, stime)
+        if stype == soltype.bas:
+            skc = [mosek.stakey.unk] * numlc
+            skx = [mosek.stakey.unk] * numvar
+            task.getskc(stype, skc)
+            task.getskx(stype, skx)
+            solution.basis = {'solver': __name__,
+                              'col': skx, 'row': skc}
+    else:
+        warnings.warn('Fail to find the optimal solution.')
+        solution = None
+
+    return solution
+
+
+class Session:
+    """
+    The Session class keeps a MOSEK task loaded from a standard formula
+    and applies the changes of the formula to the task incrementally.
+    """
+
+    def __init__(self, formula):
+
+        self.env = mosek.Env()
+        self.task = self.env.Task(0, 0)
+        load(self.task, formula)
+        self.formula = formula
+
+    def update(self, formula, delta):
+        """
+        Apply the changes of the standard formula given by the dictionary
+        delta to the MOSEK task.
+        """
+
+        task = self.task
+        m0, n0 = delta['shape']
+        m, n = formula.linear.shape
+        binary_bounds(formula)
+
+        if n > n0:
+            index = np.arange(n0, n)
+            task.appendvars(n - n0)
+            var_bounds(task, index, formula.lb, formula.ub)
+            var_types(task, index, formula.vtype)
+            task.putcslice(n0, n, formula.obj[0, n0:])
+
+        index = delta['bounds']
+        if index.size:
+            var_bounds(task, index, formula.lb, formula.ub)
+        index = delta['obj']
+        if index.size:
+            task.putclist(index, formula.obj[0, index])
+        index = delta['rhs']
+        if index.size:
+            con_bounds(task, index, formula.sense, formula.const)
+        rows, cols, values = delta['coef']
+        if rows.size:
+            task.putaijlist(rows, cols, values)
+
+        if m > m0:
+            task.appendcons(m - m0)
+            coo = coo_matrix(formula.linear[m0:])
+            task.putaijlist(coo.row + m0, coo.col, coo.data)
+            con_bounds(task, np.arange(m0, m), formula.sense, formula.const)
+
+        qmat, xmat = form_cones(formula)
+        add_cones(task, qmat[delta['qmat']:], xmat[delta['xmat']:])
+        self.formula = formula
+
+    def solve(self, display=True, params={}):
+        """
+        Solve the MOSEK task and return the solution.
+        """
+
+        return optimize(self.task, self.formula, display, params)
@@ -19,16 +19,69 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from ortools.linear_solver import pywraplp
+from ortools.linear_solver.python import model_builder as mb
+import ortools.linear_solver.linear_solver_pb2 as pb
 
 import numpy as np
 import warnings
 import time
+import os
+import tempfile
+from scipy.sparse import csr_matrix
 from .lp import Solution
-from numbers import Real
 
 
-def solve(formula, display=True, params={}):
+def load(formula):
+    """
+    Load the standard formula into an OR-Tools model. The variables and
+    constraints of an MPModelProto are built in one pass over the bounds
+    and the CSR arrays of the constraint matrix, and the model builder
+    imports the serialized proto as a whole.
+    """
+
+    vtype = formula.vtype
+    ub = np.array(formula.ub, dtype=float)
+    lb = np.array(formula.lb, dtype=float)
+    ind_bin = (vtype == 'B')
+    ub[ind_bin] = np.minimum(1, ub[ind_bin])
+    lb[ind_bin] = np.maximum(0, lb[ind_bin])
+    obj = np.array(formula.obj, dtype=float).flatten()
+
+    linear = csr_matrix(formula.linear, dtype=float)
+    indptr = linear.indptr.tolist()
+    indices = linear.indices.tolist()
+    data = linear.data.tolist()
+    const = np.array(formula.const, dtype=float).flatten()
+    lhs = np.where(np.asarray(formula.sense) == 1, const, -np.inf)
+
+    proto = pb.MPModelProto()
+    proto.variable.extend(pb.MPVariableProto(lower_bound=lower,
+                                             upper_bound=upper,
+                                             objective_coefficient=coef,
+                                             is_integer=integer)
+                          for lower, upper, coef, integer
+                          in zip(lb.tolist(), ub.tolist(), obj.tolist(),
+                                 (vtype != 'C').tolist()))
+    proto.constraint.extend(pb.MPConstraintProto(var_index=indices[start:end],
+                                                 coefficient=data[start:end],
+                                                 lower_bound=lower,
+                                                 upper_bound=upper)
+                            for start, end, lower, upper
+                            in zip(indptr[:-1], indptr[1:],
+                                   lhs.tolist(), const.tolist()))
+
+    model = mb.Model()
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'model.pb')
+        with open(path, 'wb') as file:
+            file.write(proto.SerializeToString())
+        if not model.import_from_proto_file(path):
+            raise RuntimeError('Fail to load the model into OR-Tools.')
+
+    return model
+
+
+def solve(formula, display=True, params={}, start=None):
 
     try:
         if formula.qmat:
@@ -42,52 +95,25 @@ def solve(formula, display=True, params={}):
     except AttributeError:
         pass
 
-    obj = formula.obj.flatten()
-    linear = formula.linear
-    sense = formula.sense
-    const = formula.const
-    ub = formula.ub
-    lb = formula.lb
-    vtype = formula.vtype
-
-    if all(vtype == 'C'):
-        solver = pywraplp.Solver.CreateSolver('GLOP')
+    model = load(formula)
+    if all(formula.vtype == 'C'):
+        solver = mb.Solver('GLOP')
     else:
-        solver = pywraplp.Solver.CreateSolver('SCIP')
-
-    row, col = linear.shape
-
-    xs = [solver.NumVar(lb[i], ub[i], 'x' + str(i)) if vtype[i] == 'C' else
-          solver.IntVar(max(0, lb[i]), min(1, ub[i]),
-                        'x' + str(i)) if vtype[i] == 'B' else
-          solver.IntVar(lb[i], ub[i], 'x' + str(i)) for i in range(col)]
-
-    solver.Minimize(sum([obj[i] * xs[i] for i in range(col)]))
-
-    for j in range(row):
-        indices = linear[j].indices
-        coeff = linear[j].data
-        nz = len(indices)
-        left = sum([coeff[i] * xs[indices[i]] for i in range(nz)])
-        if not isinstance(left, Real):
-            if sense[j] == 1:
-                solver.Add(left == const[j])
-            else:
-                solver.Add(left <= const[j])
+        solver = mb.Solver('SCIP')
 
     if display:
         print('Being solved by OR-Tools...', flush=True)
         time.sleep(0.2)
     t0 = time.time()
-    status = solver.Solve()
+    status = solver.solve(model)
     stime = time.time() - t0
     if display:
         print('Solution status: {0}'.format(status))
         print('Running time: {0:0.4f}s'.format(stime))
 
-    if status == pywraplp.Solver.OPTIMAL:
-        x_sol = np.array([xs[i].solution_value() for i in range(col)])
-        solution = Solution(solver.Objective().Value(), x_sol, status, stime)
+    if status == mb.SolveStatus.OPTIMAL:
+        x_sol = solver.values(model.get_variables()).values
+        solution = Solution(solver.objective_value, x_sol, status, stime)
     else:
         warnings.warn('Fail to find the optimal solution.')
         solution = None
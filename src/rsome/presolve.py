@@ -0,0 +1,401 @@
+"""
+Module used for reducing the standard formulas of RSOME models before
+they are passed to the solver interfaces.
+
+Copyright 2020-2022 Peng Xiong, & Zhi Chen
+
+This file is a part of RSOME
+
+This file may be used under the terms of the GNU General Public License
+version 3 as published by the Free Software Foundation and appearing in
+the file LICENSE.GPL included in the packaging of this file.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from .lp import LinProg, ConeList, Solution
+from .socp import SOCProg
+from .gcp import GCProg
+import numpy as np
+import scipy.sparse as sp
+import warnings
+
+
+TOL = 1e-9
+PIVOT = 1e-2
+
+
+class Postsolve:
+    """
+    The Postsolve class creates an object that maps solutions of a
+    presolved formula back to the variables of the original formula,
+    in the form of x = matrix @ y + const, and records how much the
+    formula is reduced.
+    """
+
+    def __init__(self, formula):
+
+        num_var = formula.linear.shape[1]
+        self.matrix = sp.identity(num_var, format='csr')
+        self.const = np.zeros(num_var)
+        self.offset = 0.0
+        self.counts = {'empty rows': 0, 'singleton rows': 0,
+                       'duplicate rows': 0, 'fixed columns': 0,
+                       'substituted columns': 0}
+        self.before = (formula.linear.shape[0], num_var,
+                       formula.linear.nnz)
+        self.after = self.before
+        self.passes = 0
+        self.infeasible = False
+
+    def __repr__(self):
+
+        names = ('rows', 'columns', 'nonzeros')
+        suffix = 'es' if self.passes > 1 else ''
+        string = 'Presolve in {} pass{}:\n'.format(self.passes, suffix)
+        if self.infeasible:
+            string += '  the formula is infeasible\n'
+        for name, before, after in zip(names, self.before, self.after):
+            ratio = 1 - after/before if before > 0 else 0
+            string += '  {:<20}{:>10} -> {:<10}({:.1%} removed)\n'.format(
+                name + ':', before, after, ratio)
+        for name, count in self.counts.items():
+            string += '  {:<20}{:>10}\n'.format(name + ':', count)
+
+        return string
+
+    def compose(self, matrix, const):
+
+        self.const = self.matrix @ const + self.const
+        self.matrix = sp.csr_matrix(self.matrix @ matrix)
+
+    def restore(self, x):
+        """
+        Return the values of variables of the original formula given the
+        values of variables of the presolved formula.
+        """
+
+        return self.matrix @ np.asarray(x).flatten() + self.const
+
+    def __call__(self, solution):
+        """
+        Return the solution of the original formula given the solution of
+        the presolved formula. Only the primal values and the objective
+        value are restored, and the simplex basis is dropped. None is
+        returned if presolve finds the formula infeasible.
+        """
+
+        if self.infeasible:
+            warnings.warn('The formula is found infeasible by presolve.')
+            return None
+        if not isinstance(solution, Solution):
+            return solution
+
+        x = None if solution.x is None else self.restore(solution.x)
+        objval = solution.objval
+        if objval is not None:
+            objval = objval + self.offset
+
+        return Solution(objval, x, solution.status, solution.time)
+
+
+def presolve(formula, max_passes=20):
+    """
+    Reduce the standard formula of a model.
+
+    Parameters
+    ----------
+    formula : LinProg, SOCProg, or GCProg
+        Standard formula of a compiled model.
+    max_passes : int
+        The maximum number of passes of reductions.
+
+    Returns
+    -------
+    formula : LinProg, SOCProg, or GCProg
+        The presolved formula, which can be solved by any solver interface.
+    postsolve : Postsolve
+        A callable object that maps the solution of the presolved formula
+        back to the variables of the original formula. Printing the
+        object reports how much the formula is reduced.
+
+    Notes
+    -----
+    The following reductions are applied repeatedly until no further
+    reduction is found:
+    1. Empty rows are removed.
+    2. Singleton rows are converted into bounds of variables.
+    3. Duplicate rows are merged.
+    4. Fixed variables and variables in no rows are substituted by
+    constant values.
+    5. Variables defined by equality rows, i.e., free variables appearing
+    in only one equality row and variables in equality rows with two
+    nonzeros, are substituted by the other variables of the rows.
+    Variables in conic constraints are never substituted, so that conic
+    constraints are kept unchanged.
+
+    The reductions stop once an empty row is violated or the bounds of
+    a variable cross each other, and then the formula is infeasible and
+    the Postsolve object maps any solution to None.
+
+    The function is used by Model.solve(presolve=True), and it can also
+    be applied to any formula given by Model.do_math(). Postsolve only
+    restores the primal solution, so dual values and the simplex basis
+    of the original formula are not available.
+    """
+
+    postsolve = Postsolve(formula)
+
+    linear = sp.csr_matrix(formula.linear, dtype=float, copy=True)
+    const = np.array(formula.const, dtype=float).flatten()
+    sense = np.array(formula.sense).flatten()
+    vtype = np.array(formula.vtype).flatten()
+    ub = np.array(formula.ub, dtype=float).flatten()
+    lb = np.array(formula.lb, dtype=float).flatten()
+    obj = (np.zeros(linear.shape[1]) if formula.obj is None else
+           np.array(formula.obj, dtype=float).flatten())
+    qmat = getattr(formula, 'qmat', ConeList())
+    xmat = getattr(formula, 'xmat', ConeList())
+    cone_index = np.concatenate((qmat.indices, xmat.indices)).astype(int)
+    integer = vtype != 'C'
+
+    protected = np.zeros(linear.shape[1], dtype=bool)
+    protected[cone_index] = True
+    protected[:1] = True
+    columns = np.arange(linear.shape[1])
+
+    for _ in range(max_passes):
+        changed = False
+        linear.sort_indices()
+        row_nnz = np.diff(linear.indptr)
+
+        # Empty rows that are feasible
+        feasible = (((sense == 0) & (const >= -TOL)) |
+                    ((sense == 1) & (abs(const) <= TOL)))
+        if ((row_nnz == 0) & ~feasible).any():
+            postsolve.infeasible = True
+            break
+        empty = (row_nnz == 0) & feasible
+        drop = empty.copy()
+        postsolve.counts['empty rows'] += empty.sum()
+
+        # Singleton rows
+        single, = np.where(row_nnz == 1)
+        if single.size:
+            cols = linear.indices[linear.indptr[single]]
+            coeffs = linear.data[linear.indptr[single]]
+            values = const[single] / coeffs
+            upper = (sense[single] == 1) | (coeffs > 0)
+            lower = (sense[single] == 1) | (coeffs < 0)
+            np.minimum.at(ub, cols[upper], values[upper])
+            np.maximum.at(lb, cols[lower], values[lower])
+            drop[single] = True
+            postsolve.counts['singleton rows'] += single.size
+        ub[integer] = np.floor(ub[integer] + TOL)
+        lb[integer] = np.ceil(lb[integer] - TOL)
+        if (lb > ub + TOL).any():
+            postsolve.infeasible = True
+            break
+
+        # Duplicate rows
+        rows, = np.where(~drop)
+        for i, j in duplicate_rows(linear, sense, rows):
+            if sense[i] == 1 and abs(const[i] - const[j]) > TOL:
+                continue
+            const[j] = min(const[i], const[j])
+            drop[i] = True
+            postsolve.counts['duplicate rows'] += 1
+
+        if drop.any():
+            changed = True
+            linear = linear[~drop]
+            const, sense = const[~drop], sense[~drop]
+
+        # Fixed columns and empty columns
+        linear = sp.csr_matrix(linear)
+        col_nnz = np.bincount(linear.indices, minlength=linear.shape[1])
+        fixed = (abs(ub - lb) <= TOL) & ~protected
+        empty = (col_nnz == 0) & ~protected & ~fixed
+        values = np.where(fixed, lb, 0.0)
+        values[empty & (obj > 0)] = lb[empty & (obj > 0)]
+        values[empty & (obj < 0)] = ub[empty & (obj < 0)]
+        values[empty & (obj == 0)] = np.clip(0, lb, ub)[empty & (obj == 0)]
+        empty &= np.isfinite(values)
+        fixed_index, = np.where(fixed | empty)
+        fixed = (fixed_index, values[fixed_index])
+
+        # Substitution of variables defined by equality rows
+        subs = []
+        drop = np.zeros(linear.shape[0], dtype=bool)
+        eliminated = np.zeros(linear.shape[1], dtype=bool)
+        eliminated[fixed_index] = True
+        kept = np.zeros(linear.shape[1], dtype=bool)
+        row_nnz = np.diff(linear.indptr)
+        free = np.isinf(lb) & np.isinf(ub)
+        candidate = ~protected & ~integer & ~eliminated
+        rows = substitution_rows(linear, sense, candidate, free, col_nnz)
+        for i in rows.tolist():
+            first, last = linear.indptr[i], linear.indptr[i+1]
+            cols = linear.indices[first:last]
+            coeffs = linear.data[first:last]
+            if eliminated[cols].any():
+                continue
+            pivot = PIVOT * abs(coeffs).max()
+            mask = (candidate[cols] & ~kept[cols] & (abs(coeffs) >= pivot) &
+                    (((col_nnz[cols] == 1) & free[cols]) | (cols.size == 2)))
+            if not mask.any():
+                continue
+            pos = np.flatnonzero(mask)
+            pos = pos[np.argmin(col_nnz[cols[pos]])]
+            k = cols[pos]
+            others = np.delete(cols, pos)
+            scale = - np.delete(coeffs, pos) / coeffs[pos]
+            shift = const[i] / coeffs[pos]
+            if cols.size == 2:
+                j, s = others[0], scale[0]
+                lower, upper = (lb[k] - shift) / s, (ub[k] - shift) / s
+                if s < 0:
+                    lower, upper = upper, lower
+                lb[j] = max(lb[j], lower)
+                ub[j] = min(ub[j], upper)
+                if integer[j]:
+                    lb[j], ub[j] = np.ceil(lb[j] - TOL), np.floor(ub[j] + TOL)
+                if lb[j] > ub[j] + TOL:
+                    postsolve.infeasible = True
+                    break
+            subs.append((k, others, np.concatenate(([shift], scale))))
+            eliminated[k] = True
+            kept[others] = True
+            drop[i] = True
+
+        if postsolve.infeasible:
+            break
+        if subs or fixed_index.size:
+            changed = True
+            linear = linear[~drop]
+            const, sense = const[~drop], sense[~drop]
+            linear, const, obj, keep = substitute(linear, const, obj,
+                                                  postsolve, subs, fixed)
+            lb, ub, vtype = lb[keep], ub[keep], vtype[keep]
+            integer, protected = integer[keep], protected[keep]
+            columns = columns[keep]
+            postsolve.counts['fixed columns'] += fixed_index.size
+            postsolve.counts['substituted columns'] += len(subs)
+
+        postsolve.passes += 1
+        if not changed:
+            break
+
+    postsolve.after = (linear.shape[0], linear.shape[1], linear.nnz)
+
+    new_index = np.full(formula.linear.shape[1], -1)
+    new_index[columns] = np.arange(columns.size)
+    obj = obj.reshape((1, -1))
+    reduced: LinProg
+    if isinstance(formula, GCProg):
+        qmat = ConeList.from_arrays(new_index[qmat.indices],
+                                    qmat.offsets.copy())
+        xmat = ConeList.from_arrays(new_index[xmat.indices],
+                                    xmat.offsets.copy())
+        reduced = GCProg(linear, const, sense, vtype, ub, lb,
+                         qmat, xmat, obj)
+    elif isinstance(formula, SOCProg):
+        qmat = ConeList.from_arrays(new_index[qmat.indices],
+                                    qmat.offsets.copy())
+        reduced = SOCProg(linear, const, sense, vtype, ub, lb, qmat, obj)
+    elif isinstance(formula, LinProg):
+        reduced = LinProg(linear, const, sense, vtype, ub, lb, obj)
+    else:
+        raise TypeError('Unknown type of formulas.')
+
+    return reduced, postsolve
+
+
+def duplicate_rows(linear, sense, rows):
+
+    # Rows are hashed by their coefficients and sparsity patterns, and
+    # rows with the same hash values are compared exactly
+    if rows.size < 2:
+        return []
+    sub = linear[rows]
+    pattern = sp.csr_matrix((np.ones(sub.nnz), sub.indices, sub.indptr),
+                            shape=sub.shape)
+    weights = np.random.default_rng(0).random((2, sub.shape[1]))
+    keys = np.stack((sense[rows], sub @ weights[0], pattern @ weights[1]))
+    order = np.lexsort(keys[::-1])
+    same = (keys[:, order[1:]] == keys[:, order[:-1]]).all(axis=0)
+
+    pairs = []
+    first = order[0]
+    for pos in range(1, order.size):
+        if not same[pos-1]:
+            first = order[pos]
+            continue
+        i, j = rows[order[pos]], rows[first]
+        cols_i = linear.indices[linear.indptr[i]:linear.indptr[i+1]]
+        cols_j = linear.indices[linear.indptr[j]:linear.indptr[j+1]]
+        data_i = linear.data[linear.indptr[i]:linear.indptr[i+1]]
+        data_j = linear.data[linear.indptr[j]:linear.indptr[j+1]]
+        if (cols_i.size == cols_j.size and (cols_i == cols_j).all() and
+                (data_i == data_j).all()):
+            pairs.append((i, j))
+
+    return pairs
+
+
+def substitution_rows(linear, sense, candidate, free, col_nnz):
+
+    # Equality rows with at least one variable that can be substituted
+    row_nnz = np.diff(linear.indptr)
+    row_of = np.repeat(np.arange(linear.shape[0]), row_nnz)
+    values = abs(linear.data)
+    nonempty = row_nnz > 0
+    row_max = np.zeros(linear.shape[0])
+    row_max[nonempty] = np.maximum.reduceat(values,
+                                            linear.indptr[:-1][nonempty])
+    cols = linear.indices
+    entry = (candidate[cols] & (values >= PIVOT * row_max[row_of]) &
+             (((col_nnz[cols] == 1) & free[cols]) | (row_nnz[row_of] == 2)))
+    count = np.bincount(row_of[entry], minlength=linear.shape[0])
+
+    return np.flatnonzero((sense == 1) & (row_nnz >= 2) & (count > 0))
+
+
+def substitute(linear, const, obj, postsolve, subs, fixed):
+
+    # Variables are replaced by x = matrix @ y + shift, where y are the
+    # variables that are kept
+    num_var = linear.shape[1]
+    keep = np.ones(num_var, dtype=bool)
+    keep[fixed[0]] = False
+    keep[[k for k, _, _ in subs]] = False
+    new_index = np.cumsum(keep) - 1
+
+    rows, cols = [np.flatnonzero(keep)], [new_index[keep]]
+    values = [np.ones(keep.sum())]
+    shift = np.zeros(num_var)
+    shift[fixed[0]] = fixed[1]
+    for k, others, coeffs in subs:
+        rows.append(np.full(len(others), k))
+        cols.append(new_index[others])
+        values.append(coeffs[1:])
+        shift[k] = coeffs[0]
+    matrix = sp.csr_matrix((np.concatenate(values),
+                            (np.concatenate(rows), np.concatenate(cols))),
+                           shape=(num_var, keep.sum()))
+
+    const = const - linear @ shift
+    linear = sp.csr_matrix(linear @ matrix)
+    linear.data[abs(linear.data) < TOL] = 0
+    linear.eliminate_zeros()
+    postsolve.offset += obj @ shift
+    obj = matrix.T @ obj
+    postsolve.compose(matrix, shift)
+
+    return linear, const, obj, keep
@@ -0,0 +1,315 @@
+"""
+Module used for profiling the phases of solving RSOME models, such as the
+robust counterparts, the lowering, and the solver.
+
+Copyright 2020-2022 Peng Xiong, & Zhi Chen
+
+This file is a part of RSOME
+
+This file may be used under the terms of the GNU General Public License
+version 3 as published by the Free Software Foundation and appearing in
+the file LICENSE.GPL included in the packaging of this file.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+import functools
+import time
+import sys
+from typing import Any, Callable, List
+
+
+HOOKS: List[Callable[..., Any]] = []
+
+_state = threading.local()
+
+
+def subscribe(hook):
+    """
+    Subscribe a hook to the profiled solves. The hook is called as
+    hook(report, record) when each phase is finished, where report is
+    the SolveReport of the solve and record is the PhaseRecord of the
+    finished phase.
+    """
+
+    if hook not in HOOKS:
+        HOOKS.append(hook)
+
+
+def unsubscribe(hook):
+    """
+    Remove a hook from the profiled solves.
+    """
+
+    if hook in HOOKS:
+        HOOKS.remove(hook)
+
+
+class PhaseRecord:
+    """
+    The PhaseRecord class records the number of calls, the wall time,
+    the net number of allocated memory blocks, and the size of the
+    output formula of a phase.
+    """
+
+    def __init__(self, report, name, path):
+
+        self.report = report
+        self.name = name
+        self.path = path
+        self.calls = 0
+        self.time = 0.0
+        self.blocks = 0
+        self.rows = None
+        self.cols = None
+        self.nnz = None
+        self.cones = None
+        self.start = time.perf_counter()
+
+    def __repr__(self):
+
+        return 'Phase {}: {} call{}, {:0.4f}s'.format(
+            '/'.join(self.path), self.calls, 's' if self.calls != 1 else '',
+            self.time)
+
+    def output(self, formula):
+        """
+        Record the numbers of rows, columns, nonzero coefficients, and
+        cones of the output formula.
+        """
+
+        self.rows, self.cols = formula.linear.shape
+        self.nnz = formula.linear.nnz
+        self.cones = (len(getattr(formula, 'qmat', [])) +
+                      len(getattr(formula, 'xmat', [])))
+
+    def split(self, solution):
+        """
+        Split the time of the solver phase into the loading of the
+        solver and the optimization time given by the solution.
+        """
+
+        if solution is None:
+            return
+
+        elapsed = time.perf_counter() - self.start
+        optimize = min(float(solution.time), elapsed)
+        self.report.add('load', elapsed - optimize)
+        self.report.add('optimize', optimize)
+
+    def to_dict(self):
+
+        return {'phase': '/'.join(self.path), 'calls': self.calls,
+                'time': self.time, 'blocks': self.blocks,
+                'rows': self.rows, 'cols': self.cols,
+                'nnz': self.nnz, 'cones': self.cones}
+
+
+class NullRecord:
+    """
+    The NullRecord class ignores the records of phases if the solve is
+    not profiled.
+    """
+
+    def output(self, formula):
+
+        pass
+
+    def split(self, solution):
+
+        pass
+
+
+NULL_RECORD = NullRecord()
+
+
+class SolveReport:
+    """
+    The SolveReport class collects the records of the phases of a
+    profiled solve. Phases are identified by their paths, so that
+    repeated calls of a phase under the same parent are accumulated
+    into one record.
+
+    Parameters
+    ----------
+    hooks : list
+        Hooks called as hook(report, record) when each phase is
+        finished. Hooks subscribed by rsome.report.subscribe are used
+        if hooks=None.
+    """
+
+    def __init__(self, hooks=None):
+
+        self.hooks = list(HOOKS) if hooks is None else list(hooks)
+        self.records = {}
+        self.stack = []
+        self.solution = None
+
+    def __repr__(self):
+
+        head = '{:<32} {:>7} {:>10} {:>10} {:>8} {:>8} {:>10} {:>7}'
+        line = '{:<32} {:>7} {:>10.4f} {:>10} {:>8} {:>8} {:>10} {:>7}'
+        string = head.format('phase', 'calls', 'time (s)', 'blocks',
+                             'rows', 'cols', 'nnz', 'cones') + '\n'
+        for record in self.records.values():
+            name = '  ' * (len(record.path) - 1) + record.name
+            sizes = [('-' if item is None else item)
+                     for item in [record.rows, record.cols,
+                                  record.nnz, record.cones]]
+            string += line.format(name, record.calls, record.time,
+                                  record.blocks, *sizes) + '\n'
+
+        return string
+
+    def __getitem__(self, name):
+
+        for record in self.records.values():
+            if name in (record.name, '/'.join(record.path)):
+                return record
+        raise KeyError(name)
+
+    def __contains__(self, name):
+
+        try:
+            self[name]
+            return True
+        except KeyError:
+            return False
+
+    @property
+    def time(self):
+        """
+        Total wall time of the top-level phases.
+        """
+
+        return sum([record.time for record in self.records.values()
+                    if len(record.path) == 1])
+
+    def record(self, name):
+
+        parent = self.stack[-1].path if self.stack else ()
+        path = parent + (name, )
+        record = self.records.get(path)
+        if record is None:
+            record = PhaseRecord(self, name, path)
+            self.records[path] = record
+
+        return record
+
+    def add(self, name, seconds):
+        """
+        Add the given time to the record of a phase under the current
+        phase.
+        """
+
+        record = self.record(name)
+        record.calls += 1
+        record.time += seconds
+        self.notify(record)
+
+    def notify(self, record):
+
+        for hook in self.hooks:
+            hook(self, record)
+
+    def to_list(self):
+        """
+        Return the records of phases as a list of dictionaries.
+        """
+
+        return [record.to_dict() for record in self.records.values()]
+
+
+class profiling:
+    """
+    Context manager that sets the report of the current thread, so that
+    phases entered in the context are recorded into the report. Nothing
+    is recorded if the report is None.
+    """
+
+    def __init__(self, report):
+
+        self.report = report
+
+    def __enter__(self):
+
+        self.previous = getattr(_state, 'report', None)
+        _state.report = self.report
+
+        return self.report
+
+    def __exit__(self, *args):
+
+        _state.report = self.previous
+
+
+class phase:
+    """
+    Context manager that records the time, the net number of allocated
+    memory blocks, and the number of calls of a phase into the report of
+    the current thread. Recursive calls of the same phase are recorded
+    as one call.
+    """
+
+    def __init__(self, name):
+
+        self.name = name
+        self.record = None
+
+    def __enter__(self):
+
+        report = getattr(_state, 'report', None)
+        if report is None:
+            return NULL_RECORD
+
+        stack = report.stack
+        if stack and stack[-1].name == self.name:
+            return stack[-1]
+
+        record = report.record(self.name)
+        record.start = time.perf_counter()
+        self.blocks = sys.getallocatedblocks()
+        stack.append(record)
+        self.record = record
+
+        return record
+
+    def __exit__(self, *args):
+
+        record = self.record
+        if record is None:
+            return
+
+        report = record.report
+        record.calls += 1
+        record.time += time.perf_counter() - record.start
+        record.blocks += sys.getallocatedblocks() - self.blocks
+        report.stack.pop()
+        report.notify(record)
+
+
+def profiled(name):
+    """
+    Decorator that records the calls of the function as a phase of the
+    given name in profiled solves.
+    """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_state, 'report', None) is None:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -20,10 +20,14 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from .gcp import Model as GCPModel
 from .lp import LinConstr, Bounds, CvxConstr, ConeConstr, ExpConstr, KLConstr
+from .lp import ConeBatch
 from .lp import Vars, VarSub, Affine, Convex
 from .lp import DecRule
 from .lp import RoAffine, RoConstr
+from .lp import SupportCache
 from .lp import Solution, def_sol
+from .presolve import presolve as presolve_formula
+from .report import SolveReport, profiling, phase
 import numpy as np
 from numbers import Real
 from collections.abc import Iterable
@@ -38,6 +42,7 @@ class Model:
 
         self.rc_model = GCPModel(mtype='R', top=self)
         self.sup_model = GCPModel(nobj=True, mtype='S', top=self)
+        self.support_cache = SupportCache()
 
         self.all_constr = []
 
@@ -50,6 +55,7 @@ class Model:
         self.solution = None
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
         self.solution = None
 
@@ -62,6 +68,7 @@ class Model:
         self.dupdate = True
         self.primal = None
         self.dual = None
+        self.lowered = None
         self.rc_model.reset()
 
     def dvar(self, shape=(), vtype='C', name=None, aux=False):
@@ -89,6 +96,28 @@ class Model:
         new_var = self.rc_model.dvar(shape, vtype, name, aux)
         return new_var
 
+    def param(self, shape=(), value=0, name=None):
+        """
+        Returns an array of parameters with the given shape and values.
+
+        Parameters
+        ----------
+        shape : int or tuple
+            Shape of the parameter array.
+        value : float or array_like
+            Initial values of the parameters.
+        name : str
+            Name of the parameter array
+
+        Returns
+        -------
+        new_param : rsome.lp.Parameter
+            An array of new parameters
+        """
+
+        new_param = self.rc_model.param(shape, value, name)
+        return new_param
+
     def rvar(self, shape=(), name=None):
 
         """
@@ -162,6 +191,7 @@ class Model:
         self.sign = 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
     def max(self, obj):
         """
@@ -193,6 +223,7 @@ class Model:
         self.sign = - 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
     def minmax(self, obj, *args):
 
@@ -226,18 +257,13 @@ class Model:
             else:
                 constraints.append(items)
 
-        sup_model = self.sup_model
-        sup_model.reset()
-        for item in constraints:
-            if item.model is not sup_model:
-                raise ValueError('Models mismatch.')
-            sup_model.st(item)
-
+        self.obj_support = self.support_cache.formula(self.sup_model,
+                                                      constraints)
         self.obj = obj
-        self.obj_support = sup_model.do_math(primal=False, obj=False)
         self.sign = 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
     def maxmin(self, obj, *args):
 
@@ -271,18 +297,13 @@ class Model:
             else:
                 constraints.append(items)
 
-        sup_model = self.sup_model
-        sup_model.reset()
-        for item in constraints:
-            if item.model is not sup_model:
-                raise ValueError('Models mismatch.')
-            sup_model.st(item)
-
+        self.obj_support = self.support_cache.formula(self.sup_model,
+                                                      constraints)
         self.obj = obj
-        self.obj_support = sup_model.do_math(primal=False, obj=False)
         self.sign = - 1
         self.pupdate = True
         self.dupdate = True
+        self.lowered = None
 
     def st(self, *arg):
         """
@@ -306,7 +327,8 @@ class Model:
                     self.st(item)
 
             elif isinstance(constr, (LinConstr, Bounds, CvxConstr,
-                                     ConeConstr, ExpConstr, KLConstr)):
+                                     ConeConstr, ExpConstr, KLConstr,
+                                     ConeBatch)):
                 if (constr.model is not self.rc_model) or \
                         (constr.model.mtype != 'R'):
                     raise ValueError('Models mismatch.')
@@ -365,21 +387,26 @@ class Model:
                 self.do_math(primal=True)
                 return self.rc_model.do_math(False, obj=True)
 
-        self.rc_model.reset()
-        if isinstance(self.obj, (Vars, VarSub, Affine, Convex, Real)):
-            self.rc_model.obj = self.obj
-            self.rc_model.sign = self.sign
-            more_roc = []
-        elif isinstance(self.obj, RoAffine):
-            obj_constr = (self.rc_model.vars[0] >= self.sign * self.obj)
-            obj_constr.support = self.obj_support
-            more_roc = [obj_constr]
+        if self.lowered is None:
+            self.rc_model.reset()
+            if isinstance(self.obj, (Vars, VarSub, Affine, Convex, Real)):
+                self.rc_model.obj = self.obj
+                self.rc_model.sign = self.sign
+                more_roc = []
+            elif isinstance(self.obj, RoAffine):
+                obj_constr = (self.rc_model.vars[0] >= self.sign * self.obj)
+                obj_constr.support = self.obj_support
+                more_roc = [obj_constr]
+            else:
+                raise TypeError('Incorrect type for the objective function.')
+            constrs = self.all_constr + more_roc
         else:
-            raise TypeError('Incorrect type for the objective function.')
+            constrs = self.all_constr[self.lowered:]
 
-        for constr in self.all_constr + more_roc:
+        for constr in constrs:
             if isinstance(constr, (LinConstr, Bounds, CvxConstr,
-                                   ExpConstr, KLConstr)):
+                                   ConeConstr, ExpConstr, KLConstr,
+                                   ConeBatch)):
                 self.rc_model.st(constr)
             if isinstance(constr, RoConstr):
                 if constr.support:
@@ -388,8 +415,11 @@ class Model:
                     rc_constrs = constr.le_to_rc(self.obj_support)
                 for rc_constr in rc_constrs:
                     self.rc_model.st(rc_constr)
+        self.lowered = len(self.all_constr)
 
-        formula = self.rc_model.do_math(primal, obj=True)
+        with phase('lowering') as record:
+            formula = self.rc_model.do_math(primal, obj=True)
+            record.output(formula)
 
         if primal:
             self.primal = formula
@@ -400,7 +430,9 @@ class Model:
 
         return formula
 
-    def solve(self, solver=None, display=True, params={}):
+    def solve(self, solver=None, display=True, params={},
+              warm_start=False, profile=False,
+              presolve=False):
         """
         Solve the model with the selected solver interface.
 
@@ -415,20 +447,54 @@ class Model:
             params : dict
                 A dictionary that specifies parameters of the selected solver.
                 So far the argument only applies to Gurobi and MOSEK.
+            warm_start : bool
+                Pass the previous solution, and the simplex basis if it is
+                available, to the solver as the starting point. So far the
+                argument only applies to Gurobi, CPLEX, MOSEK, and COPT.
+            profile : bool
+                Return a SolveReport of the time, allocated memory blocks,
+                and output sizes of the phases of the solve if profile=True.
+            presolve : bool
+                Reduce the formula by rsome.presolve before it is passed to
+                the solver if presolve=True. Only the primal solution is
+                restored, so the simplex basis is unavailable, and the
+                warm_start argument is ignored.
         """
 
-        if solver is None:
-            solution = def_sol(self.do_math(), display, params)
-        else:
-            solution = solver.solve(self.do_math(), display, params)
+        report = SolveReport() if profile else None
+        with profiling(report), phase('solve'):
+            with phase('do_math') as record:
+                formula = self.do_math()
+                record.output(formula)
+            if presolve:
+                with phase('presolve') as record:
+                    formula, postsolve = presolve_formula(formula)
+                    record.output(formula)
+                    warm_start = False
+            with phase('solver') as record:
+                if solver is None:
+                    solution = def_sol(formula, display, params)
+                elif warm_start and self.rc_model.solution is not None:
+                    solution = solver.solve(formula, display, params,
+                                            start=self.rc_model.start_point())
+                else:
+                    solution = solver.solve(formula, display, params)
+                record.split(solution)
+            if presolve:
+                solution = postsolve(solution)
 
         if isinstance(solution, Solution):
+            solution.layout = self.rc_model.layout()
             self.rc_model.solution = solution
         else:
             self.rc_model.solution = None
 
         self.solution = self.rc_model.solution
 
+        if report is not None:
+            report.solution = self.solution
+            return report
+
     def get(self):
         """
         Return the optimal objective value of the solved model.
@@ -0,0 +1,204 @@
+"""
+Module used for creating solver sessions that keep the native models of
+solvers alive between solves of RSOME models.
+
+Copyright 2020-2022 Peng Xiong, & Zhi Chen
+
+This file is a part of RSOME
+
+This file may be used under the terms of the GNU General Public License
+version 3 as published by the Free Software Foundation and appearing in
+the file LICENSE.GPL included in the packaging of this file.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from .lp import ConeList
+import numpy as np
+import warnings
+from typing import Any, Dict
+
+
+class SolverSession:
+    """
+    The SolverSession class keeps the native model of a solver alive
+    between solves, so that changes of the standard formula, such as new
+    variables, new rows and cones, and changed coefficients, right-hand
+    side values, objective coefficients and bounds, are applied to the
+    native model as deltas instead of loading the whole formula again.
+
+    Parameters
+    ----------
+    solver : module
+        Solver interface used for solving the formulas.
+
+    Notes
+    -----
+    A session can be passed to the solve method of a model in place of
+    the solver interface. Incremental updates are supported by the
+    Gurobi, MOSEK, CPLEX, and COPT interfaces. Other solver interfaces
+    load the formula on each solve, warm-started from the previous
+    solution, and a warning is given when the session is created.
+    """
+
+    def __init__(self, solver):
+
+        if getattr(solver, 'Session', None) is None:
+            warnings.warn('The solver interface does not support '
+                          'incremental updates, so the formula is loaded '
+                          'on each solve.')
+        self.solver = solver
+        self.native = None
+        self.previous = None
+        self.solution = None
+        self.loads = 0
+        self.updates = 0
+
+    def __repr__(self):
+
+        name = self.solver.__name__.split('.')[-1]
+        return 'Solver session of {}: {} load{}, {} update{}'.format(
+            name, self.loads, 's' if self.loads != 1 else '',
+            self.updates, 's' if self.updates != 1 else '')
+
+    def solve(self, formula, display=True, params={}, start=None):
+        """
+        Solve the standard formula with the native model of the session.
+
+        Parameters
+        ----------
+        formula : LinProg or SOCProg
+            The standard formula to be solved.
+        display : bool
+            Display option of the solver interface.
+        params : dict
+            A dictionary that specifies parameters of the solver.
+        start : Solution
+            Starting point of the solver interfaces without incremental
+            updates. The previous solution of the session is used if
+            start=None.
+
+        Returns
+        -------
+        solution : Solution
+            The solution of the formula.
+        """
+
+        session = getattr(self.solver, 'Session', None)
+        if session is None:
+            start = self.solution if start is None else start
+            solution = self.solver.solve(formula, display, params, start=start)
+            self.loads += 1
+        else:
+            native = self.native
+            delta = None
+            if native is not None:
+                delta = formula_delta(self.previous, formula)
+            if native is None or delta is None:
+                native = session(formula)
+                self.loads += 1
+            else:
+                native.update(formula, delta)
+                self.updates += 1
+            self.native = native
+            solution = native.solve(display, params)
+
+        self.previous = snapshot(formula)
+        self.solution = solution
+
+        return solution
+
+    def close(self):
+        """
+        Release the native model of the session.
+        """
+
+        self.native = None
+        self.previous = None
+
+
+def snapshot(formula):
+    """
+    Return a dictionary of the lowered rows, sizes, and vectors of the
+    standard formula used to find the changes of the formula in the
+    next solve.
+    """
+
+    pcoef = getattr(formula, 'pcoef', None)
+    if pcoef is None:
+        pcoef = np.zeros(0, dtype=int)
+
+    return {'lowered': getattr(formula, 'lowered', None),
+            'shape': formula.linear.shape,
+            'qmat': len(getattr(formula, 'qmat', ConeList())),
+            'xmat': len(getattr(formula, 'xmat', ConeList())),
+            'const': formula.const.copy(),
+            'lb': formula.lb.copy(),
+            'ub': formula.ub.copy(),
+            'obj': formula.obj.flatten(),
+            'coef': (pcoef, formula.linear.data[pcoef])}
+
+
+def formula_delta(previous, formula):
+    """
+    Return the changes of the standard formula relative to the snapshot
+    of the previous formula as a dictionary, or None if the changes
+    cannot be applied to the native model incrementally.
+
+    Notes
+    -----
+    The changes are found from the numbers of rows, columns, and cones
+    of the formulas, so the cost does not grow with the number of
+    coefficients. This requires both formulas to be lowered into the
+    same buffer of rows, where new rows, columns, and cones are only
+    appended and the coefficients of existing rows are only changed by
+    parameters. The formula is reloaded if the model is lowered from
+    scratch, or if the formula is not given by the do_math method of a
+    model. The right-hand side values, objective coefficients, and
+    bounds, which may be changed by parameters, are compared as vectors,
+    and coefficients are compared at the positions of the data array of
+    the coefficient matrix that depend on parameters. Changed
+    coefficients are given as arrays of rows, columns, and values.
+    """
+
+    lowered = getattr(formula, 'lowered', None)
+    if lowered is None or lowered is not previous['lowered']:
+        return None
+
+    m0, n0 = previous['shape']
+    m, n = formula.linear.shape
+    if m < m0 or n < n0:
+        return None
+
+    delta: Dict[str, Any] = {'shape': (m0, n0)}
+    for key in ['qmat', 'xmat']:
+        num = len(getattr(formula, key, ConeList()))
+        if num < previous[key]:
+            return None
+        delta[key] = previous[key]
+
+    lb, ub = formula.lb[:n0], formula.ub[:n0]
+    delta['bounds'] = np.flatnonzero((lb != previous['lb']) |
+                                     (ub != previous['ub']))
+    delta['obj'] = np.flatnonzero(formula.obj[0, :n0] != previous['obj'])
+    delta['rhs'] = np.flatnonzero(formula.const[:m0] != previous['const'])
+
+    pcoef, values = previous['coef']
+    current = getattr(formula, 'pcoef', None)
+    if current is None:
+        current = np.zeros(0, dtype=int)
+    current = current[current < formula.linear.indptr[m0]]
+    if current.size != pcoef.size or (current != pcoef).any():
+        return None
+    index = current[formula.linear.data[current] != values]
+    rows = np.searchsorted(formula.linear.indptr, index, side='right') - 1
+    delta['coef'] = (rows, formula.linear.indices[index],
+                     formula.linear.data[index])
+
+    return delta
@@ -19,13 +19,15 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 from .lp import Model as LPModel
-from .lp import LinConstr, Bounds, CvxConstr, ConeConstr
-from .lp import LinProg
+from .lp import LinConstr, Bounds, CvxConstr, ConeConstr, ConeBatch
+from .lp import LinProg, ConeList, sparse_table
+from .subroutines import LazyModule
 import numpy as np
-import pandas as pd
 import scipy.sparse as sp
 from collections.abc import Iterable
 
+pd = LazyModule('pandas')
+
 
 class Model(LPModel):
     """
@@ -48,6 +50,9 @@ class Model(LPModel):
         self.aux_constr = []
         self.aux_bounds = []
         self.cvx_constr = []
+        self.lowered = {}
+        self.pupdate = True
+        self.dupdate = True
 
     def st(self, constr):
         """
@@ -78,6 +83,12 @@ class Model(LPModel):
             if constr.model is not self:
                 raise ValueError('Constraints are not defined for this model.')
             self.cone_constr.append(constr)
+        elif isinstance(constr, ConeBatch):
+            if constr.model is not self:
+                raise ValueError('Constraints are not defined for this model.')
+            if constr.ctype != 'Q':
+                raise ValueError('Unsupported conic constraints.')
+            self.cone_constr.append(constr)
         else:
             raise TypeError('Unknown constraint type.')
 
@@ -112,19 +123,17 @@ class Model(LPModel):
                 return self.primal
 
             if refresh:
-                self.auxs = []
-                self.aux_constr = []
-                self.aux_bounds = []
-                self.last = self.vars[-1].first + self.vars[-1].size
+                self.lowered_counts()
+            lowered = self.lowered
 
             more_cvx = []
-            if self.obj is not None:
+            if self.obj is not None and not lowered.get('obj'):
                 obj_constr = (self.vars[0] - self.sign * self.obj >= 0)
                 if isinstance(obj_constr, CvxConstr):
                     more_cvx.append(obj_constr)
 
-            qmat = []
-            for constr in self.cvx_constr + more_cvx:
+            qmat = ConeList(lowered.get('qmat'))
+            for constr in self.cvx_constr[lowered.get('cvx', 0):] + more_cvx:
                 if constr.xtype == 'E':
                     aux_left = self.dvar(constr.affine_in.shape, aux=True)
                     aux_right = self.dvar(1, aux=True)
@@ -136,9 +145,9 @@ class Model(LPModel):
                         self.aux_bounds.append(bounds)
                     else:
                         self.aux_constr.append(bounds)
-                    qmat.append([aux_right.first] +
-                                list([aux_left.first + index
-                                      for index in range(aux_left.size)]))
+                    qmat.append(np.concatenate(([aux_right.first],
+                                                aux_left.first +
+                                                np.arange(aux_left.size))))
                 elif constr.xtype == 'S':
                     aux1 = self.dvar(constr.affine_out.shape, aux=True)
                     aux2 = self.dvar(constr.affine_in.shape, aux=True)
@@ -154,9 +163,10 @@ class Model(LPModel):
                         self.aux_bounds.append(bounds)
                     else:
                         self.aux_constr.append(bounds)
-                    for i in range(constr.affine_in.size):
-                        qmat.append([aux3.first + i] +
-                                    [aux1.first + i, aux2.first + i])
+                    index = np.arange(constr.affine_in.size)
+                    qmat.extend(np.stack((aux3.first + index,
+                                          aux1.first + index,
+                                          aux2.first + index), axis=1))
                 elif constr.xtype == 'Q':
                     # aux1 = self.dvar(constr.affine_out.shape, aux=True)
                     aux1 = self.dvar(1, aux=True)
@@ -179,15 +189,24 @@ class Model(LPModel):
                     qmat.append([aux3.first] + [aux1.first] +
                                 list(aux2.first + np.arange(aux2.size)))
 
-            for constr in self.cone_constr:
-                qmat.append([constr.right_var.first + constr.right_index] +
-                            [constr.left_var.first + index
-                             for index in constr.left_index])
+            for constr in self.cone_constr[lowered.get('cone', 0):]:
+                if isinstance(constr, ConeBatch):
+                    qmat.extend(constr.var.first + constr.indices)
+                else:
+                    qmat.append([constr.right_var.first + constr.right_index] +
+                                [constr.left_var.first + index
+                                 for index in constr.left_index])
+            lowered['cvx'] = len(self.cvx_constr)
+            lowered['cone'] = len(self.cone_constr)
+            lowered['qmat'] = qmat
 
             formula = super().do_math(primal=True, refresh=False, obj=obj)
             formula = SOCProg(formula.linear, formula.const, formula.sense,
                               formula.vtype, formula.ub, formula.lb,
                               qmat, formula.obj)
+            formula.lowered = lowered.get('rows')
+            if self.pmap is not None:
+                formula.pcoef = self.pmap['coef']
             self.primal = formula
             self.pupdate = False
 
@@ -206,26 +225,28 @@ class Model(LPModel):
                 self.dual = formula
                 return formula
 
-            eye_indices = [item for inner in primal.qmat for item in inner]
+            eye_indices = primal.qmat.indices
             eye_block = dual_lp.linear[eye_indices, :]
-            if len(eye_block.data) + 1 == len(eye_block.indptr):
-                lin_indices = [ind for ind in range(primal.linear.shape[1])
-                               if ind not in eye_indices]
-                linear = dual_lp.linear[lin_indices, :]
-                const = dual_lp.const[lin_indices]
-                sense = dual_lp.sense[lin_indices]
-                obj = dual_lp.obj
+            if (np.diff(eye_block.indptr) == 1).all():
+                lin_mask = np.ones(primal.linear.shape[1], dtype=bool)
+                lin_mask[eye_indices] = False
+                linear = dual_lp.linear[lin_mask, :]
+                const = dual_lp.const[lin_mask]
+                sense = dual_lp.sense[lin_mask]
+                obj = dual_lp.obj.copy()
                 vtype = dual_lp.vtype
-                ub = dual_lp.ub
-                lb = dual_lp.lb
-                qmat = []
-                for qc in primal.qmat:
-                    lbz_index = dual_lp.linear[qc[0], :].indices
-                    ub[lbz_index] = - lb[lbz_index]
-                    lb[lbz_index] = 0
-                    linear[:, lbz_index] = - linear[:, lbz_index]
-                    obj[lbz_index] = - obj[lbz_index]
-                    qmat.append(list(dual_lp.linear[qc, :].indices))
+                ub = dual_lp.ub.copy()
+                lb = dual_lp.lb.copy()
+                cone_cols = eye_block.indices
+                lbz_index = cone_cols[primal.qmat.offsets[:-1]]
+                ub[lbz_index] = - lb[lbz_index]
+                lb[lbz_index] = 0
+                obj[lbz_index] = - obj[lbz_index]
+                signs = np.ones(linear.shape[1])
+                signs[lbz_index] = -1
+                linear = sp.csr_matrix(linear @ sp.diags(signs))
+                qmat = ConeList.from_arrays(cone_cols,
+                                            primal.qmat.offsets.copy())
 
                 formula = SOCProg(linear, const, sense,
                                   vtype, ub, lb, qmat, obj)
@@ -246,18 +267,11 @@ class Model(LPModel):
 
                 ub = np.concatenate((dual_lp.ub, np.ones(extra_nvar)*np.infty))
                 extra_lb = - np.ones(extra_nvar)*np.infty
-                ind_pos = 0
-                for qc in primal.qmat:
-                    extra_lb[ind_pos] = 0
-                    ind_pos += len(qc)
+                extra_lb[primal.qmat.offsets[:-1]] = 0
                 lb = np.concatenate((dual_lp.lb, extra_lb))
 
-                qmat = []
-                ind_pos = 0
-                for qc in primal.qmat:
-                    qmat.append([ind_pos+num_constr] +
-                                [k+ind_pos+num_constr for k in range(1, len(qc))])
-                    ind_pos += len(qc)
+                qmat = ConeList.from_arrays(num_constr + np.arange(extra_nvar),
+                                            primal.qmat.offsets.copy())
 
                 formula = SOCProg(linear, const, sense,
                                   vtype, ub, lb, qmat, obj)
@@ -276,7 +290,7 @@ class SOCProg(LinProg):
     def __init__(self, linear, const, sense, vtype, ub, lb, qmat, obj=None):
 
         super().__init__(linear, const, sense, vtype, ub, lb, obj)
-        self.qmat = qmat
+        self.qmat = qmat if isinstance(qmat, ConeList) else ConeList(qmat)
 
     def __repr__(self):
 
@@ -288,29 +302,35 @@ class SOCProg(LinProg):
 
         return string
 
-    def showqc(self):
+    def showqc(self, rows=None):
+        """
+        Returns a pandas.DataFrame of second-order cone constraints, where
+        the coefficient of the variable on the right-hand side of each
+        cone is -1.
+
+        Parameters
+        ----------
+        rows : int, slice, or array_like
+            Indices of the selected cones. All cones and all variables are
+            shown if rows=None, otherwise only the variables involved in
+            the selected cones are shown, as columns of sparse arrays.
+        """
 
         n = len(self.qmat)
 
         if n == 0:
             return None
 
-        indices = np.concatenate([item for item in self.qmat])
-        values = np.concatenate([[-1.0] + [1.0]*(len(item)-1)
-                                 for item in self.qmat])
-        indptr = [0] * (n + 1)
-        for i in range(n):
-            indptr[i+1] = indptr[i] + len(self.qmat[i])
-
-        var_names = ['x{0}'.format(i)
-                     for i in range(1, self.linear.shape[1] + 1)]
-        constr_names = ['QC{0}'.format(j)
-                        for j in range(1, n + 1)]
-        table = pd.DataFrame(sp.csr_matrix((values, indices, indptr),
-                             (n, self.linear.shape[1])).todense(),
-                             index=constr_names, columns=var_names)
-        table['sense'] = ['<='] * n
-        table['constant'] = [0.0] * n
+        indices = self.qmat.indices
+        indptr = self.qmat.offsets
+        values = np.ones(indices.size)
+        values[indptr[:-1]] = -1.0
+
+        matrix = sp.csr_matrix((values, indices, indptr),
+                               (n, self.linear.shape[1]))
+        table, index = sparse_table(matrix, rows, 'QC')
+        table['sense'] = ['<='] * index.size
+        table['constant'] = [0.0] * index.size
 
         return table
 
@@ -338,17 +358,3 @@ class SOCProg(LinProg):
         table = pd.concat([table, ub, lb, vtype], axis=0)
 
         return table.fillna('-')
-
-    def lp_export(self):
-
-        string = super().lp_export()
-        index_st = string.find('Subject To')
-        s1 = string[:index_st+11]
-        s2 = string[index_st+11:]
-        sq = ''
-        for i, qc in enumerate(self.qmat):
-            sq += ' q{}: [ '.format(i+1)
-            sq += ' + '.join(['x{} ^2'.format(j+1) for j in qc[1:]])
-            sq += ' - x{} ^2 ] <= 0\n'.format(qc[0]+1)
-
-        return s1 + sq + s2
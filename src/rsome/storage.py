@@ -0,0 +1,158 @@
+"""
+Module used for saving compiled standard formulas of RSOME models as
+binary files and loading them back as memory-mapped arrays.
+
+Copyright 2020-2022 Peng Xiong, & Zhi Chen
+
+This file is a part of RSOME
+
+This file may be used under the terms of the GNU General Public License
+version 3 as published by the Free Software Foundation and appearing in
+the file LICENSE.GPL included in the packaging of this file.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from .lp import LinProg, ConeList
+from .socp import SOCProg
+from .gcp import GCProg
+from scipy.sparse import csr_matrix
+import numpy as np
+import json
+
+
+MAGIC = b'RSOMEFMT'
+ALIGN = 64
+
+
+def formula_arrays(formula):
+
+    linear = csr_matrix(formula.linear)
+    arrays = {'indptr': linear.indptr,
+              'indices': linear.indices,
+              'data': linear.data,
+              'const': np.asarray(formula.const),
+              'sense': np.asarray(formula.sense),
+              'ub': np.asarray(formula.ub),
+              'lb': np.asarray(formula.lb),
+              'vtype': np.asarray(formula.vtype).astype('U1')}
+    if formula.obj is not None:
+        arrays['obj'] = np.asarray(formula.obj)
+    if isinstance(formula, SOCProg):
+        arrays['qptr'] = formula.qmat.offsets.astype(int)
+        arrays['qind'] = formula.qmat.indices.astype(int)
+    if isinstance(formula, GCProg):
+        arrays['xmat'] = formula.xmat.indices.astype(int).reshape((-1, 3))
+
+    return linear.shape, arrays
+
+
+def save(formula, path):
+    """
+    Save the standard formula of a model as a binary file.
+
+    Parameters
+    ----------
+    formula : LinProg, SOCProg, or GCProg
+        Standard formula of a compiled model.
+    path : str
+        Path of the binary file.
+
+    Notes
+    -----
+    The file starts with a JSON header that records the type of the
+    formula and the dtypes, shapes, and offsets of its arrays, followed
+    by the raw data of the arrays, each aligned to 64 bytes.
+    """
+
+    shape, arrays = formula_arrays(formula)
+    items = {}
+    offset = 0
+    for name, array in arrays.items():
+        items[name] = {'dtype': array.dtype.str, 'shape': array.shape,
+                       'offset': offset}
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+
+    header = json.dumps({'type': type(formula).__name__,
+                         'shape': shape, 'arrays': items}).encode()
+    start = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(start + items[name]['offset'])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(start + offset)
+
+
+def load(path, mmap=True):
+    """
+    Load the standard formula saved as a binary file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the binary file.
+    mmap : bool
+        The arrays of the formula are memory-mapped to the file if
+        mmap=True, otherwise they are read into memory.
+
+    Returns
+    -------
+    formula : LinProg, SOCProg, or GCProg
+        The standard formula that can be solved by any solver interface.
+
+    Notes
+    -----
+    Memory-mapped arrays are copy-on-write, so solver interfaces that
+    modify the arrays of the formula never change the file.
+    """
+
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError('Not a file of RSOME formulas.')
+        size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(size).decode())
+        start = -(-(len(MAGIC) + 8 + size) // ALIGN) * ALIGN
+
+        arrays = {}
+        for name, item in header['arrays'].items():
+            dtype = np.dtype(item['dtype'])
+            shape = tuple(item['shape'])
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='c',
+                                         offset=start + item['offset'],
+                                         shape=shape)
+            else:
+                f.seek(start + item['offset'])
+                arrays[name] = np.fromfile(f, dtype=dtype,
+                                           count=int(np.prod(shape)))
+                arrays[name] = arrays[name].reshape(shape)
+
+    linear = csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                        shape=tuple(header['shape']), copy=False)
+    args = (linear, arrays['const'], arrays['sense'], arrays['vtype'],
+            arrays['ub'], arrays['lb'])
+    obj = arrays.get('obj')
+    if header['type'] == 'LinProg':
+        return LinProg(*args, obj)
+
+    qmat = ConeList.from_arrays(arrays['qind'], arrays['qptr'])
+    if header['type'] == 'SOCProg':
+        return SOCProg(*args, qmat, obj)
+
+    xmat = ConeList.from_arrays(arrays['xmat'].reshape(-1),
+                                np.arange(0, arrays['xmat'].size + 1, 3))
+    if header['type'] == 'GCProg':
+        return GCProg(*args, qmat, xmat, obj)
+
+    raise ValueError('Unknown type of formulas.')
@@ -20,10 +20,39 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import numpy as np
 import scipy.sparse as sp
+import hashlib
+import copy
+import importlib
 from numbers import Real
 from scipy.sparse import csr_matrix
 from collections.abc import Iterable
-from typing import List
+from typing import Dict, List
+
+
+class LazyModule:
+    """
+    The LazyModule class creates a proxy of a module, which is imported
+    on the first access of its attributes.
+    """
+
+    def __init__(self, name):
+
+        self.__name = name
+        self.__module = None
+
+    def __repr__(self):
+
+        state = 'loaded' if self.__module is not None else 'not loaded'
+        return 'Lazy module {} ({})'.format(self.__name, state)
+
+    def __getattr__(self, attr):
+
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        value = getattr(self.__module, attr)
+        setattr(self, attr, value)
+
+        return value
 
 
 def flat(a_list):
@@ -37,6 +66,59 @@ def flat(a_list):
     return flat_list
 
 
+def struct_digest(*items):
+    """
+    Return a digest of the content of the given objects. Arrays, sparse
+    matrices, and attributes of objects are visited recursively, while the
+    model references and names of objects are ignored.
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    visited: Dict[int, int] = {}
+
+    def visit(obj):
+        if obj is None or isinstance(obj, (Real, str, bool, np.generic)):
+            digest.update(repr((type(obj).__name__, obj)).encode())
+        elif isinstance(obj, np.ndarray):
+            digest.update(repr(('ndarray', obj.dtype.str,
+                                obj.shape)).encode())
+            if obj.dtype == object:
+                for item in obj.flat:
+                    visit(item)
+            else:
+                digest.update(np.ascontiguousarray(obj).tobytes())
+        elif sp.issparse(obj):
+            # Trailing zero columns are ignored, as the widths of linear
+            # coefficients grow with the number of variables of a model
+            obj = obj.tocsr()
+            digest.update(repr(('sparse', obj.shape[0])).encode())
+            for array in (obj.data, obj.indices, obj.indptr):
+                visit(array)
+        elif isinstance(obj, (list, tuple)):
+            digest.update(repr((type(obj).__name__, len(obj))).encode())
+            for item in obj:
+                visit(item)
+        elif hasattr(obj, '__dict__'):
+            if id(obj) in visited:
+                digest.update(repr(('visited', visited[id(obj)])).encode())
+                return
+            visited[id(obj)] = len(visited)
+            digest.update(type(obj).__name__.encode())
+            for key, value in sorted(vars(obj).items()):
+                if key.endswith('model') or key in ('top', 'name',
+                                                    'linear_cache'):
+                    continue
+                digest.update(key.encode())
+                visit(value)
+        else:
+            digest.update(repr(obj).encode())
+
+    for item in items:
+        visit(item)
+
+    return digest.hexdigest()
+
+
 def sparse_mul(ndarray, affine):
 
     array_ones = np.ones(ndarray.shape, dtype='int')
@@ -135,55 +217,61 @@ def sp_trans(affine):
     return csr_matrix((data, index, indptr), shape=[affine.size, affine.size])
 
 
-def index_array(shape):
+def sp_select(shape, item):
 
-    if isinstance(shape, tuple):
-        size = np.prod(shape)
-    else:
-        size = int(shape)
-        shape = int(shape),
+    size = int(np.prod(shape))
+    index = np.arange(size, dtype=int).reshape(shape)[item]
+    index = np.array(index).reshape(-1)
+    num = index.size
 
-    return np.arange(size, dtype=int).reshape(shape)
+    return csr_matrix((np.ones(num), index, np.arange(num + 1)),
+                      shape=(num, size))
 
 
-def array_to_sparse(array):
+def sp_sum(shape, axis=None):
 
-    size = array.size
-    all_items = list(array.reshape((size, )))
+    size = int(np.prod(shape))
+    ndim = len(shape)
+    if axis is None:
+        num = 1
+        row = np.zeros(size, dtype=int)
+    else:
+        axes = axis if isinstance(axis, tuple) else (axis, )
+        axes = tuple(sorted(int(ax) % ndim for ax in axes))
+        out_shape = tuple(dim for d, dim in enumerate(shape) if d not in axes)
+        num = int(np.prod(out_shape))
+        out_index = np.arange(num, dtype=int).reshape(out_shape)
+        row = np.broadcast_to(np.expand_dims(out_index, axes),
+                              shape).reshape(-1)
 
-    indices = np.concatenate(tuple(item.indices for item in all_items))
-    data = np.concatenate(tuple([item.data for item in all_items]))
-    indices = indices[data != 0]
-    data = data[data != 0]
+    return csr_matrix((np.ones(size), (row, np.arange(size))),
+                      shape=(num, size))
 
-    indptr = np.zeros(size+1)
-    for i in range(size):
-        indptr[1+i] = indptr[i] + all_items[i].count_nonzero()
 
-    return csr_matrix((data, indices, indptr), (size, all_items[0].shape[1]))
+def matmul_pairs(left_shape, right_shape):
 
+    left = np.arange(int(np.prod(left_shape)), dtype=int).reshape(left_shape)
+    right = np.arange(int(np.prod(right_shape)), dtype=int).reshape(right_shape)
+    left = left.reshape((1, left.size)) if left.ndim == 1 else left
+    right = right.reshape((right.size, 1)) if right.ndim == 1 else right
+    left, right = np.broadcast_arrays(left[..., :, :, None],
+                                      right[..., None, :, :])
+    inner = left.shape[-2]
+    left = np.moveaxis(left, -2, -1).reshape((-1, inner))
+    right = np.moveaxis(right, -2, -1).reshape((-1, inner))
 
-def sv_to_csr(array):
+    return left, right
 
-    if not isinstance(array, np.ndarray):
-        size = 1
-        all_items = [array]
-    else:
-        size = array.size
-        all_items = list(array.reshape((size, )))
 
-    indices = np.concatenate(tuple(item.index for item in all_items))
-    data = np.concatenate(tuple([item.value for item in all_items]))
-    nonzero = (data != 0)
-    indices = indices[nonzero]
-    data = data[nonzero]
+def index_array(shape):
 
-    indptr = np.zeros(size+1)
-    for i in range(size):
-        zero_counts = all_items[i].value.count(0)
-        indptr[1+i] = indptr[i] + len(all_items[i].value) - zero_counts
+    if isinstance(shape, tuple):
+        size = np.prod(shape)
+    else:
+        size = int(shape)
+        shape = int(shape),
 
-    return csr_matrix((data, indices, indptr), (size, all_items[0].nvar))
+    return np.arange(size, dtype=int).reshape(shape)
 
 
 def check_numeric(array):
@@ -216,14 +304,30 @@ def rso_broadcast(*args):
     return outputs
 
 
+def widen(matrix, width):
+    """
+    Return the sparse matrix padded with zero columns up to the given
+    width. The returned CSR matrix shares the data, indices, and indptr
+    arrays of the input matrix, which is left unchanged.
+    """
+
+    if matrix.shape[1] >= width:
+        return matrix
+
+    if sp.isspmatrix_csr(matrix):
+        matrix = copy.copy(matrix)
+    else:
+        matrix = matrix.tocsr()
+    matrix.resize((matrix.shape[0], width))
+
+    return matrix
+
+
 def add_linear(left, right):
 
-    if left.shape[1] > right.shape[1]:
-        right.resize((right.shape[0], left.shape[1]))
-    elif right.shape[1] > left.shape[1]:
-        left.resize((left.shape[0], right.shape[1]))
+    width = max(left.shape[1], right.shape[1])
 
-    return left + right
+    return widen(left, width) + widen(right, width)
 
 
 def event_dict(event_set):
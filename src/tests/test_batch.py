@@ -0,0 +1,129 @@
+import rsome as rso
+from rsome import ro
+from rsome import dro
+from rsome import batch
+from rsome import E
+from rsome import eco_solver as eco
+from rsome import ort_solver as ort
+from rsome import lp
+import numpy.random as rd
+import pytest
+import copy
+import os
+
+
+class Crash:
+
+    def __reduce__(self):
+
+        return os._exit, (1,)
+
+
+def ro_model(array):
+
+    n = array.size
+    model = ro.Model()
+    x = model.dvar(n)
+    z = model.rvar(n)
+    model.maxmin((array + z) @ x, rso.norm(z) <= 0.1)
+    model.st(x >= 0, x.sum() == 1)
+
+    return model, x
+
+
+def dro_model(array):
+
+    ns, n = array.shape
+    model = dro.Model(ns)
+    x = model.dvar(n)
+    z = model.rvar(n)
+    fset = model.ambiguity()
+    for s in range(ns):
+        fset[s].suppset(z == array[s])
+    pr = model.p
+    fset.probset(pr == 1/ns)
+    model.maxinf(E(z @ x), fset)
+    model.st(x >= 0, x.sum() == 1)
+
+    return model, x
+
+
+@pytest.mark.parametrize('workers', [1, 2, 3])
+def test_batch_solve(workers):
+
+    arrays = [rd.randn(4) for _ in range(5)]
+    models = [ro_model(array) for array in arrays]
+    solutions = batch.solve([m for m, _ in models], eco, workers=workers)
+    assert len(solutions) == len(models)
+
+    for array, (model, x) in zip(arrays, models):
+        ref, x_ref = ro_model(array)
+        ref.solve(eco)
+        assert abs(model.get() - ref.get()) < 1e-4
+        assert abs(x.get() - x_ref.get()).max() < 1e-4
+
+    arrays = [rd.rand(3, 4) for _ in range(3)]
+    models = [dro_model(array) for array in arrays]
+    batch.solve([m for m, _ in models], ort, workers=workers)
+    for array, (model, x) in zip(arrays, models):
+        ref, x_ref = dro_model(array)
+        ref.solve(ort)
+        assert abs(model.get() - ref.get()) < 1e-4
+
+
+def test_batch_errors():
+
+    model, x = ro_model(rd.randn(3))
+    with pytest.raises(ValueError):
+        batch.solve([model], eco, workers=0)
+
+    assert batch.solve([], eco) == []
+
+    with pytest.raises(TypeError):
+        batch.solve([model], eco.solve)
+
+
+def test_batch_failure():
+
+    models = [ro_model(rd.randn(4)) for _ in range(3)]
+    broken = copy.copy(models[1][0].do_math())
+    broken.const = broken.const[:-1]
+    models[1][0].do_math = lambda: broken
+
+    with pytest.warns(UserWarning):
+        solutions = batch.solve([m for m, _ in models], eco, workers=2)
+    assert isinstance(solutions[0], lp.Solution)
+    assert isinstance(solutions[1], Exception)
+    assert isinstance(solutions[2], lp.Solution)
+    assert models[1][0].solution is None
+    for model, x in models[::2]:
+        assert abs(x.get().sum() - 1) < 1e-4
+        items = model.solution.layout[0]
+        assert all(a is b for a, b in zip(items, model.rc_model.layout()[0]))
+
+
+def test_batch_crash():
+
+    models = [ro_model(rd.randn(4))[0] for _ in range(4)]
+    models[1].do_math = lambda: Crash()
+
+    with pytest.warns(UserWarning, match='exits unexpectedly'):
+        solutions = batch.solve(models, eco, workers=2)
+    assert isinstance(solutions[1], RuntimeError)
+    assert models[1].solution is None
+    for index in [0, 2, 3]:
+        assert isinstance(solutions[index], lp.Solution)
+        assert models[index].solution.layout is not None
+
+
+def test_batch_timeout():
+
+    arrays = [rd.randn(4), rd.randn(8000), rd.randn(4)]
+    models = [ro_model(array)[0] for array in arrays]
+
+    with pytest.warns(UserWarning, match='Time limit'):
+        solutions = batch.solve(models, eco, workers=1, timeout=0.05)
+    assert isinstance(solutions[0], lp.Solution)
+    assert isinstance(solutions[1], TimeoutError)
+    assert isinstance(solutions[2], lp.Solution)
+    assert models[1].solution is None
@@ -0,0 +1,71 @@
+import rsome as rso
+from rsome import ro
+from rsome import lp
+from rsome import eco_solver as eco
+from rsome import grb_solver as grb
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('sizes', [
+    [3], [2, 4, 3], [5, 1, 5, 2, 5]
+])
+def test_cone_list(sizes):
+
+    cones = [list(range(10*i, 10*i + size)) for i, size in enumerate(sizes)]
+    qmat = lp.ConeList(cones)
+
+    assert len(qmat) == len(cones)
+    assert (qmat.sizes == sizes).all()
+    assert qmat.offsets[-1] == qmat.indices.size == sum(sizes)
+    for cone, target in zip(qmat, cones):
+        assert (cone == target).all()
+    assert (qmat[-1] == cones[-1]).all()
+    assert [list(cone) for cone in qmat[1:]] == cones[1:]
+    assert [list(cone) for cone in qmat[::2]] == cones[::2]
+
+    qmat.append([100, 101])
+    qmat.extend(np.arange(6).reshape((2, 3)) + 200)
+    qmat.extend(lp.ConeList([[300]]))
+    assert len(qmat) == len(cones) + 4
+    assert list(qmat[-3]) == [200, 201, 202]
+    assert list(qmat[-1]) == [300]
+
+    groups = qmat.groups()
+    rows = [tuple(row) for size, group in groups.items() for row in group
+            if group.shape[1] == size]
+    assert sorted(rows) == sorted(tuple(cone) for cone in qmat)
+
+    copy = qmat.copy()
+    copy.append([0])
+    assert len(copy) == len(qmat) + 1
+    with pytest.raises(IndexError):
+        qmat[len(qmat)]
+
+
+@pytest.mark.parametrize('m, n', [
+    (1, 3), (8, 4), (20, 6)
+])
+def test_cone_list_model(m, n):
+
+    a = np.sin(np.arange(m*n)).reshape((m, n))
+    b = 1 + np.cos(np.arange(m))**2
+    c = np.cos(np.arange(n))
+
+    model = ro.Model()
+    x = model.dvar(n)
+    z = model.rvar(n)
+    model.max(c @ x)
+    model.st(rso.norm(x, 2) <= 1)
+    for i in range(m):
+        model.st((a[i] @ x + z @ x <= b[i]).forall(rso.norm(z, 2) <= 0.1))
+    formula = model.do_math()
+
+    assert isinstance(formula.qmat, lp.ConeList)
+    assert len(formula.qmat) == m + 1
+    assert formula.showqc().shape == (m + 1, formula.linear.shape[1] + 2)
+
+    model.solve(eco)
+    obj_eco = model.get()
+    model.solve(grb)
+    assert abs(obj_eco - model.get()) < 1e-4
@@ -126,6 +126,132 @@ def test_kl_prob(array, r):
     assert abs(m1.get() - m2.get()) < 1e-5
 
 
+@pytest.mark.parametrize('array, ub', [
+    (rd.rand(3, 5), 3.0),
+    (rd.rand(5, 2), 1.0),
+])
+def test_model_incremental(array, ub):
+
+    ns, n = array.shape
+
+    def build(model):
+        x = model.dvar(n)
+        z = model.rvar(n)
+        fset = model.ambiguity()
+        for s in range(ns):
+            fset[s].suppset(z == array[s])
+        pr = model.p
+        fset.probset(pr == 1/ns)
+        model.maxinf(E(z @ x), fset)
+        model.st(x >= 0)
+        return x, z
+
+    m1 = dro.Model(ns)
+    x1, z1 = build(m1)
+    m1.st(x1 <= 1)
+    m1.solve(grb)
+    m1.st(x1.sum() <= ub)
+    m1.solve(grb)
+
+    m2 = dro.Model(ns)
+    x2, z2 = build(m2)
+    m2.st(x2 <= 1)
+    m2.st(x2.sum() <= ub)
+    m2.solve(grb)
+
+    assert abs(m1.get() - m2.get()) < 1e-4
+    assert (abs(x1.get() - x2.get()) < 1e-4).all()
+
+
+@pytest.mark.parametrize('ns, n', [(1, 2), (4, 3)])
+def test_model_param(ns, n):
+
+    dhat = 1 + 4*np.abs(np.sin(np.arange(ns*n))).reshape((ns, n))
+
+    def build(model, c, p):
+        d = model.rvar(n)
+        u = model.rvar(n)
+        x = model.dvar(n)
+        y = model.dvar(n)
+        y.adapt(d)
+        y.adapt(u)
+        for s in range(ns):
+            y.adapt(s)
+        fset = model.ambiguity()
+        for s in range(ns):
+            fset[s].suppset(d >= 0, abs(d - dhat[s]) <= u, u <= 1)
+            fset[s].exptset(E(u) <= 0.5)
+        fset.probset(model.p == 1/ns)
+        model.minsup(E(c @ x - p @ y), fset)
+        model.st([y <= x, y <= d, y >= 0, x.sum() <= 2*n])
+        return x
+
+    m1 = dro.Model(ns)
+    c = m1.param(n)
+    p = m1.param(n, value=2)
+    x1 = build(m1, c, p)
+
+    for step in range(3):
+        cost = 0.5 + np.cos(np.arange(n) + step)**2
+        price = cost + 1 + step
+        c.set(cost)
+        p.set(price)
+        m1.solve(grb)
+        primal = m1.do_math()
+
+        m2 = dro.Model(ns)
+        x2 = build(m2, cost, price)
+        m2.solve(grb)
+
+        assert abs(m1.get() - m2.get()) < 1e-4
+        assert (abs(x1.get() - x2.get()) < 1e-4).all()
+
+    c.set(np.ones(n))
+    assert m1.do_math() is primal
+    assert abs(c.get() - 1).max() == 0
+    with pytest.raises(TypeError):
+        c.adapt(0)
+
+
+@pytest.mark.parametrize('ns, n, m', [
+    (1, 3, 1), (6, 3, 4), (10, 2, 5)
+])
+def test_model_scen_support(ns, n, m):
+
+    array = np.sin(np.arange(ns*n)).reshape((ns, n))
+    coef = 1 + np.cos(np.arange(m*n)).reshape((m, n))**2
+    r = 0.2
+
+    m1 = dro.Model(ns)
+    x1 = m1.dvar((m, n))
+    z1 = m1.rvar(n)
+    fset = m1.ambiguity()
+    for s in range(ns):
+        fset[s].suppset(abs(z1 - array[s]) <= r)
+    fset.probset(m1.p == 1/ns)
+    m1.max(x1.sum())
+    m1.st((E((coef * x1) @ z1) <= 1 + np.arange(m)).forall(fset))
+    m1.st(x1 >= 0, x1 <= 5)
+    m1.solve(grb)
+
+    m2 = ro.Model()
+    x2 = m2.dvar((m, n))
+    t = m2.dvar((m, ns))
+    z2 = m2.rvar(n)
+    m2.max(x2.sum())
+    for s in range(ns):
+        m2.st(((coef * x2) @ z2 <= t[:, s]).forall(abs(z2 - array[s]) <= r))
+    m2.st(t.sum(axis=1) * (1/ns) <= 1 + np.arange(m))
+    m2.st(x2 >= 0, x2 <= 5)
+    m2.solve(grb)
+
+    assert abs(m1.get() - m2.get()) < 1e-4
+    assert (abs(x1.get() - x2.get()) < 1e-4).all()
+
+    fset.suppset(abs(z1) <= r)
+    assert fset.scen_support(0) is fset.scen_support(ns - 1)
+
+
 def test_model_match():
 
     m1, m2 = dro.Model(name='1st model'), dro.Model(name='2nd model')
@@ -0,0 +1,27 @@
+from rsome.subroutines import LazyModule
+import subprocess
+import sys
+import pytest
+
+
+@pytest.mark.parametrize('module', ['rsome', 'rsome.ro', 'rsome.dro'])
+def test_lazy_import(module):
+
+    script = ('import sys\n'
+              'import {}\n'
+              'print(\'pandas\' in sys.modules, '
+              '\'scipy.optimize\' in sys.modules)').format(module)
+    output = subprocess.run([sys.executable, '-c', script],
+                            capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ['False', 'False']
+
+
+def test_lazy_module():
+
+    module = LazyModule('json')
+    assert 'not loaded' in repr(module)
+    assert module.loads('[1, 2]') == [1, 2]
+    assert 'loaded' in repr(module) and 'not' not in repr(module)
+
+    with pytest.raises(AttributeError):
+        module.undefined_attribute
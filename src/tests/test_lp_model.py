@@ -1,7 +1,9 @@
 from rsome import lp
 from rsome import grb_solver as grb
+from rsome import ort_solver as ort
 import rsome as rso
 import numpy as np
+import gurobipy as gp
 import pandas as pd
 import pytest
 
@@ -87,6 +89,137 @@ def test_model():
         model.max(3*x + 5*y)
 
 
+@pytest.mark.parametrize('demand, cap', [
+    (np.array([2.0, 3.5, 1.0]), 5.0),
+    (np.array([4.0, 0.0, 2.5, 1.0]), 10.0),
+    (np.arange(6) * 0.5, 2.0),
+])
+def test_model_param(demand, cap):
+
+    n = demand.size
+
+    def build(model, d, c):
+        x = model.dvar(n)
+        y = model.dvar(n)
+        model.min(1.5*x.sum() + 2*y.sum() - d.sum())
+        model.st([y >= d - x, y >= 0, x >= 0, x.sum() <= c])
+        return x, y
+
+    m1 = lp.Model()
+    d = m1.param(n, name='d')
+    c = m1.param(name='c')
+    x1, y1 = build(m1, d, c)
+    m1.solve(grb)
+    primal = m1.do_math()
+
+    d.set(demand)
+    c.set(cap)
+    assert m1.do_math() is primal
+    m1.solve(grb)
+
+    m2 = lp.Model()
+    x2, y2 = build(m2, demand, cap)
+    m2.solve(grb)
+
+    assert abs(m1.get() - m2.get()) < 1e-6
+    assert abs(d.get() - demand).max() < 1e-12
+    assert abs((x1.get() + y1.get()) - (x2.get() + y2.get())).max() < 1e-6
+
+    with pytest.raises(ValueError):
+        d.set(np.ones(n + 1))
+
+
+@pytest.mark.parametrize('m, n', [(3, 4), (6, 2), (1, 8)])
+def test_model_param_coef(m, n):
+
+    def build(model, a, b, c, q):
+        x = model.dvar(n)
+        y = model.dvar(m)
+        model.min(c @ x + (x @ q).sum() + y.sum())
+        model.st([a @ x + y >= b, (a * x).sum(axis=0) <= 5,
+                  x >= 0, y >= 0, x <= 3])
+        return x
+
+    m1 = lp.Model()
+    a, b = m1.param((m, n)), m1.param(m)
+    c, q = m1.param(n), m1.param((n, m))
+    x1 = build(m1, a, b, c, q)
+    m1.solve(grb)
+    primal = m1.do_math()
+
+    rd = np.random.RandomState(m*n)
+    for step in range(3):
+        values = (rd.rand(m, n), 3*rd.rand(m),
+                  rd.rand(n) - 0.3, rd.rand(n, m) - 0.5)
+        for param, value in zip((a, b, c, q), values):
+            param.set(value)
+        assert m1.do_math() is primal
+        m1.solve(grb)
+
+        m2 = lp.Model()
+        x2 = build(m2, *values)
+        m2.solve(grb)
+
+        assert abs(m1.get() - m2.get()) < 1e-6
+        assert abs(x1.get() - x2.get()).max() < 1e-6
+
+    with pytest.raises(TypeError):
+        a @ x1 @ x1
+    with pytest.raises(TypeError):
+        x1 * (c * x1)
+
+
+@pytest.mark.parametrize('n, vtype', [
+    (5, 'C'), (30, 'C'), (5, 'I'), (20, 'B')
+])
+def test_model_ort(n, vtype):
+
+    c = 1 + np.sin(np.arange(n))**2
+    a = 1 + np.cos(np.arange(n))**2
+
+    model = lp.Model()
+    x = model.dvar(n, vtype=vtype)
+    y = model.dvar()
+    model.max(c @ x - y)
+    model.st(a @ x <= n/3)
+    model.st(y == x[0] + x[-1])
+    model.st([x <= 4, x >= -1])
+
+    model.solve(grb)
+    objval = model.get()
+    x_grb = x.get()
+
+    model.solve(ort)
+    assert abs(model.get() - objval) < 1e-4
+    assert (abs(x.get() - x_grb) < 1e-4).all()
+    if vtype != 'C':
+        assert (abs(x.get() - x.get().round()) < 1e-6).all()
+
+
+@pytest.mark.parametrize('ext', ['lp', 'mps'])
+def test_model_export(ext, tmp_path):
+
+    model = lp.Model()
+    x = model.dvar(5)
+    y = model.dvar(3, vtype='I')
+    z = model.dvar(2, vtype='B')
+    model.max(np.arange(5) @ x - y.sum() + z.sum())
+    model.st([x <= np.arange(5), x >= -1, y.sum() <= 7.5,
+              x.sum() + z.sum() == 1, abs(y) <= 3])
+    model.solve(grb)
+
+    name = str(tmp_path / 'model')
+    formula = model.do_math()
+    if ext == 'lp':
+        formula.to_lp(name)
+    else:
+        formula.to_mps(name)
+    gmodel = gp.read(name + '.' + ext)
+    gmodel.setParam('OutputFlag', 0)
+    gmodel.optimize()
+    assert abs(gmodel.ObjVal - model.solution.objval) < 1e-6
+
+
 def test_model_match():
 
     m1, m2 = lp.Model('1st model'), lp.Model('2nd model')
@@ -114,3 +247,52 @@ def test_model_match():
 
     with pytest.raises(TypeError):
         m1.st(rso.norm(x1) <= 1)
+
+
+@pytest.mark.parametrize('n, steps', [(3, 2), (6, 5), (10, 12)])
+def test_model_append_rows(n, steps):
+
+    a = np.sin(np.arange(n)) + 2
+    b = np.cos(np.arange(n))
+    model = lp.Model()
+    x = model.dvar(n)
+    model.min(a @ x)
+    model.st(x >= 1)
+
+    formulas = []
+    for step in range(steps):
+        formulas.append(model.do_math())
+        y = model.dvar(n)
+        model.st([y >= b + step, x >= y])
+
+    primal = model.do_math()
+    assert primal.linear.shape == (1 + steps*n, model.last)
+    for formula in formulas:
+        num_rows, width = formula.linear.shape
+        assert (primal.linear[:num_rows, :width] != formula.linear).nnz == 0
+        assert (primal.const[:num_rows] == formula.const).all()
+    model.solve(grb)
+    assert abs(model.get() - a @ np.maximum(1, b + steps - 1)) < 1e-6
+
+
+@pytest.mark.parametrize('n', [4, 15])
+def test_model_dual_neg(n):
+
+    a = np.sin(np.arange(n)) + 0.5
+    b = np.cos(np.arange(n))
+    model = lp.Model()
+    x = model.dvar(n)
+    y = model.dvar(n)
+    model.min(a @ x + b @ y)
+    model.st([x >= -1, y <= 0, y >= -2, x - y <= 3, x.sum() + y.sum() >= -n])
+
+    primal = model.do_math()
+    assert (primal.ub == 0).sum() == n
+    dual = model.do_math(primal=False)
+    assert dual.linear.shape[0] == primal.linear.shape[1]
+
+    model.solve(grb, display=False)
+    primal_sol = primal.solve(grb)
+    dual_sol = dual.solve(grb)
+    assert abs(primal_sol.objval - model.get()) < 1e-6
+    assert abs(dual_sol.objval + model.get()) < 1e-6
@@ -0,0 +1,181 @@
+import rsome as rso
+from rsome import lp
+from rsome import ro
+from rsome import dro
+from rsome import E
+from rsome import grb_solver as grb
+from rsome import eco_solver as eco
+import numpy as np
+import pytest
+import warnings
+
+
+def lp_model(n):
+
+    a = np.sin(np.arange(n)) + 1.5
+    model = lp.Model()
+    x = model.dvar(n)
+    y = model.dvar(n, vtype='I')
+    model.max(a @ x + y.sum())
+    model.st([x + 2*y <= 3 + a, x[0] == 0.5, x <= 4, x <= 4])
+    model.st([y >= 0, x - y >= -1, 2*x.sum() <= 5*n])
+
+    return model, grb
+
+
+def socp_model(n):
+
+    a = np.sin(np.arange(n))
+    model = ro.Model()
+    x = model.dvar(n)
+    z = model.rvar(n)
+    model.min(x.sum())
+    model.st((x@z + a@x >= 1).forall(rso.norm(z) <= 0.5))
+    model.st(x >= 0, x[0] == 0.2)
+
+    return model, eco
+
+
+def gcp_model(n):
+
+    a = 1 + np.cos(np.arange(n))**2
+    model = ro.Model()
+    x = model.dvar(n)
+    y = model.dvar(n)
+    model.max(x.sum() - y.sum())
+    model.st(rso.exp(x) <= y, y == 2*x + a, x <= a)
+
+    return model, eco
+
+
+def dro_model(n):
+
+    ns = 4
+    d = 1 + np.sin(np.arange(ns*n)).reshape((ns, n))**2
+    model = dro.Model(ns)
+    x = model.dvar(n)
+    z = model.rvar(n)
+    fset = model.ambiguity()
+    for s in range(ns):
+        fset[s].suppset(z == d[s])
+    pr = model.p
+    fset.probset(pr == 1/ns)
+    model.minsup(E(-z @ x) + x.sum() * 0.5, fset)
+    model.st(x >= 0, x <= 1)
+
+    return model, eco
+
+
+@pytest.mark.parametrize('build, n', [
+    (lp_model, 5), (lp_model, 20),
+    (socp_model, 3), (socp_model, 10),
+    (gcp_model, 4), (gcp_model, 12),
+    (dro_model, 3), (dro_model, 8),
+])
+def test_presolve(build, n):
+
+    model, solver = build(n)
+    formula = model.do_math()
+    solution = formula.solve(solver)
+
+    reduced, postsolve = rso.presolve(formula)
+    assert reduced.linear.shape[0] < formula.linear.shape[0]
+    assert reduced.linear.shape[1] <= formula.linear.shape[1]
+    assert type(reduced) is type(formula)
+    assert 'rows' in repr(postsolve)
+
+    restored = postsolve(reduced.solve(solver))
+    assert abs(restored.objval - solution.objval) < 1e-4
+
+    x = restored.x
+    assert x.size == formula.linear.shape[1]
+    assert abs(formula.obj @ x - solution.objval) < 1e-4
+    lhs = formula.linear @ x - formula.const
+    assert (lhs[formula.sense == 0] <= 1e-5).all()
+    assert (abs(lhs[formula.sense == 1]) <= 1e-5).all()
+    assert (x >= formula.lb - 1e-5).all()
+    assert (x <= formula.ub + 1e-5).all()
+    for cone in getattr(formula, 'qmat', []):
+        assert (x[cone[1:]]**2).sum()**0.5 <= x[cone[0]] + 1e-5
+
+
+def test_presolve_infeasible():
+
+    model = lp.Model()
+    x = model.dvar(3)
+    model.min(x.sum())
+    model.st([x >= 1, x[0] <= 0.5])
+    formula = model.do_math()
+
+    reduced, postsolve = rso.presolve(formula)
+    with pytest.warns(UserWarning):
+        assert postsolve(reduced.solve(grb)) is None
+
+    model = lp.Model()
+    x = model.dvar(2, vtype='I')
+    model.min(x[0] - x[1])
+    model.st([-3*x[0] <= -1, -2*x[0] == 2, x <= 5, x >= -5])
+    formula = model.do_math()
+
+    reduced, postsolve = rso.presolve(formula)
+    assert postsolve.infeasible
+    with pytest.warns(UserWarning):
+        assert postsolve(grb.solve(reduced, display=False)) is None
+
+
+def random_model(seed):
+
+    rd = np.random.RandomState(seed)
+    n, m = rd.randint(2, 6), rd.randint(2, 8)
+    model = lp.Model()
+    x = model.dvar(n, vtype=''.join(rd.choice(['C', 'I'], n)))
+    model.min(rd.randint(-3, 4, n) @ x)
+    model.st([x <= 5, x >= -5])
+    for _ in range(m):
+        k = rd.randint(1, 3)
+        index = rd.choice(n, k, replace=False)
+        a = rd.randint(-3, 4, k)
+        a[a == 0] = 1
+        b = rd.randint(-3, 4)
+        expr = a @ x[index]
+        model.st(expr == b if rd.rand() < 0.3 else expr <= b)
+
+    return model.do_math()
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_presolve_random(seed):
+
+    formula = random_model(seed)
+    solution = grb.solve(formula, display=False)
+    reduced, postsolve = rso.presolve(formula)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        presolved = postsolve(grb.solve(reduced, display=False))
+
+    if solution is None:
+        assert presolved is None
+    else:
+        assert abs(presolved.objval - solution.objval) < 1e-6
+        x = presolved.x
+        lhs = formula.linear @ x - formula.const
+        assert (lhs[formula.sense == 0] <= 1e-6).all()
+        assert (abs(lhs[formula.sense == 1]) <= 1e-6).all()
+
+
+@pytest.mark.parametrize('build, n', [
+    (lp_model, 5), (socp_model, 3), (gcp_model, 4), (dro_model, 3),
+])
+def test_solve_presolve(build, n):
+
+    model, solver = build(n)
+    model.solve(solver, display=False)
+    objval = model.get()
+    num_var = len(model.solution.x)
+
+    model, solver = build(n)
+    report = model.solve(solver, display=False, warm_start=True,
+                         profile=True, presolve=True)
+    assert abs(model.get() - objval) < 1e-4
+    assert len(model.solution.x) == num_var
+    assert report['presolve'].rows < report['do_math'].rows
@@ -0,0 +1,100 @@
+import rsome as rso
+import rsome.report as rr
+from rsome import lp
+from rsome import ro
+from rsome import dro
+from rsome import E
+from rsome import eco_solver as eco
+import numpy as np
+import pytest
+
+
+def ro_model(n):
+
+    c = 1 + np.sin(np.arange(n))**2
+    model = ro.Model()
+    x = model.dvar(n)
+    z = model.rvar(n)
+    model.maxmin((c + 0.1*z) @ x, rso.norm(z, np.inf) <= 1)
+    model.st(x.sum() <= 1, x >= 0)
+
+    return model
+
+
+def dro_model(n):
+
+    S = 3
+    dhat = 1 + np.sin(np.arange(S*n)).reshape((S, n))**2
+    model = dro.Model(S)
+    d = model.rvar(n)
+    fset = model.ambiguity()
+    for s in range(S):
+        fset[s].suppset(d >= 0, d <= 3, rso.norm(d - dhat[s]) <= 0.2)
+    pr = model.p
+    fset.probset(pr == 1/S)
+    x = model.dvar(n)
+    y = model.dvar(n)
+    y.adapt(d)
+    for s in range(S):
+        y.adapt(s)
+    model.minsup(x.sum() + E(2*y.sum()), fset)
+    model.st(y >= d - x, y >= 0, x >= 0)
+
+    return model
+
+
+@pytest.mark.parametrize('build, n, phases', [
+    (ro_model, 3, ['le_to_rc', 'lowering']),
+    (ro_model, 10, ['le_to_rc', 'lowering']),
+    (dro_model, 4, ['rule_var', 'ro_to_roc', 'dro_to_roc', 'lowering'])
+])
+def test_solve_report(build, n, phases):
+
+    records = []
+    hook = (lambda report, record: records.append(record.name))
+    rr.subscribe(hook)
+    try:
+        model = build(n)
+        report = model.solve(eco, display=False, profile=True)
+    finally:
+        rr.unsubscribe(hook)
+
+    assert isinstance(report, rr.SolveReport)
+    assert report.solution is model.solution
+    for name in ['solve', 'do_math', 'solver', 'load', 'optimize'] + phases:
+        assert name in report
+        assert name in records
+        assert report[name].calls >= 1
+    assert records[-1] == 'solve'
+    assert 'unknown' not in report
+
+    formula = model.do_math()
+    record = report['do_math']
+    assert (record.rows, record.cols) == formula.linear.shape
+    assert record.nnz == formula.linear.nnz
+    assert record.cones == len(formula.qmat) + len(formula.xmat)
+    solver = report['solver']
+    assert report['load'].time + report['optimize'].time <= solver.time
+    assert abs(report.time - report['solve'].time) < 1e-12
+    assert report['solve'].time >= record.time + solver.time
+    assert 'optimize' in repr(report)
+    assert len(report.to_list()) == len(report.records)
+
+    objval = model.get()
+    assert model.solve(eco, display=False) is None
+    assert abs(model.get() - objval) < 1e-6
+
+
+def test_solve_report_lp():
+
+    model = lp.Model()
+    x = model.dvar(3)
+    model.max(x.sum())
+    model.st([x <= 1 + np.arange(3), x.sum() <= 4])
+
+    report = model.solve(display=False, profile=True)
+    assert abs(model.get() - 4) < 1e-6
+    assert report['do_math'].rows == model.do_math().linear.shape[0]
+    assert report.hooks == []
+    with pytest.raises(KeyError):
+        report['le_to_rc']
@@ -118,6 +118,41 @@ def test_array_mul(array1, array2, const, solver):
     assert (expr <= 0).__repr__() == f'{target.size} linear constraint{suffix}'
 
 
+@pytest.mark.parametrize('array, item, axis', [
+    (rd.rand(6), slice(1, None), None),
+    (rd.rand(6), [0, 3, 3], 0),
+    (rd.rand(3, 4), (slice(None), [0, 2]), 1),
+    (rd.rand(3, 4), (-1, ), None),
+    (rd.rand(2, 3, 4), (Ellipsis, slice(None, None, 2)), (0, 2)),
+    (rd.rand(2, 3, 4), (rd.rand(2, 3) > 0.5, ), -1),
+    (rd.rand(2, 3, 4), (1, slice(None), 3), None)
+])
+def test_array_index_sum(array, item, axis):
+    """
+    This function tests indexing and summation of affine expressions
+    """
+
+    target = (2*array + 1)[item].sum(axis=axis)
+
+    m = ro.Model()
+    a = m.dvar()
+    v = m.dvar(array.shape)
+    d = m.dvar(target.shape)
+
+    expr = (2*v + 1)[item].sum(axis=axis)
+    sub = v[item].sum(axis=axis)
+    m.min(a)
+    m.st(a >= abs(d))
+    m.st(d == expr - target)
+    m.st(v == array)
+    m.solve(ort)
+    assert abs(m.get()) < 1e-4
+    assert isinstance(expr, ro.Affine)
+    assert expr.shape == target.shape
+    assert sub.shape == target.shape
+    assert (2*sub.linear.toarray() == expr.linear.toarray()).all()
+
+
 @pytest.mark.parametrize('array1, array2, array3, const', [
     (rd.rand(7), rd.rand(7), rd.rand(7), 3.5),
     (rd.rand(3, 7), rd.rand(7), rd.rand(7), rd.rand(3, 1)),
@@ -400,3 +435,27 @@ def test_affine_errors():
 
     with pytest.raises(TypeError):
         x @ np.array(['C']*6)
+
+
+@pytest.mark.parametrize('shape, num_new', [
+    (4, 1), ((3, 5), 8), ((2, 2, 3), 20)
+])
+def test_add_widths(shape, num_new):
+
+    model = ro.Model()
+    x = model.dvar(shape)
+    a = np.sin(np.arange(np.prod(shape))).reshape(shape)
+    expr = 2*x + a
+    width = expr.linear.shape[1]
+
+    y = model.dvar(num_new)
+    z = model.dvar(shape)
+    total = expr + z
+    assert expr.linear.shape[1] == width
+    assert total.linear.shape[1] == width + num_new + z.size
+    assert (total.linear[:, width:width+num_new]).nnz == 0
+
+    model.min(y.sum() + total.sum())
+    model.st(x >= a, z >= -a, y >= 0)
+    model.solve(ort)
+    assert abs(model.get() - (3*a.sum() - a.sum())) < 1e-6
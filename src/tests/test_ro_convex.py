@@ -685,6 +685,35 @@ def test_kl_divergence(array, r):
     assert abs(primal_obj + dual_obj) < 1e-4
 
 
+@pytest.mark.parametrize('ns', [2, 50, 2000])
+def test_exp_block(ns):
+
+    a = 1 + np.sin(np.arange(ns))**2
+    phat = a / a.sum()
+    c = np.cos(np.arange(ns))
+
+    m = ro.Model()
+    x = m.dvar(ns)
+    y = m.dvar(ns)
+    z = m.dvar(ns)
+    p = m.dvar(ns)
+    m.max(c @ p + 3*x.sum() - y.sum())
+    m.st(rso.exp(x) <= y)
+    m.st(rso.log(z) >= x + 0.5, z == a)
+    m.st(p.kldiv(phat, 0.01))
+    m.st(p >= 0, p.sum() == 1)
+
+    formula = m.do_math()
+    assert len(formula.xmat) == 3*ns
+    assert len(m.rc_model.aux_constr) <= 12
+    m.solve(eco)
+
+    assert (abs(y.get() - np.exp(x.get())) < 1e-4).all()
+    assert (abs(x.get() - np.log(a) + 0.5) < 1e-4).all()
+    ps = p.get()
+    assert abs((ps * np.log(ps/phat)).sum() - 0.01) < 1e-4
+
+
 def test_convex_err():
 
     m1 = ro.Model()
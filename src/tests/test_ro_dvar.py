@@ -108,3 +108,33 @@ def test_dvar_array():
         print(y[3])
     with pytest.raises(IndexError):
         print(y[:, 0, 2, 0])
+
+
+@pytest.mark.parametrize('shape, num_new', [
+    (5, 1), ((3, 4), 6), ((2, 3, 2), 10)
+])
+def test_dvar_affine_cache(shape, num_new):
+
+    model = ro.Model()
+    x = model.dvar(shape)
+
+    first = x.to_affine()
+    second = x.to_affine()
+    assert second.linear is first.linear
+    assert second.const is not first.const
+
+    y = model.dvar(num_new)
+    third = x.to_affine()
+    assert third.linear is not first.linear
+    width = first.linear.shape[1]
+    assert third.linear.shape == (x.size, width + num_new)
+    assert (third.linear[:, :width] != first.linear).nnz == 0
+    assert third.linear[:, width:].nnz == 0
+
+    a = np.sin(np.arange(x.size)).reshape(x.shape)
+    b = np.cos(np.arange(num_new))
+    model.min((a*x).sum() + b@y)
+    model.st(x + 2*x >= a, x <= 2, y >= 0, y <= 1)
+    model.solve()
+    objval = np.where(a > 0, a**2/3, 2*a).sum() + np.minimum(b, 0).sum()
+    assert abs(model.get() - objval) < 1e-6
@@ -1,6 +1,7 @@
 import rsome as rso
 from rsome import ro
 from rsome import grb_solver as grb
+from rsome import eco_solver as eco
 import numpy as np
 import pandas as pd
 import numpy.random as rd
@@ -168,6 +169,171 @@ def test_model_ro():
         model.maxmin(z @ x, z == array)
 
 
+@pytest.mark.parametrize('array', [
+    np.linspace(-1, 1, 5),
+    np.linspace(0, 2, 8),
+    np.sin(np.arange(12)),
+])
+def test_model_incremental(array):
+
+    n = array.size
+
+    def build(model):
+        x = model.dvar(n)
+        z = model.rvar(n)
+        model.max(array @ x)
+        model.st(rso.norm(x) <= 1)
+        return x, z
+
+    m1 = ro.Model()
+    x1, z1 = build(m1)
+    m1.solve(eco)
+    m1.st(((z1 + 0.1) @ x1 <= 1).forall(rso.norm(z1) <= 0.5))
+    m1.st(rso.exp(x1.sum()) <= 2)
+    primal1 = m1.do_math()
+    m1.solve(eco)
+
+    m2 = ro.Model()
+    x2, z2 = build(m2)
+    m2.st(((z2 + 0.1) @ x2 <= 1).forall(rso.norm(z2) <= 0.5))
+    m2.st(rso.exp(x2.sum()) <= 2)
+    primal2 = m2.do_math()
+    m2.solve(eco)
+
+    assert primal1.linear.shape[0] == primal2.linear.shape[0]
+    assert len(primal1.qmat) == len(primal2.qmat)
+    assert len(primal1.xmat) == len(primal2.xmat)
+    assert abs(m1.get() - m2.get()) < 1e-4
+    assert (abs(x1.get() - x2.get()) < 1e-4).all()
+
+
+@pytest.mark.parametrize('array, r', [
+    (np.linspace(-1, 1, 5), 0.1),
+    (np.linspace(0, 2, 8), 0.5),
+    (np.sin(np.arange(12)), 0.2),
+])
+def test_model_param(array, r):
+
+    n = array.size
+
+    def build(model, c, b):
+        x = model.dvar(n)
+        z = model.rvar(n)
+        model.min(x.sum() + c.sum())
+        model.st(x >= c)
+        model.st((z @ x + b <= 2*n).forall(rso.norm(z) <= r))
+        return x
+
+    m1 = ro.Model()
+    c = m1.param(n)
+    b = m1.param()
+    x1 = build(m1, c, b)
+    m1.solve(grb)
+
+    c.set(array)
+    b.set(r)
+    m1.solve(grb)
+
+    m2 = ro.Model()
+    x2 = build(m2, array, r)
+    m2.solve(grb)
+
+    assert abs(m1.get() - m2.get()) < 1e-4
+    assert (abs(x1.get() - x2.get()) < 1e-4).all()
+
+
+@pytest.mark.parametrize('n, r', [(3, 0.5), (8, 0.2)])
+def test_model_param_coef(n, r):
+
+    def build(model, a, b):
+        x = model.dvar(n)
+        z = model.rvar(n)
+        model.max(a @ x)
+        model.st(((a * x) @ z + x.sum() <= b).forall(rso.norm(z) <= r))
+        model.st(x >= 0)
+        return x
+
+    m1 = ro.Model()
+    a = m1.param(n)
+    b = m1.param()
+    x1 = build(m1, a, b)
+
+    for step in range(3):
+        array = 0.5 + np.sin(np.arange(n) + step)**2
+        a.set(array)
+        b.set(step + 1)
+        m1.solve(grb)
+
+        m2 = ro.Model()
+        x2 = build(m2, array, step + 1)
+        m2.solve(grb)
+
+        assert abs(m1.get() - m2.get()) < 1e-4
+        assert (abs(x1.get() - x2.get()) < 1e-4).all()
+
+
+@pytest.mark.parametrize('m, n, r', [
+    (3, 4, 0.5),
+    (20, 6, 0.2),
+    (50, 3, 1.0),
+])
+@pytest.mark.parametrize('data', ['random', 'fixed'])
+def test_model_cone_support(m, n, r, data):
+
+    if data == 'random':
+        a = rd.rand(m, n)
+        b = rd.rand(m) + 1
+        c = rd.rand(n)
+    else:
+        a = 0.5 + 0.5*np.sin(np.arange(m*n)).reshape((m, n))**2
+        b = 1.5 + np.cos(np.arange(m))
+        c = 0.5 + 0.5*np.cos(np.arange(n))**2
+
+    m1 = ro.Model()
+    x = m1.dvar(n)
+    z = m1.rvar(n)
+    m1.max(c @ x)
+    m1.st(x >= 0)
+    m1.st((a @ x + z @ x <= b).forall(rso.norm(z) <= r))
+    m1.solve(eco)
+
+    m2 = ro.Model()
+    y = m2.dvar(n)
+    m2.max(c @ y)
+    m2.st(y >= 0)
+    m2.st(a @ y + r * rso.norm(y) <= b)
+    m2.solve(eco)
+
+    assert abs(m1.get() - m2.get()) < 1e-4
+    assert len(m1.do_math().qmat) == m
+
+    m1 = ro.Model()
+    x = m1.dvar(n)
+    z = m1.rvar(n)
+    m1.max(c @ x)
+    m1.st(x >= 0)
+    m1.st((a @ x + z @ x <= b).forall(rso.exp(z) <= 2, z >= -1))
+    m1.solve(eco)
+
+    m2 = ro.Model()
+    y = m2.dvar(n)
+    m2.max(c @ y)
+    m2.st(y >= 0)
+    m2.st(a @ y + np.log(2) * y.sum() <= b)
+    m2.solve(eco)
+
+    assert len(m1.do_math().xmat) == m * n
+    if m1.solution is not None:
+        assert abs(m1.get() - m2.get()) < 1e-4
+    else:
+        # With many rows whose dual cones sit at the apex, ECOS may stop
+        # on the primal counterpart with numerical problems. The same
+        # counterpart is then checked through its dual formula.
+        assert data == 'random'
+        solution = eco.solve(m1.do_math(primal=False), False)
+        assert abs(solution.objval - m2.get()) < 1e-4
+
+
 def test_model_match():
 
     m1, m2 = ro.Model('1st model'), ro.Model('2nd model')
@@ -0,0 +1,136 @@
+import rsome as rso
+from rsome import ro
+from rsome import socp
+from rsome import grb_solver as grb
+from rsome import eco_solver as eco
+import numpy as np
+import pytest
+
+
+def cutting_plane(solver, n, steps):
+
+    model = ro.Model()
+    x = model.dvar(n)
+    c = 1 + np.sin(np.arange(n))**2
+    model.max(c @ x)
+    model.st(x <= 1, x >= 0)
+    session = rso.SolverSession(solver)
+
+    objvals = []
+    for step in range(steps):
+        a = 1 + np.cos(np.arange(n) * (step + 1))**2
+        model.st(a @ x <= n/3)
+        if step % 3 == 2:
+            y = model.dvar(2)
+            model.st(y >= 0, y.sum() <= x[:2].sum())
+        model.solve(session, display=False)
+        objval = model.get()
+        model.solve(solver, display=False)
+        assert abs(objval - model.get()) < 1e-5
+        objvals.append(objval)
+
+    return session, objvals
+
+
+@pytest.mark.parametrize('solver, n, steps', [
+    (grb, 5, 3), (grb, 40, 10), (eco, 8, 4)
+])
+def test_session_cuts(solver, n, steps):
+
+    if solver is grb:
+        session, objvals = cutting_plane(solver, n, steps)
+    else:
+        with pytest.warns(UserWarning):
+            session, objvals = cutting_plane(solver, n, steps)
+    assert (np.diff(objvals) <= 1e-6).all()
+    if solver is grb:
+        assert session.loads == 1
+        assert session.updates == steps - 1
+    else:
+        assert session.loads == steps
+    assert 'session of' in repr(session)
+
+
+@pytest.mark.parametrize('n', [3, 20])
+def test_session_params(n):
+
+    model = socp.Model()
+    d = model.param(n)
+    w = model.param(n)
+    x = model.dvar(n)
+    y = model.dvar(n, vtype='I')
+    model.min(x.sum() + 0.1*y.sum())
+    model.st([x >= d - y, y <= 2, y >= 0, rso.norm(x - w) <= 1])
+    session = rso.SolverSession(grb)
+
+    for step in range(4):
+        d.set(np.sin(np.arange(n) + step)**2 + step/4)
+        w.set(np.cos(np.arange(n) * step)/n)
+        model.solve(session, display=False)
+        objval = model.get()
+        model.solve(grb, display=False)
+        assert abs(objval - model.get()) < 1e-4
+
+    assert session.loads == 1
+
+    model.st([x[0] <= 1.5, rso.norm(x[1:] - 1) <= n])
+    model.solve(session, display=False)
+    objval = model.get()
+    model.solve(grb, display=False)
+    assert abs(objval - model.get()) < 1e-4
+    assert session.updates == 4
+
+
+@pytest.mark.parametrize('n', [3, 20])
+def test_session_param_coef(n):
+
+    model = socp.Model()
+    c = model.param(n)
+    a = model.param(n)
+    x = model.dvar(n)
+    model.min(c @ x)
+    model.st([a * x >= 1, x <= 10, rso.norm(x) <= 5*n])
+    session = rso.SolverSession(grb)
+
+    for step in range(4):
+        c.set(1 + np.sin(np.arange(n) + step)**2)
+        a.set(0.5 + np.cos(np.arange(n) * step)**2)
+        model.solve(session, display=False)
+        objval = model.get()
+        model.solve(grb, display=False)
+        assert abs(objval - model.get()) < 1e-4
+
+    assert session.loads == 1
+    assert session.updates == 3
+
+
+def test_session_reload():
+
+    model = socp.Model()
+    x = model.dvar(4)
+    model.min(x.sum())
+    model.st([x >= 0, x.sum() >= 1])
+    session = rso.SolverSession(grb)
+    model.solve(session, display=False)
+
+    formula = model.do_math()
+    sense = formula.sense.copy()
+    sense[1] = 1 - sense[1]
+    changed = socp.SOCProg(formula.linear, formula.const, sense,
+                           formula.vtype, formula.ub, formula.lb,
+                           formula.qmat, formula.obj)
+    session.solve(changed, display=False)
+    assert session.loads == 2
+    assert formula.sense[1] != sense[1]
+
+    model.solve(session, display=False)
+    assert session.loads == 3
+
+    model.st([x[0] <= 0.5])
+    model.solve(session, display=False)
+    assert session.loads == 3
+    assert session.updates == 1
+
+    session.close()
+    session.solve(model.do_math(), display=False)
+    assert session.loads == 4
@@ -0,0 +1,118 @@
+import rsome as rso
+from rsome import gcp
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import pytest
+
+
+def build(n):
+
+    a = 1 + np.sin(np.arange(n))**2
+    model = gcp.Model()
+    x = model.dvar(n)
+    y = model.dvar(2)
+    model.min(a @ x + y.sum())
+    model.st([a @ x <= 4*n, x[:-1] - 0.5*x[1:] == a[1:],
+              rso.norm(x[:3]) <= 5, rso.norm(x[3:5]) <= 3,
+              rso.exp(y) <= 3*x[2], x <= 10, y >= -3])
+
+    return model.do_math()
+
+
+@pytest.mark.parametrize('n', [6, 200000])
+def test_formula_stats(n):
+
+    formula = build(n)
+    stats = formula.stats()
+    assert list(stats.index) == ['Obj', 'LC ==', 'LC <=', 'Bounds', 'QC', 'EC']
+    assert (stats.loc['LC ==', 'rows'] + stats.loc['LC <=', 'rows'] ==
+            formula.linear.shape[0])
+    assert stats['nnz'].iloc[1:3].sum() == formula.linear.nnz
+    assert stats.loc['QC', 'rows'] == len(formula.qmat)
+    assert stats.loc['QC', 'nnz'] == formula.qmat.indices.size
+    assert stats.loc['EC', 'rows'] == len(formula.xmat)
+    assert stats.loc['Bounds', 'max |const|'] == 10
+    assert stats.loc['LC <=', 'max |coef|'] == abs(formula.linear[
+        formula.sense == 0]).max()
+    assert formula.qmat.histogram() == {3: 1, 4: 1}
+
+    rows = slice(1, 3)
+    table = formula.showlc(rows)
+    cols = np.unique(formula.linear[rows].indices)
+    assert list(table.index) == ['LC2', 'LC3']
+    assert list(table.columns[:-2]) == ['x{0}'.format(j + 1) for j in cols]
+    assert table.shape[1] <= 6 + 2
+    assert abs(table.iloc[:, :-2].values.sum() -
+               formula.linear[rows].sum()) < 1e-8
+
+    table = formula.showqc([1])
+    assert list(table.index) == ['QC2']
+    assert table.shape == (1, 3 + 2)
+    table = formula.showec(-1)
+    assert list(table.index) == ['EC{0}'.format(len(formula.xmat))]
+    assert table.shape == (1, 3 + 2)
+
+
+def baseline_show(formula):
+
+    num_var = formula.linear.shape[1]
+    columns = ['x{0}'.format(j) for j in range(1, num_var + 1)]
+
+    def block(matrix, prefix, sense, const):
+
+        index = ['{0}{1}'.format(prefix, i)
+                 for i in range(1, matrix.shape[0] + 1)]
+        table = pd.DataFrame(matrix.todense(), index=index, columns=columns)
+        table['sense'] = sense
+        table['constant'] = const
+        return table
+
+    qmat, xmat = formula.qmat, formula.xmat
+    values = np.concatenate([[-1.0] + [1.0]*(len(item) - 1) for item in qmat])
+    qc = sp.csr_matrix((values, qmat.indices, qmat.offsets),
+                       (len(qmat), num_var))
+    ec = sp.csr_matrix(([1, 2, 3] * len(xmat), xmat.indices,
+                        range(0, 3*len(xmat) + 1, 3)), (len(xmat), num_var))
+    table = pd.concat([pd.DataFrame(formula.obj.reshape((1, -1)),
+                                    columns=columns, index=['Obj']),
+                       block(formula.linear, 'LC',
+                             ['==' if sense else '<='
+                              for sense in formula.sense], formula.const)],
+                      axis=0)
+    table = pd.concat([table, block(qc, 'QC', ['<='] * len(qmat),
+                                    [0.0] * len(qmat))], axis=0)
+    table = pd.concat([table, block(ec, 'EC', ['-'] * len(xmat),
+                                    ['-'] * len(xmat))], axis=0)
+    tables = [table] + [pd.DataFrame(values.reshape((1, -1)), columns=columns,
+                                     index=[name])
+                        for name, values in [('UB', formula.ub),
+                                             ('LB', formula.lb),
+                                             ('Type', formula.vtype)]]
+
+    return pd.concat(tables, axis=0).fillna('-')
+
+
+def test_show_baseline():
+
+    formula = build(8)
+    table = formula.show()
+    expected = baseline_show(formula)
+    pd.testing.assert_frame_equal(table, expected)
+    assert repr(table) == repr(expected)
+    assert (table.dtypes == object).all()
+    assert table.loc['LC1', 'x1'] == 0.0
+
+    table = formula.showlc()
+    assert table.shape == (formula.linear.shape[0],
+                           formula.linear.shape[1] + 2)
+    assert table['x1'].dtype == float
+    assert (table.iloc[:, :-2].values == formula.linear.toarray()).all()
+    assert formula.showqc().shape == (2, formula.linear.shape[1] + 2)
+
+    table = formula.showlc(range(formula.linear.shape[0]))
+    cols = np.unique(formula.linear.indices)
+    assert list(table.columns[:-2]) == ['x{0}'.format(j + 1) for j in cols]
+    assert isinstance(table.iloc[:, 0].dtype, pd.SparseDtype)
+    assert (table.iloc[:, :-2].sparse.to_coo().tocsr() !=
+            formula.linear[:, cols]).nnz == 0
@@ -1,7 +1,11 @@
 from rsome import socp
+from rsome import gcp
 from rsome import grb_solver as grb
+from rsome import eco_solver as eco
 import rsome as rso
 import numpy as np
+import gurobipy as gp
+import io
 import numpy.random as rd
 import pandas as pd
 import pytest
@@ -100,6 +104,101 @@ def test_socp_model():
     assert abs(dual_sol.objval - objval) < 1e-6
 
 
+@pytest.mark.parametrize('m, n', [
+    (1, 2), (5, 3), (12, 6)
+])
+def test_socp_cone_batch(m, n):
+
+    c = np.sin(np.arange(m*n)).reshape((m, n))
+
+    model = socp.Model()
+    x = model.dvar((m, n))
+    model.max((c*x).sum())
+    objval = 0
+    for i in range(m):
+        k = i % (n - 1) + 1
+        model.st(rso.norm(x[i, :k]) <= 1)
+        model.st(rso.norm(x[i, k:]) <= 2)
+        objval += (c[i, :k]**2).sum()**0.5 + 2*(c[i, k:]**2).sum()**0.5
+
+    model.solve(grb)
+    assert abs(model.get() - objval) < 1e-5
+
+
+@pytest.mark.parametrize('m, n, exp', [
+    (1, 3, False), (20, 4, False), (60, 3, False),
+    (1, 3, True), (20, 4, True), (60, 3, True)
+])
+def test_socp_dual(m, n, exp):
+
+    c = np.sin(np.arange(m*n)).reshape((m, n))
+    b = 1 + np.cos(np.arange(m))**2
+
+    model = gcp.Model()
+    x = model.dvar((m, n))
+    model.max((c*x).sum())
+    for i in range(m):
+        model.st(rso.norm(x[i]) <= b[i])
+    if exp:
+        y = model.dvar(m)
+        model.st(x.sum(axis=1) <= y)
+        model.st(rso.exp(y) <= 5 + b)
+
+    primal_obj = model.do_math().solve(eco).objval
+    dual = model.do_math(primal=False)
+    dual_obj = dual.solve(eco).objval
+    assert len(dual.qmat) == m
+    assert abs(primal_obj + dual_obj) < 1e-4
+
+
+@pytest.mark.parametrize('ext', ['lp', 'mps'])
+def test_socp_export(ext, tmp_path):
+
+    model = socp.Model()
+    x = model.dvar(6)
+    model.min(x.sum())
+    model.st([rso.norm(x[:3]) <= 1, rso.norm(x[3:]) <= 2.5, x[0] == 0.3])
+    model.solve(grb)
+
+    name = str(tmp_path / 'model')
+    formula = model.do_math()
+    if ext == 'lp':
+        formula.to_lp(name)
+    else:
+        formula.to_mps(name)
+    gmodel = gp.read(name + '.' + ext)
+    gmodel.setParam('OutputFlag', 0)
+    gmodel.optimize()
+    assert abs(gmodel.ObjVal - model.solution.objval) < 1e-6
+
+
+def test_cbf_export():
+
+    model = gcp.Model()
+    x = model.dvar(4)
+    y = model.dvar(2)
+    model.min(x.sum() + y.sum())
+    model.st([rso.norm(x[:2] - 1) <= 0.5, rso.exp(y) <= 3*x[2],
+              x[2] <= 4, x >= -2, y >= -3])
+
+    formula = model.do_math()
+    file = io.StringIO()
+    formula.write_cbf(file)
+    lines = file.getvalue().split('\n')
+
+    num_rows, num_domains = map(int, lines[lines.index('CON') + 1].split())
+    domains = lines[lines.index('CON') + 2:][:num_domains]
+    sizes = [int(item.split()[1]) for item in domains]
+    assert sum(sizes) == num_rows
+    assert sum([item.startswith('EXP') for item in domains]) == 2
+    assert sum([item.startswith('Q') for item in domains]) == 1
+
+    num_coords = int(lines[lines.index('ACOORD') + 1])
+    coords = lines[lines.index('ACOORD') + 2:][:num_coords]
+    assert all([0 <= int(item.split()[0]) < num_rows for item in coords])
+    assert lines[lines.index('ACOORD') + 2 + num_coords] == ''
+
+
 def test_model_match():
 
     m1, m2 = socp.Model('1st model'), socp.Model('2nd model')
@@ -0,0 +1,98 @@
+import rsome as rso
+from rsome import lp
+from rsome import socp
+from rsome import gcp
+from rsome import dro
+from rsome import E
+from rsome import grb_solver as grb
+from rsome import eco_solver as eco
+import numpy as np
+import pytest
+
+
+def lp_model():
+
+    model = lp.Model()
+    x = model.dvar(5)
+    y = model.dvar(3, vtype='I')
+    model.max(np.arange(5) @ x - y.sum())
+    model.st([x <= np.arange(5), x >= -1, y.sum() <= 7.5,
+              x.sum() + y.sum() == 1, abs(y) <= 3])
+
+    return model, grb
+
+
+def socp_model():
+
+    model = socp.Model()
+    x = model.dvar(6)
+    model.min(x.sum())
+    model.st([rso.norm(x[:3]) <= 1, rso.norm(x[3:]) <= 2.5, x[0] == 0.3])
+
+    return model, grb
+
+
+def gcp_model():
+
+    model = gcp.Model()
+    x = model.dvar(4)
+    y = model.dvar(2)
+    model.min(x.sum() + y.sum())
+    model.st([rso.norm(x[:2] - 1) <= 0.5, rso.exp(y) <= 3*x[2],
+              x[2] <= 4, x >= -2, y >= -3])
+
+    return model, eco
+
+
+def dro_model():
+
+    ns, n = 5, 3
+    data = np.sin(np.arange(ns*n)).reshape((ns, n))
+    model = dro.Model(ns)
+    x = model.dvar(n)
+    z = model.rvar(n)
+    fset = model.ambiguity()
+    for s in range(ns):
+        fset[s].suppset(abs(z - data[s]) <= 0.2)
+    fset.probset(model.p == 1/ns)
+    model.maxinf(E(z @ x), fset)
+    model.st(x >= 0, x.sum() == 1)
+
+    return model, grb
+
+
+@pytest.mark.parametrize('build', [lp_model, socp_model, gcp_model,
+                                   dro_model])
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load(build, mmap, tmp_path):
+
+    model, solver = build()
+    model.solve(solver)
+    formula = model.do_math()
+
+    path = str(tmp_path / 'formula.rso')
+    formula.save(path)
+    loaded = rso.load(path, mmap=mmap)
+
+    assert type(loaded) is type(formula)
+    assert (loaded.linear != formula.linear).nnz == 0
+    assert (loaded.const == formula.const).all()
+    assert (loaded.vtype == formula.vtype).all()
+    assert len(getattr(loaded, 'qmat', [])) == len(getattr(formula, 'qmat',
+                                                           []))
+    assert len(getattr(loaded, 'xmat', [])) == len(getattr(formula, 'xmat',
+                                                           []))
+
+    solution = solver.solve(loaded, display=False)
+    assert abs(solution.objval - model.solution.objval) < 1e-6
+
+    formula = rso.load(path, mmap=mmap)
+    assert (formula.ub == loaded.ub).all()
+
+
+def test_load_error(tmp_path):
+
+    path = tmp_path / 'formula.rso'
+    path.write_bytes(b'not a formula')
+    with pytest.raises(ValueError):
+        rso.load(str(path))
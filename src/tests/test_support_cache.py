@@ -0,0 +1,97 @@
+import rsome as rso
+from rsome import ro
+from rsome import lp
+from rsome import grb_solver as grb
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('m, n, r', [
+    (1, 3, 0.5), (10, 4, 0.2), (30, 5, 1.0)
+])
+def test_support_cache(m, n, r):
+
+    a = 0.5 + 0.5*np.sin(np.arange(m*n)).reshape((m, n))**2
+    b = 1.5 + np.cos(np.arange(m))
+    c = 0.5 + 0.5*np.cos(np.arange(n))**2
+
+    m1 = ro.Model()
+    cache = m1.support_cache
+    x = m1.dvar(n)
+    z = m1.rvar(n)
+    m1.max(c @ x)
+    m1.st(x >= 0)
+    for i in range(m):
+        m1.st((a[i] @ x + z @ x <= b[i]).forall(abs(z) <= r))
+    m1.solve(grb)
+
+    assert cache.misses == 1
+    assert cache.hits == m - 1
+
+    m2 = ro.Model()
+    y = m2.dvar(n)
+    m2.max(c @ y)
+    m2.st(y >= 0)
+    m2.st(a @ y + r * rso.norm(y, 1) <= b)
+    m2.solve(grb)
+
+    assert abs(m1.get() - m2.get()) < 1e-4
+
+    m1.st((x.sum() + z.sum() <= 10).forall(abs(z) <= 2*r))
+    assert cache.misses == 2
+
+
+def test_support_cache_lru():
+
+    cache = lp.SupportCache(maxsize=2)
+    model = ro.Model()
+    z = model.rvar(3)
+    sup_model = model.sup_model
+
+    f1 = cache.formula(sup_model, [abs(z) <= 1])
+    f2 = cache.formula(sup_model, [abs(z) <= 2])
+    assert cache.formula(sup_model, [abs(z) <= 1]) is f1
+    cache.formula(sup_model, [abs(z) <= 3])
+    assert len(cache) == 2
+    assert cache.formula(sup_model, [abs(z) <= 1]) is f1
+    assert cache.formula(sup_model, [abs(z) <= 2]) is not f2
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    other = ro.Model()
+    with pytest.raises(ValueError):
+        cache.formula(sup_model, [abs(other.rvar(3)) <= 1])
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_support_cache_models():
+
+    models = [ro.Model() for _ in range(2)]
+    formulas = []
+    for model in models:
+        x = model.dvar(3)
+        z = model.rvar(3)
+        model.min(x.sum())
+        constr = (z @ x >= 1).forall(abs(z) <= 0.5)
+        formulas.append(constr.support)
+        assert model.support_cache.misses == 1
+
+    assert formulas[0] is not formulas[1]
+
+    model = models[1]
+    cache = model.support_cache
+    (z @ x <= 1).forall(abs(z) <= 2)
+    support = abs(z) <= 0.5
+    constr = (z @ x <= 1).forall(support)
+    assert constr.support is formulas[1]
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert model.sup_model.pws_constr == [support]
+
+    cache.maxsize = 0
+    cache.clear()
+    (z @ x <= 1).forall(abs(z) <= 0.5)
+    (z @ x <= 1).forall(abs(z) <= 0.5)
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 2)
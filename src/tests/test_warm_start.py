@@ -0,0 +1,112 @@
+import rsome as rso
+from rsome import lp
+from rsome import ro
+from rsome.lp import start_values
+from rsome import grb_solver as grb
+from rsome import eco_solver as eco
+import numpy as np
+import pytest
+
+
+def build(n, vtype):
+
+    a = np.sin(np.arange(n)) + 2
+    model = ro.Model()
+    x = model.dvar(n, vtype=vtype)
+    d = model.dvar(n)
+    b = model.dvar()
+    model.max(a @ x - 0.1*d.sum() - b)
+    model.st(x.sum() <= n/5 + b, b <= 2, x <= 1, x >= 0, d >= x - 0.5, d >= 0)
+
+    return model, x
+
+
+@pytest.mark.parametrize('n, vtype, solver', [
+    (10, 'C', grb), (80, 'C', grb), (10, 'I', grb), (80, 'B', grb),
+    (10, 'C', eco), (80, 'C', eco)
+])
+def test_warm_start(n, vtype, solver):
+
+    model, x = build(n, vtype)
+    model.solve(solver, display=False, warm_start=True)
+    objval = model.get()
+    if solver is grb and vtype == 'C':
+        basis = model.solution.basis
+        assert basis['solver'] == 'rsome.grb_solver'
+        assert len(basis['col']) == model.do_math().linear.shape[1]
+
+    model.solve(solver, display=False, warm_start=True)
+    assert abs(model.get() - objval) < 1e-5
+
+    model.st(x[:n//2].sum() <= n/10)
+    y = model.dvar(3)
+    model.st(y <= x[:3], y >= 0)
+    model.solve(solver, display=False, warm_start=True)
+    warm_objval = model.get()
+
+    model.solve(solver, display=False)
+    assert abs(model.get() - warm_objval) < 1e-5
+    assert model.get() <= objval + 1e-5
+
+
+def test_start_point_rebuild():
+
+    n = 6
+    a = np.sin(np.arange(n)) + 2
+    model = ro.Model()
+    x = model.dvar(n)
+    model.max(a @ x)
+    model.st(rso.norm(x - 0.5, 1) <= 2, x <= 1, x >= 0)
+    model.solve(eco, display=False)
+    x_prev = x.get()
+    auxs = model.rc_model.auxs
+
+    model.reset()
+    model.st(rso.norm(x - 0.2, 1) <= 1.5, x <= 1, x >= 0)
+    formula = model.do_math()
+    assert model.rc_model.auxs[0].first == auxs[0].first
+
+    start = model.rc_model.start_point()
+    x0, basis = start_values(formula, start, 'rsome.cpx_solver')
+    assert x0.size == formula.linear.shape[1]
+    assert np.allclose(x0[x.first:x.last], x_prev)
+    assert np.isnan(x0[auxs[0].first:]).all()
+    assert basis is None
+
+    model.solve(grb, display=False, warm_start=True)
+    warm_objval = model.get()
+    model.solve(grb, display=False)
+    assert abs(model.get() - warm_objval) < 1e-5
+
+
+def test_warm_start_dual():
+
+    n = 8
+    a = np.sin(np.arange(n)) + 2
+    model = lp.Model()
+    x = model.dvar(n)
+    model.max(a @ x)
+    model.st([x <= 1, x >= 0, x.sum() <= n/2])
+    model.solve(grb, display=False)
+    objval = model.get()
+    assert len(model.solution.dual) == model.do_math().linear.shape[0]
+
+    model.st([x[:n//2].sum() <= n/5])
+    formula = model.do_math()
+    start = model.start_point()
+    assert len(start.dual) == formula.linear.shape[0]
+    assert (start.dual[-1:] == 0).all()
+
+    native = grb.load(formula)
+    grb.warm_start(native, formula, start)
+    native.update()
+    assert np.allclose(native.getAttr('PStart', native.getVars()),
+                       model.solution.x)
+    rows = grb.formula_rows(formula.sense, native.getConstrs())
+    assert np.allclose(native.getAttr('DStart', list(rows)), start.dual)
+
+    model.solve(grb, display=False, warm_start=True)
+    warm_objval = model.get()
+    model.solve(grb, display=False)
+    assert abs(model.get() - warm_objval) < 1e-5
+    assert model.get() <= objval + 1e-5